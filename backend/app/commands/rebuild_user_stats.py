@@ -0,0 +1,37 @@
+"""
+사용자 일기 통계(user_diary_stats) 전체 재계산
+
+실행 (app 디렉터리에서):
+    python -m commands.rebuild_user_stats
+"""
+import asyncio
+import time
+from crud import user_stats
+from db.database import SessionLocal, engine
+from db.schema import sync_schema
+# 모델 import - 테이블 생성을 위해 필요
+from models.wine import Wine
+from models.diary import Diary
+from models.user import User
+from models.user_stats import UserDiaryStats
+
+
+async def main() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(sync_schema)
+
+    started = time.perf_counter()
+    async with SessionLocal() as db:
+        try:
+            users = await user_stats.rebuild_all(db)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+    print(f"사용자 통계 재계산 완료: {users}명 ({time.perf_counter() - started:.1f}초)")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,4 +1,5 @@
 import os
+import json
 from typing import Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
@@ -24,6 +25,10 @@ class Settings(BaseSettings):
   algorithm: str = os.getenv("ALGORITHM", "HS256")
   access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
   refresh_token_expire_days: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "60"))
+  # 인증 사용자 조회 캐시 (테스트 등에서는 USER_CACHE_ENABLED=false로 비활성화)
+  user_cache_enabled: bool = os.getenv("USER_CACHE_ENABLED", "true").lower() == "true"
+  user_cache_ttl: int = int(os.getenv("USER_CACHE_TTL", "60"))
+  user_cache_size: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
 
   #kakao
   KAKAO_CLIENT_ID: str = os.getenv("KAKAO_CLIENT_ID", "")
@@ -36,6 +41,13 @@ class Settings(BaseSettings):
   KAKAO_TOKEN_URL: str = "https://kauth.kakao.com/oauth/token"
   KAKAO_USER_INFO_URL: str = "https://kapi.kakao.com/v2/user/me"
 
+  # 카카오 API HTTP 클라이언트 설정 (초 단위)
+  kakao_timeout: float = float(os.getenv("KAKAO_TIMEOUT", "5"))
+  kakao_connect_timeout: float = float(os.getenv("KAKAO_CONNECT_TIMEOUT", "3"))
+  kakao_max_connections: int = int(os.getenv("KAKAO_MAX_CONNECTIONS", "20"))
+  kakao_max_keepalive_connections: int = int(os.getenv("KAKAO_MAX_KEEPALIVE_CONNECTIONS", "10"))
+  kakao_keepalive_expiry: float = float(os.getenv("KAKAO_KEEPALIVE_EXPIRY", "60"))
+
 
   # Database settings
   db_host: str = os.getenv("DB_HOST", "localhost")
@@ -60,6 +72,8 @@ class Settings(BaseSettings):
   #LLM
   llm_model: str = os.getenv("LLM_MODEL", "gemini-2.0-flash-001")
   llm_temperature: float = float(os.getenv("LLM_TEMPERATURE", "0.2"))
+  llm_timeout: float = float(os.getenv("LLM_TIMEOUT", "30"))  # 호출별 타임아웃(초)
+  llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
 
   # 디버그 설정
   langchain_debug: bool = os.getenv("LANGCHAIN_DEBUG", "true").lower() == "true"
@@ -71,8 +85,50 @@ class Settings(BaseSettings):
   # 파일 업로드 설정
   max_file_size: int = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
   upload_dir: str = os.getenv("UPLOAD_DIR", "temp_uploads")
+  # 이미지 업로드 동시 처리 개수 (워커 전체 기준)
+  image_upload_concurrency: int = int(os.getenv("IMAGE_UPLOAD_CONCURRENCY", "4"))
+  # 서버에서 생성하는 일기 이미지 파생본 ({이름: 최대 크기/포맷/품질}), IMAGE_DERIVATIVES에 JSON으로 재정의 가능
+  image_derivatives: dict = json.loads(os.getenv("IMAGE_DERIVATIVES", json.dumps({
+    "thumbnail": {"max_size": [320, 320], "format": "WEBP", "quality": 80},
+    "feed": {"max_size": [1080, 1080], "format": "WEBP", "quality": 82},
+    "full": {"max_size": [1920, 1920], "format": "JPEG", "quality": 85},
+  })))
+  # 클라이언트 직접 업로드(presigned POST) 유효 시간 (초)
+  presigned_upload_expiration: int = int(os.getenv("PRESIGNED_UPLOAD_EXPIRATION", "600"))
+  # 일기 비동기 저장(이미지 후처리) 워커 수
+  diary_job_workers: int = int(os.getenv("DIARY_JOB_WORKERS", "2"))
+  # 처리 중 작업의 하트비트(updated_at)가 이 시간(초) 이상 끊기면 다른 워커가 다시 가져감
+  diary_job_stale_after: float = float(os.getenv("DIARY_JOB_STALE_AFTER", "300"))
+  # 공개 피드 메모리 버퍼 크기(최신 공개 일기 수)와 재적재 주기 (초, 다른 워커의 변경 반영)
+  public_feed_size: int = int(os.getenv("PUBLIC_FEED_SIZE", "1000"))
+  public_feed_refresh_interval: float = float(os.getenv("PUBLIC_FEED_REFRESH_INTERVAL", "60"))
+  # 와인 자동완성/메모리 검색/맛 벡터 인덱스 재적재 주기 (초, 다른 워커가 추가한 와인 반영)
+  wine_index_refresh_interval: float = float(os.getenv("WINE_INDEX_REFRESH_INTERVAL", "300"))
+  # 삭제 대기 객체(outbox) 스위퍼 설정 - 배치 크기는 delete_objects 최대치(1000) 이하
+  storage_sweep_interval: float = float(os.getenv("STORAGE_SWEEP_INTERVAL", "30"))
+  storage_sweep_batch_size: int = min(int(os.getenv("STORAGE_SWEEP_BATCH_SIZE", "1000")), 1000)
+  storage_sweep_max_attempts: int = int(os.getenv("STORAGE_SWEEP_MAX_ATTEMPTS", "5"))
+
+  # 이미지 트랜스코딩 프로세스 풀 설정 (0이면 컨테이너에서 쓸 수 있는 CPU 수 - affinity/cgroup quota 기준)
+  transcode_workers: int = int(os.getenv("TRANSCODE_WORKERS", "0"))
+  transcode_max_pending: int = int(os.getenv("TRANSCODE_MAX_PENDING", "0"))
+  transcode_queue_timeout: float = float(os.getenv("TRANSCODE_QUEUE_TIMEOUT", "10"))
   
   perplexity_api_key: str = os.getenv("PERPLEXITY_API_KEY", "")
+  perplexity_model: str = os.getenv("PERPLEXITY_MODEL", "sonar-pro")
+  perplexity_timeout: float = float(os.getenv("PERPLEXITY_TIMEOUT", "60"))
+  perplexity_max_retries: int = int(os.getenv("PERPLEXITY_MAX_RETRIES", "2"))
+  perplexity_max_connections: int = int(os.getenv("PERPLEXITY_MAX_CONNECTIONS", "20"))
+  perplexity_stream: bool = os.getenv("PERPLEXITY_STREAM", "false").lower() == "true"
+
+  # 캐시 설정 (로컬 SQLite 파일 경로는 cache_dir 기준)
+  cache_dir: str = os.getenv("CACHE_DIR", "cache")
+  taste_cache_ttl: int = int(os.getenv("TASTE_CACHE_TTL", "604800"))  # 7일
+  taste_cache_memory_size: int = int(os.getenv("TASTE_CACHE_MEMORY_SIZE", "1024"))
+  taste_cache_max_entries: int = int(os.getenv("TASTE_CACHE_MAX_ENTRIES", "100000"))
+  # 라벨 이미지 해시 캐시 (앞/뒷면 128비트 해시 간 허용 해밍 거리)
+  label_hash_max_distance: int = int(os.getenv("LABEL_HASH_MAX_DISTANCE", "10"))
+  label_hash_max_entries: int = int(os.getenv("LABEL_HASH_MAX_ENTRIES", "50000"))
 
   # Front URL
   front_url: str = os.getenv("FRONT_URL", "http://localhost:3000")
@@ -1,62 +1,91 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, tuple_, union_all, func
+from sqlalchemy.orm import aliased, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime
+from db.database import upsert_insert
 from models.diary import Diary
-from models.wine import Wine, WineType
+from models.wine import Wine, WineType, WINE_IDENTITY_COLUMNS
+from models.user import User
+from utils.pagination import encode_cursor, decode_cursor
 
 
-def create_or_get_wine(db: Session, wine_data: Dict[str, Any]) -> Wine:
+class UserNotFoundError(LookupError):
+    """일기를 저장할 사용자 행이 없을 때 발생"""
+
+
+async def create_or_get_wine(db: AsyncSession, wine_data: Dict[str, Any]) -> Wine:
     """
     와인 데이터로 새 와인을 생성하거나 기존 와인을 조회 (트랜잭션은 상위에서 관리)
+    PostgreSQL: INSERT ... ON CONFLICT DO NOTHING RETURNING 과 기존 행 조회를 한 문장으로 실행
+    SQLite: CTE 안의 INSERT를 지원하지 않으므로 ON CONFLICT DO NOTHING 후 따로 조회
     """
-    # 동일한 와인이 이미 존재하는지 확인
-    existing_wine = db.query(Wine).filter(
-        Wine.name == wine_data.get("name", ""),
-        Wine.origin == wine_data.get("origin", ""),
-        Wine.grape == wine_data.get("grape", ""),
-        Wine.year == wine_data.get("year", ""),
-        Wine.type == wine_data.get("type", "red")
-    ).first()
-    
-    if existing_wine:
-        return existing_wine
+    values = {
+        "name": wine_data.get("name", ""),
+        "origin": wine_data.get("origin", ""),
+        "grape": wine_data.get("grape", ""),
+        "year": wine_data.get("year", ""),
+        "alcohol": wine_data.get("alcohol", ""),
+        "type": WineType(wine_data.get("type", "red")),
+        "aroma_note": wine_data.get("aromaNote", ""),
+        "taste_note": wine_data.get("tasteNote", ""),
+        "finish_note": wine_data.get("finishNote", ""),
+        "sweetness": int(wine_data.get("sweetness", 50)),
+        "acidity": int(wine_data.get("acidity", 50)),
+        "tannin": int(wine_data.get("tannin", 50)),
+        "body": int(wine_data.get("body", 50))
+    }
+    identity = [getattr(Wine, column) == values[column] for column in WINE_IDENTITY_COLUMNS]
     
-    # 새 와인 생성 (commit은 하지 않음)
-    wine = Wine(
-        name=wine_data.get("name", ""),
-        origin=wine_data.get("origin", ""),
-        grape=wine_data.get("grape", ""),
-        year=wine_data.get("year", ""),
-        alcohol=wine_data.get("alcohol", ""),
-        type=WineType(wine_data.get("type", "red")),
-        aroma_note=wine_data.get("aromaNote", ""),
-        taste_note=wine_data.get("tasteNote", ""),
-        finish_note=wine_data.get("finishNote", ""),
-        sweetness=int(wine_data.get("sweetness", 50)),
-        acidity=int(wine_data.get("acidity", 50)),
-        tannin=int(wine_data.get("tannin", 50)),
-        body=int(wine_data.get("body", 50))
+    # 새 와인 삽입 시도 (같은 와인이 있으면 아무것도 하지 않음, commit은 하지 않음)
+    insert_wine = (
+        upsert_insert(db)(Wine)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=list(WINE_IDENTITY_COLUMNS))
     )
+    if db.get_bind().dialect.name != "postgresql":
+        await db.execute(insert_wine)
+        result = await db.execute(select(Wine).where(*identity).limit(1))
+        return result.scalars().one()
     
-    db.add(wine)
-    db.flush()  # ID 생성을 위해 flush (commit은 아님)
+    inserted = insert_wine.returning(*Wine.__table__.c).cte("inserted_wine")
+    # 삽입된 행 또는 기존 행 중 하나를 반환
+    candidates = union_all(
+        select(inserted),
+        select(Wine.__table__).where(*identity)
+    ).subquery()
+    wine_row = aliased(Wine, candidates, adapt_on_names=True)
+    wine = (await db.execute(select(wine_row).limit(1))).scalars().first()
+    
+    if wine is None:
+        # 동시에 다른 트랜잭션이 같은 와인을 커밋한 경우 (문장 시작 스냅샷에 보이지 않음)
+        result = await db.execute(select(Wine).where(*identity).limit(1))
+        wine = result.scalars().one()
     return wine
 
 
-def create_diary(
-    db: Session,
+async def create_diary(
+    db: AsyncSession,
     user_id: int,
     wine_id: int,
     diary_data: Dict[str, Any],
-    image_urls: Dict[str, str]
+    image_urls: Dict[str, Any]
 ) -> Diary:
     """
     새로운 와인 일기를 생성 (순수 DB 작업만, 트랜잭션은 service에서 관리)
     """
-    # 새로운 일기 ID 생성 (해당 user의 최대 ID + 1)
-    max_diary_id = db.query(Diary).filter(Diary.user_id == user_id).count()
-    new_diary_id = max_diary_id + 1
+    # 새로운 일기 ID 발급 (사용자 행의 카운터를 원자적으로 증가)
+    # 행 잠금은 트랜잭션 종료까지 유지되므로 같은 사용자의 동시 저장도 중복 id를 받지 않음
+    new_diary_id = await db.scalar(
+        update(User)
+        .where(User.id == user_id)
+        .values(diary_seq=User.diary_seq + 1, diary_version=User.diary_version + 1)
+        .returning(User.diary_seq)
+        .execution_options(synchronize_session=False)
+    )
+    if new_diary_id is None:
+        raise UserNotFoundError(f"사용자를 찾을 수 없습니다: {user_id}")
     
     # 일기 생성
     diary = Diary(
@@ -67,6 +96,8 @@ def create_diary(
         backImage=image_urls.get("backImage"),
         thumbnailImage=image_urls.get("thumbnailImage"),
         downloadImage=image_urls.get("downloadImage"),
+        imageManifest=image_urls.get("imageManifest"),
+        imageStatus=diary_data.get("image_status"),
         rating=int(diary_data.get("rating", 0)),
         review=diary_data.get("review", ""),
         price=int(diary_data.get("price", 0)) if diary_data.get("price") else None,
@@ -79,27 +110,98 @@ def create_diary(
     return diary
 
 
-def get_diary_by_id(db: Session, user_id: int, diary_id: int) -> Optional[Diary]:
+async def get_diary_by_id(
+    db: AsyncSession,
+    user_id: int,
+    diary_id: int,
+    with_wine: bool = False,
+    populate_existing: bool = False
+) -> Optional[Diary]:
     """
-    특정 사용자의 일기를 ID로 조회
+    특정 사용자의 일기를 ID로 조회 (with_wine이면 와인 정보를 JOIN으로 함께 로드)
+    populate_existing이면 세션에 이미 있는 객체도 DB 값으로 덮어씀
     """
-    return db.query(Diary).filter(
+    stmt = select(Diary).where(
         Diary.user_id == user_id,
         Diary.id == diary_id
-    ).first()
+    )
+    if with_wine:
+        stmt = stmt.options(joinedload(Diary.wine))
+    if populate_existing:
+        stmt = stmt.execution_options(populate_existing=True)
+    result = await db.execute(stmt.limit(1))
+    return result.scalars().first()
+
+
+def decode_user_diaries_cursor(cursor: str) -> List[Any]:
+    """내 일기 목록 커서 복원 (createdAt, 일기 id) - 잘못된 커서면 InvalidCursorError"""
+    return decode_cursor(cursor, 2)
+
+
+async def get_user_diaries(
+    db: AsyncSession,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> Tuple[list[Diary], Optional[str]]:
+    """
+    사용자의 일기 목록 조회 (최신순, 커서 페이지네이션, 와인 정보 JOIN 로드)
+    
+    Returns:
+        tuple: (일기 목록, 다음 페이지 커서 - 마지막 페이지면 None)
+    """
+    stmt = select(Diary).options(joinedload(Diary.wine)).where(Diary.user_id == user_id)
+    if cursor:
+        created_at, diary_id = decode_user_diaries_cursor(cursor)
+        stmt = stmt.where(tuple_(Diary.createdAt, Diary.id) < tuple_(created_at, diary_id))
+    
+    result = await db.execute(
+        stmt.order_by(Diary.createdAt.desc(), Diary.id.desc()).limit(limit + 1)
+    )
+    diaries = list(result.scalars().all())
+    
+    next_cursor = None
+    if len(diaries) > limit:
+        diaries = diaries[:limit]
+        next_cursor = encode_cursor(diaries[-1].createdAt, diaries[-1].id)
+    return diaries, next_cursor
+
+
+async def get_diary_version(db: AsyncSession, user_id: int, diary_id: int) -> Optional[Tuple]:
+    """
+    일기 상세 ETag용 버전 조회 (일기 updatedAt + 와인 updated_at만 조회, 없는 일기면 None)
+    """
+    result = await db.execute(
+        select(Diary.updatedAt, Wine.updated_at)
+        .join(Wine, Wine.id == Diary.wine_id)
+        .where(Diary.user_id == user_id, Diary.id == diary_id)
+    )
+    return result.first()
 
 
-def get_user_diaries(db: Session, user_id: int, skip: int = 0, limit: int = 20) -> list[Diary]:
+async def get_user_diaries_version(db: AsyncSession, user_id: int) -> Tuple:
     """
-    사용자의 모든 일기 목록 조회
+    일기 목록 ETag용 버전 조회 (사용자 행의 diary_version + 와인 마지막 수정 시각)
+    diary_version은 일기 추가/수정/삭제 트랜잭션에서 함께 증가하고, 와인 수정 시각은 updated_at 인덱스에서 MAX만 읽음
     """
-    return db.query(Diary).filter(
-        Diary.user_id == user_id
-    ).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(User.diary_version, select(func.max(Wine.updated_at)).scalar_subquery())
+        .where(User.id == user_id)
+    )
+    return tuple(result.one_or_none() or ())
+
+
+async def _bump_diary_version(db: AsyncSession, user_id: int) -> None:
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(diary_version=User.diary_version + 1)
+        .execution_options(synchronize_session=False)
+    )
 
 
-def update_diary(
-    db: Session,
+async def update_diary(
+    db: AsyncSession,
     user_id: int,
     diary_id: int,
     update_data: Dict[str, Any]
@@ -107,7 +209,7 @@ def update_diary(
     """
     일기 정보 업데이트 (순수 DB 작업만, 트랜잭션은 service에서 관리)
     """
-    diary = get_diary_by_id(db, user_id, diary_id)
+    diary = await get_diary_by_id(db, user_id, diary_id)
     if not diary:
         return None
     
@@ -117,25 +219,68 @@ def update_diary(
             setattr(diary, field, value)
     
     diary.updatedAt = datetime.now()
+    await _bump_diary_version(db, user_id)
     return diary
 
 
-def delete_diary(db: Session, user_id: int, diary_id: int) -> bool:
+async def delete_diary(db: AsyncSession, user_id: int, diary_id: int) -> bool:
     """
     일기 삭제 (순수 DB 작업만, 트랜잭션은 service에서 관리)
     """
-    diary = get_diary_by_id(db, user_id, diary_id)
+    diary = await get_diary_by_id(db, user_id, diary_id)
     if not diary:
         return False
     
-    db.delete(diary)
+    await db.delete(diary)
+    await _bump_diary_version(db, user_id)
     return True
 
 
-def get_public_diaries(db: Session, skip: int = 0, limit: int = 20) -> list[Diary]:
+async def get_public_diary_keys(db: AsyncSession, keys: List[Tuple[int, int]]) -> Set[Tuple[int, int]]:
     """
-    공개된 일기 목록 조회
+    (user_id, 일기 id) 중 아직 존재하고 공개 상태인 것 (피드 버퍼 검증용, 기본 키 조회만)
+    키 목록을 id IN / user_id IN 두 조건으로 보내고(컴파일 캐시 재사용, 기본 키 인덱스 조회) 짝이 맞는 행만 남김
     """
-    return db.query(Diary).filter(
-        Diary.isPublic == True
-    ).offset(skip).limit(limit).all()
+    if not keys:
+        return set()
+    result = await db.execute(
+        select(Diary.user_id, Diary.id).where(
+            Diary.id.in_({diary_id for _, diary_id in keys}),
+            Diary.user_id.in_({user_id for user_id, _ in keys}),
+            Diary.isPublic == True
+        )
+    )
+    wanted = set(keys)
+    return {tuple(row) for row in result if tuple(row) in wanted}
+
+
+async def get_public_diaries(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> Tuple[list[Diary], Optional[str]]:
+    """
+    공개된 일기 목록 조회 (최신순, 커서 페이지네이션, 와인 정보 JOIN 로드)
+    일기 id는 사용자별로 발급되므로 (createdAt, user_id, id) 순으로 정렬
+    
+    Returns:
+        tuple: (일기 목록, 다음 페이지 커서 - 마지막 페이지면 None)
+    """
+    stmt = select(Diary).options(joinedload(Diary.wine)).where(Diary.isPublic == True)
+    if cursor:
+        created_at, user_id, diary_id = decode_cursor(cursor, 3)
+        stmt = stmt.where(
+            tuple_(Diary.createdAt, Diary.user_id, Diary.id) < tuple_(created_at, user_id, diary_id)
+        )
+    
+    result = await db.execute(
+        stmt.order_by(Diary.createdAt.desc(), Diary.user_id.desc(), Diary.id.desc()).limit(limit + 1)
+    )
+    diaries = list(result.scalars().all())
+    
+    next_cursor = None
+    if len(diaries) > limit:
+        diaries = diaries[:limit]
+        last = diaries[-1]
+        next_cursor = encode_cursor(last.createdAt, last.user_id, last.id)
+    return diaries, next_cursor
@@ -0,0 +1,43 @@
+from sqlalchemy import select, delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Iterable, List
+from models.storage_outbox import StorageDeletion
+
+
+async def enqueue_deletions(db: AsyncSession, object_keys: Iterable[str], reason: str) -> int:
+    """
+    삭제할 객체 키를 outbox에 기록 (트랜잭션은 호출자가 관리 - 같은 트랜잭션에서 커밋)
+    """
+    rows = [StorageDeletion(object_key=key, reason=reason) for key in dict.fromkeys(object_keys) if key]
+    db.add_all(rows)
+    return len(rows)
+
+
+async def claim_batch(db: AsyncSession, limit: int, max_attempts: int) -> List[StorageDeletion]:
+    """
+    삭제 대기 행을 잠그고 가져오기 (FOR UPDATE SKIP LOCKED - 여러 워커가 같은 행을 처리하지 않음)
+    """
+    result = await db.execute(
+        select(StorageDeletion)
+        .where(StorageDeletion.attempts < max_attempts)
+        .order_by(StorageDeletion.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return list(result.scalars().all())
+
+
+async def complete(db: AsyncSession, ids: List[int]) -> None:
+    """삭제가 끝난 행 제거"""
+    if ids:
+        await db.execute(delete(StorageDeletion).where(StorageDeletion.id.in_(ids)))
+
+
+async def record_failures(db: AsyncSession, errors: Dict[int, str]) -> None:
+    """삭제에 실패한 행의 시도 횟수/오류 기록 (다음 스윕에서 재시도)"""
+    for row_id, message in errors.items():
+        await db.execute(
+            update(StorageDeletion)
+            .where(StorageDeletion.id == row_id)
+            .values(attempts=StorageDeletion.attempts + 1, last_error=message)
+        )
@@ -0,0 +1,137 @@
+import re
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+from db.database import upsert_insert
+from models.diary import Diary
+from models.wine import Wine
+from models.user_stats import UserDiaryStats
+
+# 포도 품종 문자열 구분자 ("카베르네 소비뇽, 메를로" 등 블렌드)
+_GRAPE_SEPARATOR = re.compile(r"[,/·&+]")
+
+
+def stats_entry(rating: Optional[int], price: Optional[int], wine_type: Any, grape: Optional[str]) -> Dict[str, Any]:
+    """일기 한 건이 통계에 기여하는 값"""
+    return {
+        "rating": rating,
+        "price": price,
+        "type": getattr(wine_type, "value", wine_type),
+        "grapes": list(dict.fromkeys(
+            part.strip() for part in _GRAPE_SEPARATOR.split(grape or "") if part.strip()
+        )),
+    }
+
+
+def diary_stats_entry(diary: Diary, wine: Wine) -> Dict[str, Any]:
+    return stats_entry(diary.rating, diary.price, wine.type, wine.grape)
+
+
+def _add(value: Optional[int], delta: int) -> int:
+    # 통계가 일기 데이터보다 늦게 생긴 경우 등 어긋난 행이 음수로 내려가지 않도록
+    return max((value or 0) + delta, 0)
+
+
+def _add_counts(counts: Dict[str, int], keys: List[str], sign: int) -> Dict[str, int]:
+    counts = dict(counts or {})
+    for key in keys:
+        value = _add(counts.get(key), sign)
+        if value > 0:
+            counts[key] = value
+        else:
+            counts.pop(key, None)
+    return counts
+
+
+def _apply(stats: UserDiaryStats, entry: Dict[str, Any], sign: int) -> None:
+    stats.diary_count = _add(stats.diary_count, sign)
+    if entry["rating"] is not None:
+        stats.rating_count = _add(stats.rating_count, sign)
+        stats.rating_sum = _add(stats.rating_sum, sign * entry["rating"]) if stats.rating_count else 0
+    if entry["price"] is not None:
+        stats.price_count = _add(stats.price_count, sign)
+        stats.price_sum = _add(stats.price_sum, sign * entry["price"]) if stats.price_count else 0
+    # JSON 컬럼은 새 dict를 할당해야 변경이 감지됨
+    if entry["type"]:
+        stats.type_counts = _add_counts(stats.type_counts, [entry["type"]], sign)
+    stats.grape_counts = _add_counts(stats.grape_counts, entry["grapes"], sign)
+
+
+async def get_stats(db: AsyncSession, user_id: int) -> Optional[UserDiaryStats]:
+    return await db.get(UserDiaryStats, user_id)
+
+
+async def _lock_stats(db: AsyncSession, user_id: int) -> UserDiaryStats:
+    """
+    사용자 통계 행을 잠그고 조회 (없으면 생성) - 동시에 일기를 저장해도 증분이 유실되지 않음
+    (SQLite는 FOR UPDATE가 없지만 INSERT 시점에 쓰기 잠금을 잡으므로 트랜잭션이 직렬화됨)
+    """
+    await db.execute(
+        upsert_insert(db)(UserDiaryStats)
+        .values(user_id=user_id, type_counts={}, grape_counts={})
+        .on_conflict_do_nothing(index_elements=["user_id"])
+    )
+    result = await db.execute(
+        select(UserDiaryStats)
+        .where(UserDiaryStats.user_id == user_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def apply_diary_change(
+    db: AsyncSession,
+    user_id: int,
+    old: Optional[Dict[str, Any]] = None,
+    new: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    일기 변경을 통계에 반영 (생성: new만, 삭제: old만, 수정: 둘 다)
+    트랜잭션은 상위에서 관리 (일기 변경과 같은 트랜잭션에서 커밋)
+    """
+    if old == new:
+        return
+    stats = await _lock_stats(db, user_id)
+    if old is not None:
+        _apply(stats, old, -1)
+    if new is not None:
+        _apply(stats, new, 1)
+
+
+async def rebuild_all(db: AsyncSession, batch_size: int = 1000) -> int:
+    """
+    전체 사용자 통계를 diaries JOIN wines에서 다시 계산 (트랜잭션은 호출자가 관리)
+
+    Returns:
+        int: 통계를 만든 사용자 수
+    """
+    await db.execute(delete(UserDiaryStats))
+
+    rows = await db.stream(
+        select(Diary.user_id, Diary.rating, Diary.price, Wine.type, Wine.grape)
+        .join(Wine, Wine.id == Diary.wine_id)
+        .order_by(Diary.user_id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    users = 0
+    current: Optional[UserDiaryStats] = None
+    pending: List[UserDiaryStats] = []
+    async for user_id, rating, price, wine_type, grape in rows:
+        if current is None or current.user_id != user_id:
+            current = UserDiaryStats(
+                user_id=user_id, diary_count=0, rating_sum=0, rating_count=0,
+                price_sum=0, price_count=0, type_counts={}, grape_counts={}
+            )
+            pending.append(current)
+            users += 1
+            if len(pending) > batch_size:
+                db.add_all(pending[:-1])
+                await db.flush()
+                pending = pending[-1:]
+        _apply(current, stats_entry(rating, price, wine_type, grape), 1)
+
+    db.add_all(pending)
+    await db.flush()
+    return users
@@ -0,0 +1,63 @@
+from sqlalchemy import select, func, or_, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Tuple
+from models.wine import Wine, WINE_SEARCH_WEIGHTS
+from utils.taste_vectors import TASTE_FIELDS
+
+
+async def search_wines(
+    db: AsyncSession,
+    query: str,
+    limit: int = 20,
+    offset: int = 0
+) -> List[Tuple[Wine, float]]:
+    """
+    pg_trgm 기반 와인 부분 일치 검색 (이름/품종/원산지, 점수 내림차순)
+    <% (word_similarity) 와 ILIKE 조건 모두 GIN gin_trgm_ops 인덱스를 사용
+    """
+    term = literal(query)
+    score = func.greatest(*[
+        func.word_similarity(term, getattr(Wine, column)) * weight
+        for column, weight in WINE_SEARCH_WEIGHTS.items()
+    ]).label("score")
+
+    conditions = []
+    for column in WINE_SEARCH_WEIGHTS:
+        attr = getattr(Wine, column)
+        conditions.append(term.op("<%")(attr))
+        # 3글자 미만 검색어는 trigram 유사도가 낮으므로 부분 문자열 일치도 허용
+        conditions.append(attr.icontains(query, autoescape=True))
+
+    result = await db.execute(
+        select(Wine, score)
+        .where(or_(*conditions))
+        .order_by(score.desc(), Wine.id)
+        .offset(offset)
+        .limit(limit)
+    )
+    return [(wine, float(rank)) for wine, rank in result.all()]
+
+
+async def get_wines_by_ids(db: AsyncSession, wine_ids: List[int]) -> List[Wine]:
+    """id 목록 순서대로 와인 조회"""
+    if not wine_ids:
+        return []
+    result = await db.execute(select(Wine).where(Wine.id.in_(wine_ids)))
+    wines = {wine.id: wine for wine in result.scalars().all()}
+    return [wines[wine_id] for wine_id in wine_ids if wine_id in wines]
+
+
+async def get_search_rows(db: AsyncSession) -> List[Tuple]:
+    """메모리 검색/자동완성 인덱스 구성용 (id, name, 검색 대상 컬럼...) 전체 조회"""
+    result = await db.execute(
+        select(Wine.id, *[getattr(Wine, column) for column in WINE_SEARCH_WEIGHTS]).order_by(Wine.id)
+    )
+    return list(result.all())
+
+
+async def get_taste_rows(db: AsyncSession) -> List[Tuple]:
+    """메모리 맛 벡터 인덱스 구성용 (id, type, 맛 점수...) 전체 조회"""
+    result = await db.execute(
+        select(Wine.id, Wine.type, *[getattr(Wine, field) for field in TASTE_FIELDS]).order_by(Wine.id)
+    )
+    return list(result.all())
@@ -1,3 +1,3 @@
-from .database import Base, engine, get_db
+from .database import Base, engine, SessionLocal, get_db, upsert_insert
 
-__all__ = ["Base", "engine", "get_db"] 
\ No newline at end of file
+__all__ = ["Base", "engine", "SessionLocal", "get_db", "upsert_insert"]
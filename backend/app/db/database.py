@@ -1,28 +1,59 @@
-from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from core.config import settings
 
-# SQLAlchemy 엔진 생성 (connection pool 설정 포함)
-engine = create_engine(
-    settings.db_url,
+
+def _to_async_url(url: str) -> str:
+    """동기 드라이버 URL을 비동기 드라이버 URL로 변환 (PostgreSQL → asyncpg, SQLite → aiosqlite)"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+_db_url = _to_async_url(settings.db_url)
+
+# connection pool 설정 (SQLite는 드라이버 기본 풀 사용)
+_pool_options = {} if _db_url.startswith("sqlite") else dict(
     pool_size=settings.db_pool_size,
     max_overflow=settings.db_max_overflow,
     pool_timeout=settings.db_pool_timeout,
     pool_recycle=settings.db_pool_recycle,
-    echo=settings.db_echo  # SQL 쿼리 로그 출력 설정
+    pool_pre_ping=True,
 )
 
-# 세션 팩토리 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# SQLAlchemy 비동기 엔진 생성
+engine = create_async_engine(
+    _db_url,
+    echo=settings.db_echo,  # SQL 쿼리 로그 출력 설정
+    **_pool_options
+)
+
+# 세션 팩토리 생성 (commit 후에도 객체 속성을 그대로 사용할 수 있도록 expire 비활성화)
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+def upsert_insert(db: AsyncSession):
+    """
+    세션이 연결된 DB의 INSERT 구성자 (on_conflict_do_nothing 등 ON CONFLICT 절 지원)
+    PostgreSQL과 SQLite(3.24+) 모두 같은 API를 제공
+    """
+    return sqlite.insert if db.get_bind().dialect.name == "sqlite" else postgresql.insert
+
 
 # Base 클래스 생성
 Base = declarative_base()
 
 # 데이터베이스 세션 의존성
-def get_db():
-    db = SessionLocal()
-    try:
+# FastAPI는 한 요청 안에서 같은 의존성 결과를 재사용하므로
+# get_current_user와 핸들러가 모두 이 함수를 쓰면 요청당 세션(커넥션)은 하나만 사용
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close() 
\ No newline at end of file
@@ -0,0 +1,128 @@
+from typing import List
+from sqlalchemy import inspect, text, Column, Table
+from sqlalchemy.engine import Connection
+from .database import Base
+
+# 테이블/인덱스 생성 전에 설치하는 PostgreSQL 확장 (pg_trgm: 와인 부분 일치 검색 인덱스)
+POSTGRES_EXTENSIONS = ("pg_trgm",)
+
+# 기존 테이블에 컬럼이 새로 추가될 때 한 번 실행하는 데이터 보정 SQL
+COLUMN_BACKFILLS = {
+    # 사용자별 일기 번호 카운터는 기존 일기의 최대 id부터 이어서 발급
+    ("users", "diary_seq"): (
+        "UPDATE users SET diary_seq = COALESCE("
+        "(SELECT MAX(diaries.id) FROM diaries WHERE diaries.user_id = users.id), 0)"
+    ),
+}
+
+# 와인 식별 기준으로 중복 와인을 가장 작은 id(keep_id)에 대응시키는 서브쿼리
+_WINE_DUPLICATES = (
+    "SELECT id, MIN(id) OVER (PARTITION BY name, origin, grape, year, type) AS keep_id FROM wines"
+)
+
+# 기존 테이블에 인덱스를 새로 만들기 전에 실행하는 데이터 정리 SQL
+INDEX_PREPARES = {
+    # 와인 식별 유니크 인덱스: 중복 와인을 가장 작은 id로 합친 뒤 생성
+    "uq_wines_identity": [
+        # 합쳐질 일기가 대상 와인의 기존 일기(또는 같이 옮겨지는 일기)와 PK (id, user_id, wine_id)가
+        # 겹치면 사용자의 마지막 일기 번호 뒤로 새 번호를 발급
+        f"WITH dup AS ({_WINE_DUPLICATES}), "
+        "moved AS ("
+        "SELECT diaries.user_id, diaries.id, diaries.wine_id, dup.keep_id, "
+        "ROW_NUMBER() OVER (PARTITION BY diaries.user_id, diaries.id, dup.keep_id ORDER BY diaries.wine_id) AS rank "
+        "FROM diaries JOIN dup ON diaries.wine_id = dup.id WHERE dup.id <> dup.keep_id"
+        "), "
+        "clash AS ("
+        "SELECT user_id, id, wine_id FROM moved WHERE rank > 1 OR EXISTS ("
+        "SELECT 1 FROM diaries AS kept WHERE kept.user_id = moved.user_id "
+        "AND kept.id = moved.id AND kept.wine_id = moved.keep_id)"
+        "), "
+        "renumbered AS ("
+        "SELECT clash.user_id, clash.id, clash.wine_id, "
+        "(SELECT MAX(diaries.id) FROM diaries WHERE diaries.user_id = clash.user_id) "
+        "+ ROW_NUMBER() OVER (PARTITION BY clash.user_id ORDER BY clash.id, clash.wine_id) AS new_id "
+        "FROM clash"
+        ") "
+        "UPDATE diaries SET id = renumbered.new_id FROM renumbered "
+        "WHERE diaries.user_id = renumbered.user_id AND diaries.id = renumbered.id "
+        "AND diaries.wine_id = renumbered.wine_id",
+        f"UPDATE diaries SET wine_id = dup.keep_id FROM ({_WINE_DUPLICATES}) AS dup "
+        "WHERE diaries.wine_id = dup.id AND dup.id <> dup.keep_id",
+        f"DELETE FROM wines WHERE id IN (SELECT id FROM ({_WINE_DUPLICATES}) AS dup WHERE id <> keep_id)",
+        # 새로 발급한 일기 번호가 카운터보다 앞서지 않도록
+        "UPDATE users SET diary_seq = (SELECT MAX(diaries.id) FROM diaries WHERE diaries.user_id = users.id) "
+        "WHERE diary_seq < (SELECT MAX(diaries.id) FROM diaries WHERE diaries.user_id = users.id)",
+        # 일기 번호/와인이 바뀌었을 수 있으므로 목록 ETag 무효화
+        "UPDATE users SET diary_version = diary_version + 1",
+    ],
+}
+
+# 생성에 실패하면 기동을 중단하는 인덱스 (upsert 등 애플리케이션 로직이 의존)
+REQUIRED_INDEXES = {"uq_wines_identity"}
+
+def _add_column(conn: Connection, table: Table, column: Column) -> None:
+    preparer = conn.dialect.identifier_preparer
+    ddl = (
+        f"ALTER TABLE {preparer.format_table(table)} "
+        f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=conn.dialect)}"
+    )
+    default = conn.dialect.ddl_compiler(conn.dialect, None).get_column_default_string(column)
+    if default is not None:
+        ddl += f" DEFAULT {default}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+    conn.execute(text(ddl))
+
+
+def sync_schema(conn: Connection) -> List[str]:
+    """
+    모델 정의에 맞춰 스키마 동기화 (create_all은 기존 테이블을 건드리지 않으므로 보완)
+    - 없는 테이블 생성
+    - 기존 테이블에 없는 컬럼 추가 (+ COLUMN_BACKFILLS 보정)
+    - 기존 테이블에 없는 인덱스 생성 (+ INDEX_PREPARES 정리, REQUIRED_INDEXES 실패 시 예외)
+    run_sync로 호출: await conn.run_sync(sync_schema)
+    
+    Returns:
+        list: 이번에 새로 만든 테이블 이름 (기존 데이터로 채워야 하는 파생 테이블 확인용)
+    """
+    if conn.dialect.name == "postgresql":
+        for extension in POSTGRES_EXTENSIONS:
+            try:
+                # 확장 설치 권한이 없어도 앱 기동은 계속 (해당 인덱스만 생성 실패)
+                with conn.begin_nested():
+                    conn.execute(text(f'CREATE EXTENSION IF NOT EXISTS "{extension}"'))
+            except Exception as e:
+                print(f"확장 설치 실패 ({extension}): {e}")
+
+    existing_tables = set(inspect(conn).get_table_names())
+    Base.metadata.create_all(conn)
+
+    inspector = inspect(conn)
+    # 컬럼을 모두 추가한 뒤 인덱스 생성 (INDEX_PREPARES가 다른 테이블의 새 컬럼을 참조할 수 있음)
+    for table in Base.metadata.sorted_tables:
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            _add_column(conn, table, column)
+            backfill = COLUMN_BACKFILLS.get((table.name, column.name))
+            if backfill:
+                conn.execute(text(backfill))
+
+    for table in Base.metadata.sorted_tables:
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            try:
+                # 선택 인덱스는 실패해도 앱 기동은 계속되도록 savepoint 안에서 생성
+                with conn.begin_nested():
+                    for statement in INDEX_PREPARES.get(index.name, []):
+                        conn.execute(text(statement))
+                    index.create(conn)
+            except Exception as e:
+                if index.name in REQUIRED_INDEXES:
+                    raise RuntimeError(f"필수 인덱스 생성 실패 ({index.name}): {e}") from e
+                print(f"인덱스 생성 실패 ({index.name}): {e}")
+
+    return [table.name for table in Base.metadata.sorted_tables if table.name not in existing_tables]
@@ -1,21 +1,59 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from db import Base, engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import engine
+from db.schema import sync_schema
+from crud import user_stats
 from core.config import settings
 from routers.api.v1.router import api_router
+from utils.image_transcoder import image_transcoder
+from service.llm_client import gemini_client, perplexity_client
+from service.kakao_auth import kakao_auth_service
+from service.diary_job_service import diary_job_service
+from service.storage_cleanup import storage_cleanup_service
+from service.wine_search import wine_search_service
+from service.wine_similarity import wine_similarity_service
+from service.public_feed import public_feed_service
 # 모델 import - 테이블 생성을 위해 필요
 from models.wine import Wine
 from models.diary import Diary
 from models.user import User
+from models.diary_job import DiarySaveJob
+from models.storage_outbox import StorageDeletion
+from models.user_stats import UserDiaryStats
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 데이터베이스 테이블/인덱스 생성
+    async with engine.begin() as conn:
+        created_tables = await conn.run_sync(sync_schema)
+        # 기존 DB에 통계 테이블이 새로 생긴 경우 같은 트랜잭션에서 기존 일기로 채움
+        if UserDiaryStats.__tablename__ in created_tables:
+            async with AsyncSession(bind=conn) as db:
+                users = await user_stats.rebuild_all(db)
+            print(f"사용자 통계 초기화 완료: {users}명")
+    image_transcoder.start()
+    gemini_client.start()
+    await wine_search_service.start()
+    await wine_similarity_service.start()
+    await public_feed_service.start()
+    await diary_job_service.start()
+    storage_cleanup_service.start()
+    yield
+    await storage_cleanup_service.stop()
+    await diary_job_service.stop()
+    await kakao_auth_service.close()
+    await perplexity_client.close()
+    image_transcoder.shutdown()
+    await engine.dispose()
 
 app = FastAPI(
     title=settings.app_name,
     description="와인 일기 관리 API",
     version="1.0.0",
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan
 )
 
 # CORS 미들웨어 설정
@@ -1,4 +1,7 @@
 from .wine import Wine
 from .diary import Diary
+from .diary_job import DiarySaveJob
+from .storage_outbox import StorageDeletion
+from .user_stats import UserDiaryStats
 
-__all__ = ["Wine", "Diary"] 
\ No newline at end of file
+__all__ = ["Wine", "Diary", "DiarySaveJob", "StorageDeletion", "UserDiaryStats"]
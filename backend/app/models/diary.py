@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, Date, BigInteger
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, Date, BigInteger, Index, true, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from db.database import Base
@@ -16,6 +16,8 @@ class Diary(Base):
     backImage = Column(String(255), nullable=True)
     thumbnailImage = Column(String(255), nullable=True)
     downloadImage = Column(String(255), nullable=True)
+    imageManifest = Column(JSON, nullable=True)  # {필드: {파생 이미지 이름: URL}} (서버 생성 파생본)
+    imageStatus = Column(String(20), nullable=True)  # pending / ready / failed (비동기 저장 시)
     
     # 일기 데이터
     rating = Column(Integer, nullable=True)
@@ -30,4 +32,13 @@ class Diary(Base):
     wine = relationship("Wine", backref="diaries")
     
     def __repr__(self):
-        return f"<Diary(id={self.id}, user_id={self.user_id}, wine_id={self.wine_id}, rating={self.rating})>" 
\ No newline at end of file
+        return f"<Diary(id={self.id}, user_id={self.user_id}, wine_id={self.wine_id}, rating={self.rating})>"
+
+
+# 목록 조회(커서 페이지네이션)용 인덱스: (createdAt, id) 역순 정렬
+Index("ix_diaries_user_created", Diary.user_id, Diary.createdAt.desc(), Diary.id.desc())
+Index(
+    "ix_diaries_public_created",
+    Diary.createdAt.desc(), Diary.user_id.desc(), Diary.id.desc(),
+    postgresql_where=Diary.isPublic == true()
+)
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON
+from sqlalchemy.sql import func
+from db.database import Base
+import enum
+
+class JobStatus(str, enum.Enum):
+    pending = "pending"
+    processing = "processing"
+    completed = "completed"
+    failed = "failed"
+
+class DiarySaveJob(Base):
+    """
+    일기 이미지 후처리(업로드) 작업 - 일기는 먼저 저장하고 이미지는 백그라운드에서 처리
+    """
+    __tablename__ = "diary_save_jobs"
+    
+    id = Column(String(36), primary_key=True)  # uuid4
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    diary_id = Column(Integer, nullable=True)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.pending, index=True)
+    total_images = Column(Integer, nullable=False, default=0)
+    processed_images = Column(Integer, nullable=False, default=0)
+    payload = Column(JSON, nullable=False, default=dict)  # 필드별 이미지 원본 위치
+    error = Column(Text, nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    @property
+    def progress(self) -> int:
+        if self.status == JobStatus.completed:
+            return 100
+        if not self.total_images:
+            return 0
+        return int(self.processed_images * 100 / self.total_images)
+    
+    def __repr__(self):
+        return f"<DiarySaveJob(id={self.id}, diary_id={self.diary_id}, status={self.status})>"
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+from db.database import Base
+
+class StorageDeletion(Base):
+    """
+    삭제 대기 중인 Object Storage 객체 (transactional outbox)
+    DB 변경과 같은 트랜잭션에서 기록하고, 실제 삭제는 백그라운드 스위퍼가 일괄 처리
+    """
+    __tablename__ = "storage_deletion_outbox"
+    
+    id = Column(Integer, primary_key=True)
+    object_key = Column(String(512), nullable=False)
+    reason = Column(String(50), nullable=False)  # diary_deleted, save_failed, staged_upload 등
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<StorageDeletion(id={self.id}, object_key={self.object_key}, attempts={self.attempts})>"
@@ -12,6 +12,8 @@ class User(Base):
     nickname = Column(String)
     profile_image = Column(String, nullable=True)
     refresh_token = Column(Text, nullable=True)  # 우리 서비스의 refresh token
+    diary_seq = Column(Integer, nullable=False, default=0, server_default="0")  # 마지막으로 발급한 일기 id
+    diary_version = Column(Integer, nullable=False, default=0, server_default="0")  # 일기 추가/수정/삭제마다 증가 (목록 ETag)
     
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from db.database import Base
+
+class UserDiaryStats(Base):
+    """
+    사용자별 일기 통계 요약 (일기 생성/수정/삭제 시 같은 트랜잭션에서 증분 갱신)
+    """
+    __tablename__ = "user_diary_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    diary_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    price_sum = Column(BigInteger, nullable=False, default=0, server_default="0")
+    price_count = Column(Integer, nullable=False, default=0, server_default="0")
+    type_counts = Column(JSON, nullable=False, default=dict)   # {와인 종류: 일기 수}
+    grape_counts = Column(JSON, nullable=False, default=dict)  # {포도 품종: 일기 수}
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    @property
+    def average_rating(self):
+        return round(self.rating_sum / self.rating_count, 2) if self.rating_count else None
+    
+    def __repr__(self):
+        return f"<UserDiaryStats(user_id={self.user_id}, diary_count={self.diary_count})>"
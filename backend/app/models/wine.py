@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Enum, Index
 from sqlalchemy.sql import func
 from db.database import Base
 import enum
@@ -12,8 +12,21 @@ class WineType(str, enum.Enum):
     natural = "natural"
     dessert = "dessert"
 
+# 같은 와인으로 취급하는 컬럼 조합 (create_or_get_wine의 upsert 기준)
+WINE_IDENTITY_COLUMNS = ("name", "origin", "grape", "year", "type")
+
+# 부분 일치 검색 대상 컬럼과 점수 가중치 (pg_trgm GIN 인덱스 / 메모리 n-gram 인덱스 공통)
+WINE_SEARCH_WEIGHTS = {"name": 1.0, "grape": 0.8, "origin": 0.8}
+
 class Wine(Base):
     __tablename__ = "wines"
+    __table_args__ = (
+        Index("uq_wines_identity", *WINE_IDENTITY_COLUMNS, unique=True),
+        *[
+            Index(f"ix_wines_{column}_trgm", column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+            for column in WINE_SEARCH_WEIGHTS
+        ],
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
@@ -29,6 +42,8 @@ class Wine(Base):
     acidity = Column(Integer, nullable=False)    # 1-5 scale
     tannin = Column(Integer, nullable=False)     # 1-5 scale
     body = Column(Integer, nullable=False)       # 1-5 scale
+    # 일기 ETag에 반영 (생성 후 수정된 경우만, 목록 ETag는 인덱스로 MAX만 읽음)
+    updated_at = Column(DateTime(timezone=True), nullable=True, index=True, onupdate=func.now())
     
     def __repr__(self):
         return f"<Wine(id={self.id}, name='{self.name}', origin='{self.origin}')>" 
\ No newline at end of file
@@ -1,15 +1,16 @@
-from fastapi import APIRouter, HTTPException, Query, Depends, Response
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
-from service.kakao_auth import KakaoAuthService
+from sqlalchemy.ext.asyncio import AsyncSession
+from service.kakao_auth import kakao_auth_service
 from service.user_service import UserService
 from utils.auth import create_access_token, create_token_pair, verify_token, get_current_user
 from db.database import get_db
-from models.user import User
+from schemas.user import UserIdentity
 from core.config import settings
+from utils.etag import make_etag, not_modified
 
 router = APIRouter()
-kakao_service = KakaoAuthService()
+kakao_service = kakao_auth_service
 user_service = UserService()
 front_url = settings.front_url
 
@@ -21,7 +22,7 @@ async def kakao_login(platform: str = Query(None)):
     return {"login_url": login_url}
 
 @router.get("/kakao/callback")
-async def kakao_callback(response: Response, code: str = Query(...), state: str = Query(None), db: Session = Depends(get_db)):
+async def kakao_callback(response: Response, code: str = Query(...), state: str = Query(None), db: AsyncSession = Depends(get_db)):
     # 액세스 토큰 받기
     access_token = await kakao_service.get_access_token(code)
     if not access_token:
@@ -37,15 +38,15 @@ async def kakao_callback(response: Response, code: str = Query(...), state: str
     
     # DB에서 기존 사용자 확인
     kakao_id = str(user_info["id"])
-    existing_user = user_service.get_user_by_kakao_id(db, kakao_id)
+    existing_user = await user_service.get_user_by_kakao_id(db, kakao_id)
     
     if existing_user:
         # 기존 사용자의 refresh token 업데이트
-        user_service.update_user_refresh_token(db, existing_user, tokens["refresh_token"])
+        await user_service.update_user_refresh_token(db, existing_user, tokens["refresh_token"])
         user_data = existing_user
     else:
         # 새 사용자 생성
-        user_data = user_service.create_user(db, user_info, tokens["refresh_token"])
+        user_data = await user_service.create_user(db, user_info, tokens["refresh_token"])
     
     # 모바일 앱인지 확인 (state에서 플랫폼 정보 추출)
     platform = state if state else "web"
@@ -82,7 +83,7 @@ async def kakao_callback(response: Response, code: str = Query(...), state: str
     return redirect_response
 
 @router.post("/refresh")
-async def refresh_token(response: Response, refresh_token: str, db: Session = Depends(get_db)):
+async def refresh_token(response: Response, refresh_token: str, db: AsyncSession = Depends(get_db)):
     """Refresh Token으로 새 Access Token 발급"""
     payload = verify_token(refresh_token)
     
@@ -94,7 +95,7 @@ async def refresh_token(response: Response, refresh_token: str, db: Session = De
     if not kakao_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
         
-    user = user_service.get_user_by_kakao_id(db, kakao_id)
+    user = await user_service.get_user_by_kakao_id(db, kakao_id)
     if not user or user.refresh_token != refresh_token:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
     
@@ -128,8 +129,15 @@ async def logout(response: Response):
     }
 
 @router.get("/me")
-async def get_me(current_user: User = Depends(get_current_user)):
-    """현재 로그인한 사용자 정보 반환"""
+async def get_me(request: Request, response: Response, current_user: UserIdentity = Depends(get_current_user)):
+    """현재 로그인한 사용자 정보 반환 (If-None-Match가 같으면 304)"""
+    etag = make_etag(
+        "me", current_user.id, current_user.nickname, current_user.email,
+        current_user.profile_image, current_user.created_at, current_user.updated_at
+    )
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
     return {
         "id": current_user.id,
         "kakao_id": current_user.kakao_id,
@@ -140,7 +148,7 @@ async def get_me(current_user: User = Depends(get_current_user)):
     }
 
 @router.post("/kakao/sdk-login")
-async def kakao_sdk_login(response: Response, request_data: dict, db: Session = Depends(get_db)):
+async def kakao_sdk_login(response: Response, request_data: dict, db: AsyncSession = Depends(get_db)):
     """카카오 SDK 로그인 처리"""
     try:
         access_token = request_data.get("access_token")
@@ -159,15 +167,15 @@ async def kakao_sdk_login(response: Response, request_data: dict, db: Session =
         
         # DB에서 기존 사용자 확인
         kakao_id = str(user_info["id"])
-        existing_user = user_service.get_user_by_kakao_id(db, kakao_id)
+        existing_user = await user_service.get_user_by_kakao_id(db, kakao_id)
         
         if existing_user:
             # 기존 사용자의 refresh token 업데이트
-            user_service.update_user_refresh_token(db, existing_user, tokens["refresh_token"])
+            await user_service.update_user_refresh_token(db, existing_user, tokens["refresh_token"])
             user_data = existing_user
         else:
             # 새 사용자 생성
-            user_data = user_service.create_user(db, user_info, tokens["refresh_token"])
+            user_data = await user_service.create_user(db, user_info, tokens["refresh_token"])
         
         # 모바일에서는 토큰을 응답에 포함하여 전달
         return {
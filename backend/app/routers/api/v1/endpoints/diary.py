@@ -1,16 +1,25 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import json
 from db import get_db
+from crud.diary import UserNotFoundError, decode_user_diaries_cursor
 from core.config import settings
 from models.wine import Wine
 from service import llm_service
 from service.diary_service import diary_service
-from schemas.diary import WineTasteRequest
+from service.diary_job_service import diary_job_service
+from schemas.diary import (
+    WineTasteRequest, DiaryResponse, DiaryListResponse, DiarySaveJobResponse,
+    PresignUploadRequest, PresignUploadResponse, UserDiaryStatsResponse, GrapeCount
+)
 from utils.storage import ncp_storage
 from utils.auth import get_current_user
-from models.user import User
+from schemas.user import UserIdentity
+from utils.pagination import InvalidCursorError
+from utils.etag import make_etag, not_modified, PUBLIC_CACHE_CONTROL
+from utils.upload import read_upload, UploadTooLargeError, InvalidUploadError, ALLOWED_IMAGE_TYPES
 
 router = APIRouter()
 
@@ -29,27 +38,22 @@ async def wine_analysis(
         )
     
     # 파일 타입 검증
-    allowed_types = ["image/jpeg", "image/jpg", "image/png", "image/webp"]
     for file in image_files:
-        if file.content_type not in allowed_types:
+        if file.content_type not in ALLOWED_IMAGE_TYPES:
             raise HTTPException(
                 status_code=400,
                 detail=f"지원하지 않는 파일 형식입니다: {file.content_type}. 지원 형식: jpeg, jpg, png, webp"
             )
     
-    # 파일 크기 검증 (10MB 제한)
-    for file in image_files:
-        contents = await file.read()
-        if len(contents) > settings.max_file_size:
-            raise HTTPException(
-                status_code=400,
-                detail=f"파일 크기가 너무 큽니다: {file.filename}. 최대 {settings.max_file_size}바이트"
-            )
-        await file.seek(0)  # 파일 포인터 리셋
+    # 파일 크기 검증 (10MB 제한) - 청크 단위로 읽으며 검사하고, 읽은 바이트는 분석에 그대로 사용
+    try:
+        contents_list = [await read_upload(file, settings.max_file_size) for file in image_files]
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     try:
         # LLM 서비스 호출로 와인 분석
-        result = await llm_service.analyze_wine_images(image_files)
+        result = await llm_service.analyze_wine_images(contents_list)
         
         return {
             "message": "와인 분석이 완료되었습니다",
@@ -79,6 +83,23 @@ async def wine_taste(request: WineTasteRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"테이스트 중 오류가 발생했습니다: {str(e)}")
 
+
+@router.post("/uploads/presign", response_model=PresignUploadResponse)
+async def presign_upload(
+    request: PresignUploadRequest,
+    current_user: UserIdentity = Depends(get_current_user)
+):
+    """
+    일기 이미지를 Object Storage에 직접 올리기 위한 presigned POST 발급
+    클라이언트는 url에 fields + file을 multipart로 POST한 뒤, 받은 key를 /save의 *ImageKey로 전달
+    """
+    try:
+        return ncp_storage.create_presigned_upload(current_user.id, request.content_type)
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"업로드 URL 발급 중 오류가 발생했습니다: {str(e)}")
+
     
 @router.post("/save")
 async def save_diary(
@@ -92,12 +113,19 @@ async def save_diary(
     backImage: Optional[UploadFile] = File(None),
     thumbnailImage: Optional[UploadFile] = File(None),
     downloadImage: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    frontImageKey: Optional[str] = Form(None),
+    backImageKey: Optional[str] = Form(None),
+    thumbnailImageKey: Optional[str] = Form(None),
+    downloadImageKey: Optional[str] = Form(None),
+    mode: str = Query("sync", pattern="^(sync|async)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserIdentity = Depends(get_current_user)
 ):
     """
     와인 일기 저장 엔드포인트
     FormData로 전송된 데이터를 처리
+    mode=async이면 일기를 먼저 저장하고 이미지는 백그라운드에서 처리 (202 + job_id 반환)
+    이미지 파일 대신 /uploads/presign으로 직접 업로드한 객체 키(*ImageKey)를 보낼 수 있음
     """
     try:
         # JSON 문자열을 파싱
@@ -119,13 +147,37 @@ async def save_diary(
             "downloadImage": downloadImage
         }
         
+        image_keys = {
+            "frontImage": frontImageKey,
+            "backImage": backImageKey,
+            "thumbnailImage": thumbnailImageKey,
+            "downloadImage": downloadImageKey
+        }
+        
+        if mode == "async":
+            result = await diary_job_service.submit_wine_diary(
+                db=db,
+                user_id=user_id,
+                wine_data=wine_data,
+                diary_data=diary_data_for_service,
+                image_files=image_files,
+                image_keys=image_keys
+            )
+            return JSONResponse(status_code=202, content={
+                "message": result["message"],
+                "job_id": result["job_id"],
+                "diary_id": result["diary_id"],
+                "wine_id": result["wine_id"]
+            })
+        
         # Service 계층에서 비즈니스 로직 처리
         result = await diary_service.create_wine_diary(
             db=db,
             user_id=user_id,
             wine_data=wine_data,
             diary_data=diary_data_for_service,
-            image_files=image_files
+            image_files=image_files,
+            image_keys=image_keys
         )
         
         return {
@@ -139,11 +191,159 @@ async def save_diary(
                 "review": review,
                 "price": price,
                 "is_public": isPublic.lower() == "true",
-                "uploaded_images": result["uploaded_images"]
+                "uploaded_images": result["uploaded_images"],
+                "upload_timings": result["upload_timings"]
             }
         }
         
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="잘못된 JSON 형식의 wineData입니다")
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UserNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"저장 중 오류가 발생했습니다: {str(e)}")
+
+
+@router.get("/jobs/{job_id}", response_model=DiarySaveJobResponse)
+async def get_save_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserIdentity = Depends(get_current_user)
+):
+    """
+    비동기 일기 저장 작업 상태 조회 (진행률, 완료 시 이미지 URL)
+    """
+    job = await diary_job_service.get_job(db, current_user.id, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    
+    return DiarySaveJobResponse(
+        job_id=job.id,
+        status=job.status.value,
+        progress=job.progress,
+        diary_id=job.diary_id,
+        error=job.error,
+        uploaded_images=await diary_job_service.get_uploaded_images(db, job)
+    )
+
+
+@router.get("/", response_model=DiaryListResponse)
+async def list_my_diaries(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserIdentity = Depends(get_current_user)
+):
+    """
+    내 일기 목록 조회 (최신순, 와인 정보 포함)
+    If-None-Match가 현재 버전(사용자 일기 버전 + 와인 마지막 수정 시각)과 같으면 목록을 조회하지 않고 304
+    잘못된 커서는 ETag 비교 전에 400
+    """
+    if cursor:
+        try:
+            decode_user_diaries_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    version = await diary_service.get_user_diaries_version(db, current_user.id)
+    cached = not_modified(request, response, make_etag("diaries", current_user.id, cursor, limit, *version))
+    if cached:
+        return cached
+    
+    try:
+        diaries, next_cursor = await diary_service.get_user_diaries(db, current_user.id, cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return DiaryListResponse(items=diaries, next_cursor=next_cursor)
+
+
+@router.get("/stats", response_model=UserDiaryStatsResponse)
+async def get_diary_stats(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserIdentity = Depends(get_current_user)
+):
+    """
+    내 일기 통계 (종류별 개수, 평균 평점, 총 지출, 자주 마신 품종)
+    """
+    stats = await diary_service.get_user_stats(db, current_user.id)
+    if not stats:
+        return UserDiaryStatsResponse()
+    grapes = sorted(stats.grape_counts.items(), key=lambda item: (-item[1], item[0]))[:5]
+    return UserDiaryStatsResponse(
+        diary_count=stats.diary_count,
+        average_rating=stats.average_rating,
+        total_spend=stats.price_sum,
+        type_counts=stats.type_counts,
+        favourite_grapes=[GrapeCount(grape=grape, count=count) for grape, count in grapes]
+    )
+
+
+@router.get("/public", response_model=DiaryListResponse)
+async def list_public_diaries(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    공개 일기 피드 조회 (최신순, 와인 정보 포함)
+    ETag는 페이지에 포함된 일기들의 (작성자, id, 수정 시각)으로 계산 (대부분 메모리 버퍼에서 응답)
+    사용자와 무관한 응답이므로 공유 캐시도 저장 가능 (public, no-cache)
+    """
+    try:
+        diaries, next_cursor = await diary_service.get_public_diaries(db, cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    etag = make_etag("public", next_cursor, *[(diary.user_id, diary.id, diary.updatedAt) for diary in diaries])
+    cached = not_modified(request, response, etag, PUBLIC_CACHE_CONTROL)
+    if cached:
+        return cached
+    return DiaryListResponse(items=diaries, next_cursor=next_cursor)
+
+
+@router.get("/{diary_id}", response_model=DiaryResponse)
+async def get_diary(
+    diary_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserIdentity = Depends(get_current_user)
+):
+    """
+    내 일기 상세 조회 (와인 정보 포함)
+    If-None-Match가 현재 일기/와인 수정 시각 기반 ETag와 같으면 상세 조회 없이 304
+    """
+    version = await diary_service.get_diary_version(db, current_user.id, diary_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="일기를 찾을 수 없습니다")
+    cached = not_modified(request, response, make_etag("diary", current_user.id, diary_id, *version))
+    if cached:
+        return cached
+    
+    diary = await diary_service.get_diary_detail(db, current_user.id, diary_id)
+    if not diary:
+        raise HTTPException(status_code=404, detail="일기를 찾을 수 없습니다")
+    return diary
+
+
+@router.delete("/{diary_id}")
+async def delete_diary(
+    diary_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserIdentity = Depends(get_current_user)
+):
+    """
+    내 일기 삭제 (이미지는 백그라운드에서 정리)
+    """
+    try:
+        deleted = await diary_service.delete_diary(db, current_user.id, diary_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"삭제 중 오류가 발생했습니다: {str(e)}")
+    if not deleted:
+        raise HTTPException(status_code=404, detail="일기를 찾을 수 없습니다")
+    return {"message": "일기가 삭제되었습니다", "diary_id": diary_id}
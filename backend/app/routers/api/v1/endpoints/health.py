@@ -1,16 +1,23 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from db import get_db
 from core.config import settings
+from service.llm_service import taste_cache, label_index
+from utils.metrics import upstream_metrics
+from service.user_service import user_identity_cache
+from service.wine_search import wine_search_service
+from service.wine_similarity import wine_similarity_service
+from service.public_feed import public_feed_service
 
 router = APIRouter()
 
 @router.get("/")
-def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_db)):
     """데이터베이스 연결 상태 확인"""
     try:
         # 간단한 쿼리로 DB 연결 테스트
-        db.execute("SELECT 1")
+        await db.execute(text("SELECT 1"))
         return {
             "status": "healthy",
             "database": "connected",
@@ -25,15 +32,15 @@ def health_check(db: Session = Depends(get_db)):
         }
 
 @router.get("/tables")
-def check_tables(db: Session = Depends(get_db)):
+async def check_tables(db: AsyncSession = Depends(get_db)):
     """데이터베이스 테이블 확인"""
     try:
         # PostgreSQL에서 테이블 목록 조회
-        result = db.execute("""
+        result = await db.execute(text("""
             SELECT table_name 
             FROM information_schema.tables 
             WHERE table_schema = 'public'
-        """)
+        """))
         tables = [row[0] for row in result.fetchall()]
         return {
             "tables": tables,
@@ -54,4 +61,21 @@ def get_config():
         "cors_origins": settings.cors_origins,
         "max_file_size": settings.max_file_size,
         "upload_dir": settings.upload_dir
-    } 
\ No newline at end of file
+    }
+
+@router.get("/cache")
+def get_cache_stats():
+    """캐시 적중률 통계"""
+    return {
+        "wine_taste": taste_cache.stats(),
+        "wine_label": label_index.stats(),
+        "user_identity": user_identity_cache.stats(),
+        "wine_search": wine_search_service.stats(),
+        "wine_similarity": wine_similarity_service.stats(),
+        "public_feed": public_feed_service.stats()
+    }
+
+@router.get("/metrics")
+def get_upstream_metrics():
+    """외부 API 호출 지연 시간 통계"""
+    return upstream_metrics.summary()
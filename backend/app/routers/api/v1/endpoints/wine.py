@@ -1,64 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from db import get_db
 from models.wine import Wine
+from schemas.wine import (
+    Wine as WineSchema, WineSearchResult, WineSearchResponse, WineSuggestion, WineSuggestResponse,
+    WineType, SimilarWine, SimilarWinesResponse
+)
+from service.wine_search import wine_search_service
+from service.wine_similarity import wine_similarity_service
 
 router = APIRouter()
 
-@router.get("/", response_model=List[dict])
-def get_wines(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/", response_model=List[WineSchema])
+async def get_wines(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
     """모든 와인 목록 조회"""
-    wines = db.query(Wine).offset(skip).limit(limit).all()
-    return [
-        {
-            "id": wine.id,
-            "name": wine.name,
-            "winery": wine.winery,
-            "vintage": wine.vintage,
-            "wine_type": wine.wine_type,
-            "region": wine.region,
-            "country": wine.country,
-            "price": wine.price,
-            "rating": wine.rating,
-            "tasting_notes": wine.tasting_notes,
-            "created_at": wine.created_at,
-            "updated_at": wine.updated_at
-        }
-        for wine in wines
+    result = await db.execute(select(Wine).order_by(Wine.id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+@router.get("/search", response_model=WineSearchResponse)
+async def search_wines(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    와인 이름/품종/원산지 부분 일치 검색 (한글/영문, 유사도 순)
+    """
+    results, next_offset = await wine_search_service.search(db, q.strip(), limit, offset)
+    items = [
+        WineSearchResult(**WineSchema.model_validate(wine).model_dump(), score=round(score, 4))
+        for wine, score in results
     ]
+    return WineSearchResponse(items=items, next_offset=next_offset)
+
+@router.get("/suggest", response_model=WineSuggestResponse)
+async def suggest_wines(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    와인 이름 자동완성 (메모리 접두사 인덱스, 이름 전체 또는 단어 시작 일치)
+    """
+    items = [WineSuggestion(id=wine_id, name=name) for wine_id, name in wine_search_service.suggest(q, limit)]
+    return WineSuggestResponse(items=items)
 
-@router.get("/{wine_id}")
-def get_wine(wine_id: int, db: Session = Depends(get_db)):
+@router.get("/{wine_id}", response_model=WineSchema)
+async def get_wine(wine_id: int, db: AsyncSession = Depends(get_db)):
     """특정 와인 정보 조회"""
-    wine = db.query(Wine).filter(Wine.id == wine_id).first()
+    wine = await db.get(Wine, wine_id)
     if not wine:
         raise HTTPException(status_code=404, detail="Wine not found")
-    
-    return {
-        "id": wine.id,
-        "name": wine.name,
-        "winery": wine.winery,
-        "vintage": wine.vintage,
-        "wine_type": wine.wine_type,
-        "region": wine.region,
-        "country": wine.country,
-        "price": wine.price,
-        "rating": wine.rating,
-        "tasting_notes": wine.tasting_notes,
-        "created_at": wine.created_at,
-        "updated_at": wine.updated_at
-    }
+    return wine
+
+@router.get("/{wine_id}/similar", response_model=SimilarWinesResponse)
+async def get_similar_wines(
+    wine_id: int,
+    k: int = Query(10, ge=1, le=50),
+    type: Optional[WineType] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    맛 프로필(당도/산도/타닌/바디)이 비슷한 와인 (type으로 와인 종류 필터)
+    """
+    [neighbours] = await wine_similarity_service.similar(db, [wine_id], k, type.value if type else None)
+    if not neighbours and await db.get(Wine, wine_id) is None:
+        raise HTTPException(status_code=404, detail="Wine not found")
+    items = [
+        SimilarWine(**WineSchema.model_validate(wine).model_dump(), distance=round(distance, 4))
+        for wine, distance in neighbours
+    ]
+    return SimilarWinesResponse(wine_id=wine_id, items=items)
 
 @router.post("/")
-def create_wine(wine_data: dict, db: Session = Depends(get_db)):
+async def create_wine(wine_data: dict, db: AsyncSession = Depends(get_db)):
     """새 와인 추가"""
     try:
         wine = Wine(**wine_data)
         db.add(wine)
-        db.commit()
-        db.refresh(wine)
+        await db.commit()
+        await db.refresh(wine)
+        wine_search_service.add(wine)
+        wine_similarity_service.add(wine)
         return {"message": "Wine created successfully", "wine_id": wine.id}
     except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail=str(e)) 
\ No newline at end of file
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e)) 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List, Dict
 from datetime import date, datetime
 from .wine import Wine, WineData
 
@@ -33,4 +33,57 @@ class WineAnalysisResult(BaseModel):
 
 class WineAnalysisResponse(BaseModel):
     message: str
-    data: WineAnalysisResult
\ No newline at end of file
+    data: WineAnalysisResult
+
+class DiaryResponse(BaseModel):
+    id: int
+    user_id: int
+    wine_id: int
+    frontImage: Optional[str] = None
+    backImage: Optional[str] = None
+    thumbnailImage: Optional[str] = None
+    downloadImage: Optional[str] = None
+    imageManifest: Optional[Dict[str, Dict[str, str]]] = None
+    imageStatus: Optional[str] = None
+    rating: Optional[int] = None
+    review: Optional[str] = None
+    price: Optional[int] = None
+    isPublic: Optional[bool] = None
+    createdAt: Optional[datetime] = None
+    updatedAt: Optional[datetime] = None
+    wine: Optional[Wine] = None
+
+    class Config:
+        from_attributes = True
+
+class DiaryListResponse(BaseModel):
+    items: List[DiaryResponse]
+    next_cursor: Optional[str] = None
+
+class GrapeCount(BaseModel):
+    grape: str
+    count: int
+
+class UserDiaryStatsResponse(BaseModel):
+    diary_count: int = 0
+    average_rating: Optional[float] = None
+    total_spend: int = 0
+    type_counts: Dict[str, int] = Field(default_factory=dict)
+    favourite_grapes: List[GrapeCount] = Field(default_factory=list)
+
+class PresignUploadRequest(BaseModel):
+    content_type: str
+
+class PresignUploadResponse(BaseModel):
+    url: str
+    fields: Dict[str, str]
+    key: str
+    expires_in: int
+
+class DiarySaveJobResponse(BaseModel):
+    job_id: str
+    status: str
+    progress: int
+    diary_id: Optional[int] = None
+    error: Optional[str] = None
+    uploaded_images: dict = Field(default_factory=dict)
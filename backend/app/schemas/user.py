@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+# 인증된 사용자 식별 정보 (get_current_user 결과, 요청 간 캐시됨)
+class UserIdentity(BaseModel):
+    id: int
+    kakao_id: str
+    nickname: Optional[str] = None
+    email: Optional[str] = None
+    profile_image: Optional[str] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+        frozen = True
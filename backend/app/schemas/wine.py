@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from enum import Enum
 
 class WineType(str, Enum):
@@ -74,4 +74,24 @@ class WineData(BaseModel):
     body: int
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+class WineSearchResult(Wine):
+    score: float
+
+class WineSuggestion(BaseModel):
+    id: int
+    name: str
+
+class WineSuggestResponse(BaseModel):
+    items: List[WineSuggestion]
+
+class SimilarWine(Wine):
+    distance: float
+
+class SimilarWinesResponse(BaseModel):
+    wine_id: int
+    items: List[SimilarWine]
+
+class WineSearchResponse(BaseModel):
+    items: List[WineSearchResult]
+    next_offset: Optional[int] = None
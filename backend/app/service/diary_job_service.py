@@ -0,0 +1,317 @@
+import asyncio
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from fastapi import UploadFile
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from crud import diary as diary_crud
+from crud import storage_outbox
+from crud import user_stats
+from db.database import SessionLocal
+from models.diary_job import DiarySaveJob, JobStatus
+from service.diary_service import DiaryService, DIARY_IMAGE_FOLDERS
+from service.public_feed import public_feed_service
+from utils.storage import ncp_storage, file_extension
+from utils.upload import save_upload, InvalidUploadError
+
+
+def _job_dir(job_id: str) -> str:
+    return os.path.join(settings.upload_dir, "diary_jobs", job_id)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class DiaryJobService:
+    """
+    일기 비동기 저장 파이프라인
+    일기는 즉시 커밋(이미지 pending 상태)하고, 이미지 처리/업로드는 프로세스 내 작업 큐에서 처리
+    작업 상태는 diary_save_jobs 테이블에 저장되고, 작업은 조건부 UPDATE로 선점한 워커 하나만 처리
+    (무중단 배포 중 두 컨테이너가 함께 떠 있거나 워커가 여러 개여도 같은 작업을 두 번 처리하지 않음)
+    처리 중인 작업은 updated_at을 하트비트로 갱신하고, 하트비트가 끊긴 작업만 다른 워커가 복구
+    """
+
+    def __init__(self, workers: int, stale_after: float):
+        self.workers = workers
+        self.stale_after = stale_after
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._recover_loop()))
+
+    def _stale_before(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self.stale_after)
+
+    async def recover(self) -> int:
+        """
+        하트비트가 끊긴 미완료 작업을 큐에 다시 넣음 (작업을 맡은 프로세스가 종료된 경우)
+        방금 등록되어 다른 워커 큐에서 기다리는 작업은 건드리지 않도록 대기 중 작업도 오래된 것만 복구
+        
+        Returns:
+            int: 큐에 넣은 작업 수
+        """
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(DiarySaveJob.id).where(
+                    DiarySaveJob.status.in_([JobStatus.pending, JobStatus.processing]),
+                    DiarySaveJob.updated_at < self._stale_before()
+                ).order_by(DiarySaveJob.created_at)
+            )
+            job_ids = result.scalars().all()
+        for job_id in job_ids:
+            self._queue.put_nowait(job_id)
+        return len(job_ids)
+
+    async def _recover_loop(self) -> None:
+        while True:
+            try:
+                await self.recover()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"일기 저장 작업 복구 실패: {e}")
+            await asyncio.sleep(self.stale_after)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit_wine_diary(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        wine_data: Dict[str, Any],
+        diary_data: Dict[str, Any],
+        image_files: Dict[str, UploadFile],
+        image_keys: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        와인 일기를 이미지 없이 먼저 저장하고 이미지 업로드 작업을 큐에 등록
+        직접 업로드한 객체 키는 여기서 검증만 하고, 원본은 워커가 Object Storage에서 내려받음
+        """
+        image_keys = image_keys or {}
+        job_id = str(uuid.uuid4())
+        payload = {}
+        try:
+            # 요청이 끝나면 UploadFile이 닫히므로 원본을 작업 디렉터리에 보관 (청크 단위 복사)
+            for field in DIARY_IMAGE_FOLDERS:
+                file = image_files.get(field)
+                if not file:
+                    key = image_keys.get(field)
+                    if key:
+                        extension = await ncp_storage.verify_direct_upload(user_id, key)
+                        payload[field] = {"key": key, "extension": extension}
+                    continue
+                extension = file_extension(file.filename)
+                path = os.path.join(_job_dir(job_id), f"{field}.{extension}")
+                await save_upload(file, path)
+                payload[field] = {"path": path, "extension": extension}
+
+            wine = await diary_crud.create_or_get_wine(db, wine_data)
+            diary = await diary_crud.create_diary(
+                db=db,
+                user_id=user_id,
+                wine_id=wine.id,
+                diary_data={**diary_data, "image_status": "pending" if payload else "ready"},
+                image_urls={}
+            )
+            job = DiarySaveJob(
+                id=job_id,
+                user_id=user_id,
+                diary_id=diary.id,
+                status=JobStatus.pending if payload else JobStatus.completed,
+                total_images=len(payload),
+                payload=payload
+            )
+            db.add(job)
+            await user_stats.apply_diary_change(db, user_id, new=user_stats.diary_stats_entry(diary, wine))
+            await db.commit()
+
+        except InvalidUploadError:
+            shutil.rmtree(_job_dir(job_id), ignore_errors=True)
+            raise
+        except diary_crud.UserNotFoundError:
+            await db.rollback()
+            shutil.rmtree(_job_dir(job_id), ignore_errors=True)
+            raise
+        except Exception as e:
+            await db.rollback()
+            shutil.rmtree(_job_dir(job_id), ignore_errors=True)
+            raise Exception(f"일기 저장 중 오류 발생: {str(e)}")
+
+        # 커밋 이후 단계는 실패해도 작업 디렉터리를 지우거나 저장을 실패로 돌리지 않음
+        await DiaryService.after_diary_saved(db, user_id, wine, diary)
+        if payload:
+            self._queue.put_nowait(job_id)
+
+        return {
+            "success": True,
+            "job_id": job_id,
+            "diary_id": diary.id,
+            "wine_id": wine.id,
+            "message": "와인 일기가 저장되었습니다. 이미지는 처리 중입니다"
+        }
+
+    async def get_job(self, db: AsyncSession, user_id: int, job_id: str) -> Optional[DiarySaveJob]:
+        job = await db.get(DiarySaveJob, job_id)
+        if not job or job.user_id != user_id:
+            return None
+        return job
+
+    async def _run(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._process(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"일기 저장 작업 처리 실패 ({job_id}): {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _claim(self, db: AsyncSession, job_id: str) -> Optional[DiarySaveJob]:
+        """
+        대기 중이거나 하트비트가 끊긴 작업을 조건부 UPDATE로 선점
+        다른 워커가 이미 처리 중이거나 끝난 작업이면 None
+        """
+        result = await db.execute(
+            update(DiarySaveJob)
+            .where(
+                DiarySaveJob.id == job_id,
+                or_(
+                    DiarySaveJob.status == JobStatus.pending,
+                    and_(
+                        DiarySaveJob.status == JobStatus.processing,
+                        DiarySaveJob.updated_at < self._stale_before()
+                    )
+                )
+            )
+            .values(status=JobStatus.processing, processed_images=0, updated_at=func.now())
+            .returning(DiarySaveJob.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = result.scalar() is not None
+        await db.commit()
+        if not claimed:
+            return None
+        return await db.get(DiarySaveJob, job_id, populate_existing=True)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """처리 중인 작업의 updated_at을 주기적으로 갱신 (별도 세션)"""
+        while True:
+            await asyncio.sleep(self.stale_after / 3)
+            try:
+                async with SessionLocal() as db:
+                    await db.execute(
+                        update(DiarySaveJob)
+                        .where(DiarySaveJob.id == job_id, DiarySaveJob.status == JobStatus.processing)
+                        .values(updated_at=func.now())
+                    )
+                    await db.commit()
+            except Exception as e:
+                print(f"일기 저장 작업 하트비트 실패 ({job_id}): {e}")
+
+    async def _process(self, job_id: str) -> None:
+        async with SessionLocal() as db:
+            job = await self._claim(db, job_id)
+            if job is None:
+                return
+
+            # rollback 후에는 인스턴스가 만료되므로 필요한 값은 미리 보관
+            user_id, diary_id, payload = job.user_id, job.diary_id, dict(job.payload)
+            status = JobStatus.processing
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+
+            lock = asyncio.Lock()
+            failed = False
+
+            async def on_uploaded(field: str, url: str) -> None:
+                # 이미지 하나가 끝날 때마다 진행률 커밋 (같은 세션을 쓰므로 직렬화)
+                async with lock:
+                    if failed:
+                        return
+                    job.processed_images += 1
+                    await db.commit()
+
+            uploaded_urls: Dict[str, Any] = {}
+            try:
+                images = {}
+                for field, source in payload.items():
+                    if "key" in source:
+                        data = await ncp_storage.read_direct_upload(source["key"])
+                    else:
+                        data = await asyncio.to_thread(_read_file, source["path"])
+                    images[field] = (data, source["extension"])
+
+                await DiaryService.upload_diary_image_data(images, on_uploaded, uploaded_urls)
+
+                diary = await diary_crud.update_diary(
+                    db, user_id, diary_id, {**uploaded_urls, "imageStatus": "ready"}
+                )
+                if diary is None:
+                    raise Exception("일기가 삭제되었습니다")
+                # 직접 업로드된 원본은 파생 이미지를 만들었으므로 삭제 대기열에 기록
+                await storage_outbox.enqueue_deletions(
+                    db, [source["key"] for source in payload.values() if "key" in source], "staged_upload"
+                )
+                job.status = JobStatus.completed
+                await db.commit()
+                status = JobStatus.completed
+
+            except Exception as e:
+                async with lock:
+                    failed = True
+                    await db.rollback()
+                    job.status = JobStatus.failed
+                    job.error = str(e)
+                    await diary_crud.update_diary(db, user_id, diary_id, {"imageStatus": "failed"})
+                    await db.commit()
+                    status = JobStatus.failed
+                await DiaryService.enqueue_orphan_images(db, uploaded_urls)
+                raise
+
+            finally:
+                heartbeat.cancel()
+                # 실패 기록 커밋까지 실패하면 인스턴스가 만료된 상태이므로 로컬 상태값으로 판단
+                if status in (JobStatus.completed, JobStatus.failed):
+                    shutil.rmtree(_job_dir(job_id), ignore_errors=True)
+
+            # 완료가 커밋된 뒤라 피드 갱신이 실패해도 작업 상태는 바뀌지 않음 (공개 일기면 이미지 정보 갱신)
+            if diary.isPublic:
+                await public_feed_service.on_diary_saved(db, user_id, diary_id)
+
+    async def get_uploaded_images(self, db: AsyncSession, job: DiarySaveJob) -> Dict[str, Any]:
+        """작업이 완료된 일기의 이미지 URL"""
+        if job.status != JobStatus.completed or job.diary_id is None:
+            return {}
+        diary = await diary_crud.get_diary_by_id(db, job.user_id, job.diary_id)
+        if not diary:
+            return {}
+        uploaded_images = {
+            field: getattr(diary, field)
+            for field in DIARY_IMAGE_FOLDERS
+            if getattr(diary, field)
+        }
+        if diary.imageManifest:
+            uploaded_images["imageManifest"] = diary.imageManifest
+        return uploaded_images
+
+
+# 싱글톤 인스턴스
+diary_job_service = DiaryJobService(
+    workers=settings.diary_job_workers,
+    stale_after=settings.diary_job_stale_after
+)
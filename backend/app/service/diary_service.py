@@ -1,9 +1,32 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
 from fastapi import UploadFile
+import asyncio
+import time
+from core.config import settings
 from crud import diary as diary_crud
-from utils.storage import ncp_storage
+from crud import storage_outbox
+from crud import user_stats
+from service.wine_search import wine_search_service
+from service.wine_similarity import wine_similarity_service
+from service.public_feed import public_feed_service
+from utils.storage import ncp_storage, file_extension, diary_image_keys
+from utils.upload import read_upload, InvalidUploadError
+
+# 일기 이미지 필드별 저장 폴더
+DIARY_IMAGE_FOLDERS = {
+    "frontImage": "diary/front",
+    "backImage": "diary/back",
+    "thumbnailImage": "diary/thumbnail",
+    "downloadImage": "diary/download",
+}
+
+# 서버에서 파생 이미지를 생성하는 원본 이미지 필드
+DERIVATIVE_IMAGE_FIELDS = ("frontImage", "backImage")
+
+# 워커 전체에서 동시에 처리할 이미지 업로드 수 제한
+_upload_semaphore = asyncio.Semaphore(settings.image_upload_concurrency)
 
 
 class DiaryService:
@@ -13,26 +36,31 @@ class DiaryService:
     
     @staticmethod
     async def create_wine_diary(
-        db: Session,
+        db: AsyncSession,
         user_id: int,
         wine_data: Dict[str, Any],
         diary_data: Dict[str, Any],
-        image_files: Dict[str, UploadFile]
+        image_files: Dict[str, UploadFile],
+        image_keys: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
         """
         와인 일기 생성 (이미지 업로드 + DB 저장)
         트랜잭션을 관리하여 모든 작업이 성공하거나 실패하거나
+        image_keys: 클라이언트가 presigned POST로 직접 올린 이미지의 객체 키 (필드별)
         """
+        uploaded_image_urls: Dict[str, Any] = {}
         try:
-            # 1. 이미지 업로드 (DB 작업 전에 먼저 처리)
-            uploaded_image_urls = await DiaryService._upload_diary_images(image_files)
+            # 1. 이미지 업로드 (DB 작업 전에 먼저 처리, 끝난 업로드는 실패해도 uploaded_image_urls에 남음)
+            _, upload_timings = await DiaryService._upload_diary_images(
+                user_id, image_files, image_keys or {}, uploaded_image_urls
+            )
             
             # 2. 데이터베이스 트랜잭션 시작
             # 와인 생성 또는 조회
-            wine = diary_crud.create_or_get_wine(db, wine_data)
+            wine = await diary_crud.create_or_get_wine(db, wine_data)
             
             # 일기 생성
-            diary = diary_crud.create_diary(
+            diary = await diary_crud.create_diary(
                 db=db,
                 user_id=user_id,
                 wine_id=wine.id,
@@ -40,124 +68,286 @@ class DiaryService:
                 image_urls=uploaded_image_urls
             )
             
-            # 3. 모든 작업이 성공하면 commit
-            db.commit()
-            db.refresh(wine)
-            db.refresh(diary)
+            # 사용자 통계 증분 갱신 (같은 트랜잭션)
+            await user_stats.apply_diary_change(db, user_id, new=user_stats.diary_stats_entry(diary, wine))
+            
+            # 파생 이미지를 만든 직접 업로드 원본은 같은 트랜잭션에서 삭제 대기열에 기록
+            await storage_outbox.enqueue_deletions(
+                db, DiaryService._staged_upload_keys(image_files, image_keys), "staged_upload"
+            )
             
-            return {
-                "success": True,
-                "diary_id": diary.id,
-                "wine_id": wine.id,
-                "uploaded_images": uploaded_image_urls,
-                "message": "와인 일기가 성공적으로 저장되었습니다"
-            }
+            # 3. 모든 작업이 성공하면 commit
+            await db.commit()
             
+        except InvalidUploadError:
+            # 업로드 전에 검증 단계에서 거절된 경우 (호출자가 400으로 변환)
+            raise
+        except diary_crud.UserNotFoundError:
+            # 인증 후 사용자가 삭제된 경우 (호출자가 404로 변환)
+            await db.rollback()
+            await DiaryService.enqueue_orphan_images(db, uploaded_image_urls)
+            raise
         except IntegrityError as e:
-            db.rollback()
-            # TODO: 업로드된 이미지 삭제 로직 추가
+            await db.rollback()
+            await DiaryService.enqueue_orphan_images(db, uploaded_image_urls)
             raise Exception(f"데이터베이스 무결성 오류: {str(e)}")
         except Exception as e:
-            db.rollback()
-            # TODO: 업로드된 이미지 삭제 로직 추가
+            await db.rollback()
+            await DiaryService.enqueue_orphan_images(db, uploaded_image_urls)
             raise Exception(f"일기 저장 중 오류 발생: {str(e)}")
+        
+        # 4. 커밋된 일기는 이후 단계가 실패해도 롤백/이미지 정리 대상이 아님
+        await DiaryService.after_diary_saved(db, user_id, wine, diary)
+        
+        return {
+            "success": True,
+            "diary_id": diary.id,
+            "wine_id": wine.id,
+            "uploaded_images": uploaded_image_urls,
+            "upload_timings": upload_timings,
+            "message": "와인 일기가 성공적으로 저장되었습니다"
+        }
     
     @staticmethod
-    async def _upload_diary_images(image_files: Dict[str, UploadFile]) -> Dict[str, str]:
+    async def after_diary_saved(db: AsyncSession, user_id: int, wine, diary) -> None:
         """
-        일기 관련 이미지들을 업로드
+        일기 생성 커밋 후 메모리 인덱스(와인 검색/유사 와인/공개 피드) 갱신
+        저장은 이미 끝났으므로 실패해도 로그만 남김
         """
-        uploaded_urls = {}
+        try:
+            await db.refresh(wine)
+            wine_search_service.add(wine)
+            wine_similarity_service.add(wine)
+            if diary.isPublic:
+                await public_feed_service.on_diary_saved(db, user_id, diary.id)
+        except Exception as e:
+            print(f"일기 저장 후처리 실패 ({user_id}, {diary.id}): {str(e)}")
+    
+    @staticmethod
+    def _staged_upload_keys(image_files: Dict[str, UploadFile], image_keys: Optional[Dict[str, str]]) -> List[str]:
+        """파일 대신 객체 키로 받은 (직접 업로드된) 원본 이미지 키"""
+        return [
+            key for field, key in (image_keys or {}).items()
+            if key and not image_files.get(field)
+        ]
+    
+    @staticmethod
+    async def enqueue_orphan_images(db: AsyncSession, uploaded_image_urls: Dict[str, Any]) -> None:
+        """
+        저장에 실패한 일기의 업로드된 이미지를 별도 트랜잭션으로 삭제 대기열에 기록
+        (롤백 이후 호출, 기록 실패는 저장 오류를 가리지 않도록 로그만 남김)
+        """
+        keys = diary_image_keys(uploaded_image_urls)
+        if not keys:
+            return
+        try:
+            await storage_outbox.enqueue_deletions(db, keys, "save_failed")
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            print(f"삭제 대기열 기록 실패: {str(e)}")
+    
+    @staticmethod
+    async def _upload_diary_images(
+        user_id: int,
+        image_files: Dict[str, UploadFile],
+        image_keys: Dict[str, str],
+        uploaded: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, str], Dict[str, float]]:
+        """
+        일기 관련 이미지들을 동시에 업로드
+        파일이 없고 직접 업로드한 객체 키가 있으면 검증 후 원본을 내려받아 같은 파이프라인으로 처리
+        uploaded: 끝난 업로드를 기록할 호출자 소유 dict (upload_diary_image_data 참고)
         
-        if image_files.get("frontImage"):
-            front_urls = await ncp_storage.upload_file_objects([image_files["frontImage"]], "diary/front")
-            uploaded_urls["frontImage"] = front_urls[0] if front_urls else None
-            
-        if image_files.get("backImage"):
-            back_urls = await ncp_storage.upload_file_objects([image_files["backImage"]], "diary/back")
-            uploaded_urls["backImage"] = back_urls[0] if back_urls else None
-            
-        if image_files.get("thumbnailImage"):
-            thumb_urls = await ncp_storage.upload_file_objects([image_files["thumbnailImage"]], "diary/thumbnail")
-            uploaded_urls["thumbnailImage"] = thumb_urls[0] if thumb_urls else None
-            
-        if image_files.get("downloadImage"):
-            download_urls = await ncp_storage.upload_file_objects([image_files["downloadImage"]], "diary/download")
-            uploaded_urls["downloadImage"] = download_urls[0] if download_urls else None
+        Returns:
+            tuple: (필드별 업로드 URL + imageManifest, 필드별 처리 시간(ms))
+        """
+        images = {}
+        for field in DIARY_IMAGE_FOLDERS:
+            file = image_files.get(field)
+            if file:
+                images[field] = (await read_upload(file), file_extension(file.filename))
+            elif image_keys.get(field):
+                key = image_keys[field]
+                extension = await ncp_storage.verify_direct_upload(user_id, key)
+                images[field] = (await ncp_storage.read_direct_upload(key), extension)
+        return await DiaryService.upload_diary_image_data(images, uploaded=uploaded)
+    
+    @staticmethod
+    async def upload_diary_image_data(
+        images: Dict[str, Tuple[bytes, str]],
+        on_uploaded: Optional[Callable[[str, str], Awaitable[None]]] = None,
+        uploaded: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        필드별 (이미지 바이트, 확장자)를 동시에 업로드
+        앞/뒷면 원본은 서버에서 파생 이미지(썸네일/피드/원본 크기)를 만들어 imageManifest로 반환하고,
+        클라이언트가 보내지 않은 thumbnailImage/downloadImage는 앞면 파생 이미지로 채움
+        on_uploaded(field, url)는 이미지 하나가 끝날 때마다 호출 (진행률 갱신용)
+        uploaded: 끝난 업로드를 바로 기록할 호출자 소유 dict (일부가 실패하면 호출자가 이 값으로 정리)
+        
+        Returns:
+            tuple: (필드별 업로드 URL + imageManifest, 필드별 처리 시간(ms))
+        """
+        uploaded_urls: Dict[str, Any] = {} if uploaded is None else uploaded
+        upload_timings: Dict[str, float] = {}
+        manifest: Dict[str, Dict[str, str]] = {}
+        if any(field in DERIVATIVE_IMAGE_FIELDS for field in images):
+            uploaded_urls["imageManifest"] = manifest
         
-        return uploaded_urls
+        async def upload_one(field: str, data: bytes, extension: str) -> None:
+            async with _upload_semaphore:
+                started = time.perf_counter()
+                if field in DERIVATIVE_IMAGE_FIELDS:
+                    derivatives = await ncp_storage.upload_derivatives(
+                        data, DIARY_IMAGE_FOLDERS[field], manifest.setdefault(field, {})
+                    )
+                    url = derivatives.get("full")
+                else:
+                    url = await ncp_storage.upload_image_bytes(data, DIARY_IMAGE_FOLDERS[field], extension)
+                uploaded_urls[field] = url
+                upload_timings[field] = round((time.perf_counter() - started) * 1000, 1)
+            if on_uploaded:
+                await on_uploaded(field, url)
+        
+        # 하나가 실패해도 나머지가 끝날 때까지 기다린 뒤 예외 전파 (끝난 업로드는 uploaded_urls에 남음)
+        results = await asyncio.gather(*[
+            upload_one(field, data, extension)
+            for field, (data, extension) in images.items()
+        ], return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        
+        if manifest:
+            front = manifest.get("frontImage") or next(iter(manifest.values()))
+            uploaded_urls.setdefault("thumbnailImage", front.get("thumbnail"))
+            uploaded_urls.setdefault("downloadImage", front.get("full"))
+        return uploaded_urls, upload_timings
     
     @staticmethod
-    def get_user_diaries(
-        db: Session,
+    async def get_user_diaries(
+        db: AsyncSession,
         user_id: int,
-        skip: int = 0,
+        cursor: Optional[str] = None,
         limit: int = 20
-    ) -> List:
+    ) -> Tuple[List, Optional[str]]:
         """
-        사용자의 일기 목록 조회
+        사용자의 일기 목록 조회 (일기 목록, 다음 페이지 커서)
         """
-        return diary_crud.get_user_diaries(db, user_id, skip, limit)
+        return await diary_crud.get_user_diaries(db, user_id, cursor, limit)
     
     @staticmethod
-    def get_diary_detail(
-        db: Session,
+    async def get_diary_detail(
+        db: AsyncSession,
         user_id: int,
         diary_id: int
     ) -> Optional:
         """
         일기 상세 조회
         """
-        return diary_crud.get_diary_by_id(db, user_id, diary_id)
+        return await diary_crud.get_diary_by_id(db, user_id, diary_id, with_wine=True)
     
     @staticmethod
-    def update_diary(
-        db: Session,
+    async def get_diary_version(db: AsyncSession, user_id: int, diary_id: int) -> Optional[Tuple]:
+        """
+        일기 상세 버전 (ETag용, 없는 일기면 None)
+        """
+        return await diary_crud.get_diary_version(db, user_id, diary_id)
+    
+    @staticmethod
+    async def get_user_diaries_version(db: AsyncSession, user_id: int) -> Tuple:
+        """
+        일기 목록 버전 (ETag용)
+        """
+        return await diary_crud.get_user_diaries_version(db, user_id)
+    
+    @staticmethod
+    async def update_diary(
+        db: AsyncSession,
         user_id: int,
         diary_id: int,
         update_data: Dict[str, Any]
     ) -> Optional:
         """
-        일기 수정
+        일기 수정 (평점/가격이 바뀌면 사용자 통계도 같은 트랜잭션에서 갱신)
         """
         try:
-            diary = diary_crud.update_diary(db, user_id, diary_id, update_data)
-            if diary:
-                db.commit()
-                db.refresh(diary)
-            return diary
+            diary = await diary_crud.get_diary_by_id(db, user_id, diary_id, with_wine=True)
+            if not diary:
+                return None
+            old_entry = user_stats.diary_stats_entry(diary, diary.wine)
+            
+            diary = await diary_crud.update_diary(db, user_id, diary_id, update_data)
+            await user_stats.apply_diary_change(
+                db, user_id, old=old_entry, new=user_stats.diary_stats_entry(diary, diary.wine)
+            )
+            await db.commit()
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             raise Exception(f"일기 수정 중 오류 발생: {str(e)}")
+        
+        # 커밋 이후 단계는 롤백 경로 밖에서 실행 (피드 갱신 실패는 로그만 남김)
+        await db.refresh(diary)
+        try:
+            await public_feed_service.on_diary_saved(db, user_id, diary_id)
+        except Exception as e:
+            print(f"일기 수정 후 공개 피드 갱신 실패 ({user_id}, {diary_id}): {str(e)}")
+        return diary
     
     @staticmethod
-    def delete_diary(
-        db: Session,
+    async def delete_diary(
+        db: AsyncSession,
         user_id: int,
         diary_id: int
     ) -> bool:
         """
-        일기 삭제
+        일기 삭제 (이미지는 같은 트랜잭션에서 삭제 대기열에 기록하고 스위퍼가 삭제)
         """
         try:
-            result = diary_crud.delete_diary(db, user_id, diary_id)
-            if result:
-                db.commit()
-            return result
+            diary = await diary_crud.get_diary_by_id(db, user_id, diary_id, with_wine=True)
+            if not diary:
+                return False
+            
+            await user_stats.apply_diary_change(db, user_id, old=user_stats.diary_stats_entry(diary, diary.wine))
+            
+            image_data = {field: getattr(diary, field) for field in DIARY_IMAGE_FOLDERS}
+            image_data["imageManifest"] = diary.imageManifest
+            await storage_outbox.enqueue_deletions(db, diary_image_keys(image_data), "diary_deleted")
+            
+            result = await diary_crud.delete_diary(db, user_id, diary_id)
+            await db.commit()
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             raise Exception(f"일기 삭제 중 오류 발생: {str(e)}")
+        
+        try:
+            public_feed_service.on_diary_deleted(user_id, diary_id)
+        except Exception as e:
+            print(f"일기 삭제 후 공개 피드 갱신 실패 ({user_id}, {diary_id}): {str(e)}")
+        return result
+    
+    @staticmethod
+    async def get_user_stats(db: AsyncSession, user_id: int) -> Optional:
+        """
+        사용자 일기 통계 요약 조회
+        """
+        return await user_stats.get_stats(db, user_id)
     
     @staticmethod
-    def get_public_diaries(
-        db: Session,
-        skip: int = 0,
+    async def get_public_diaries(
+        db: AsyncSession,
+        cursor: Optional[str] = None,
         limit: int = 20
-    ) -> List:
+    ) -> Tuple[List, Optional[str]]:
         """
-        공개된 일기 목록 조회
+        공개된 일기 목록 조회 (일기 목록, 다음 페이지 커서)
+        최신 구간은 메모리 피드 버퍼에서, 그보다 오래된 페이지는 DB에서 조회
         """
-        return diary_crud.get_public_diaries(db, skip, limit)
+        page = await public_feed_service.visible_page(db, cursor, limit)
+        if page is not None:
+            return page
+        return await diary_crud.get_public_diaries(db, cursor, limit)
 
 
 # 싱글톤 인스턴스
@@ -1,8 +1,32 @@
 import httpx
 from typing import Optional
 from core.config import settings
+from utils.metrics import upstream_metrics
 
 class KakaoAuthService:
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """kauth/kapi 호출에 재사용하는 커넥션 풀 클라이언트 (keep-alive + HTTP/2)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(settings.kakao_timeout, connect=settings.kakao_connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=settings.kakao_max_connections,
+                    max_keepalive_connections=settings.kakao_max_keepalive_connections,
+                    keepalive_expiry=settings.kakao_keepalive_expiry
+                )
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     def get_authorization_url(self, state: str = None) -> str:
         """카카오 로그인 페이지 URL 생성"""
         params = {
@@ -12,10 +36,10 @@ class KakaoAuthService:
         }
         if state:
             params["state"] = state
-            
+
         query_string = "&".join([f"{k}={v}" for k, v in params.items()])
         return f"{settings.KAKAO_AUTH_URL}?{query_string}"
-    
+
     async def get_access_token(self, code: str) -> Optional[str]:
         """인가 코드로 액세스 토큰 받기"""
         data = {
@@ -24,23 +48,27 @@ class KakaoAuthService:
             "redirect_uri": settings.KAKAO_REDIRECT_URI,
             "code": code,
         }
-        
+
         if settings.KAKAO_CLIENT_SECRET:
             data["client_secret"] = settings.KAKAO_CLIENT_SECRET
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(settings.KAKAO_TOKEN_URL, data=data)
-            if response.status_code == 200:
-                token_data = response.json()
-                return token_data.get("access_token")
+
+        async with upstream_metrics.track("kakao.token"):
+            response = await self.client.post(settings.KAKAO_TOKEN_URL, data=data)
+        if response.status_code == 200:
+            token_data = response.json()
+            return token_data.get("access_token")
         return None
-    
+
     async def get_user_info(self, access_token: str) -> Optional[dict]:
         """액세스 토큰으로 사용자 정보 가져오기"""
         headers = {"Authorization": f"Bearer {access_token}"}
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(settings.KAKAO_USER_INFO_URL, headers=headers)
-            if response.status_code == 200:
-                return response.json()
-        return None
\ No newline at end of file
+
+        async with upstream_metrics.track("kakao.user_info"):
+            response = await self.client.get(settings.KAKAO_USER_INFO_URL, headers=headers)
+        if response.status_code == 200:
+            return response.json()
+        return None
+
+
+# 싱글톤 인스턴스
+kakao_auth_service = KakaoAuthService()
@@ -0,0 +1,200 @@
+import asyncio
+import random
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional
+import google.generativeai as genai
+import httpx
+import openai
+from openai import AsyncOpenAI
+from core.config import settings
+from utils.metrics import upstream_metrics
+
+PERPLEXITY_BASE_URL = "https://api.perplexity.ai"
+
+# 재시도할 일시적 오류 (타임아웃, 연결 오류, 429, 5xx)
+_RETRYABLE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class GeminiClient:
+    """
+    앱 수명 동안 재사용하는 Gemini 클라이언트
+    모델은 시작 시 한 번만 생성하고, 비동기 API + 동시 호출 수 제한 + 호출별 타임아웃 적용
+    """
+
+    def __init__(self, model_name: str, timeout: float, max_concurrency: int):
+        self.model_name = model_name
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._model: Optional[genai.GenerativeModel] = None
+
+    def start(self) -> None:
+        if self._model is None:
+            if settings.google_api_key:
+                genai.configure(api_key=settings.google_api_key)
+            self._model = genai.GenerativeModel(self.model_name)
+
+    @property
+    def model(self) -> genai.GenerativeModel:
+        self.start()
+        return self._model
+
+    async def generate(self, contents: Any, timeout: Optional[float] = None):
+        """
+        generate_content_async 호출 (timeout 초과 시 asyncio.TimeoutError)
+        """
+        async with self._semaphore, upstream_metrics.track("gemini.generate"):
+            return await asyncio.wait_for(
+                self.model.generate_content_async(contents),
+                timeout=timeout or self.timeout
+            )
+
+
+class _JsonObjectScanner:
+    """
+    스트리밍 토큰에서 첫 번째 JSON 객체가 닫히는 시점을 찾는 스캐너
+    (문자열 내부의 중괄호와 이스케이프 문자는 무시)
+    """
+
+    def __init__(self):
+        self.buffer: List[str] = []
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> Optional[str]:
+        """완성된 JSON 객체 문자열을 반환, 아직 닫히지 않았으면 None"""
+        for char in text:
+            if not self._started:
+                if char != "{":
+                    continue
+                self._started = True
+
+            self.buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    return "".join(self.buffer)
+        return None
+
+
+class PerplexityClient:
+    """
+    앱 수명 동안 재사용하는 Perplexity(OpenAI 호환) 비동기 클라이언트
+    커넥션 풀 + 타임아웃 + 지터를 적용한 지수 백오프 재시도, 선택적 스트리밍 지원
+    """
+
+    def __init__(self, model: str, timeout: float, max_retries: int, max_connections: int):
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_connections = max_connections
+        self._client: Optional[AsyncOpenAI] = None
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        if self._client is None:
+            self._client = AsyncOpenAI(
+                api_key=settings.perplexity_api_key,
+                base_url=PERPLEXITY_BASE_URL,
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                max_retries=0,  # 재시도는 아래 _with_retry에서 직접 처리
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections
+                    )
+                )
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def _with_retry(self, call):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await call()
+            except _RETRYABLE_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+                # full jitter: 0 ~ 0.5 * 2^attempt 초 사이에서 무작위 대기
+                await asyncio.sleep(random.uniform(0, 0.5 * (2 ** attempt)))
+
+    async def complete(self, messages: List[Dict[str, str]]) -> str:
+        """전체 응답을 받은 뒤 content 반환"""
+        async def call():
+            async with upstream_metrics.track("perplexity.complete"):
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages
+                )
+            return response.choices[0].message.content or ""
+
+        return await self._with_retry(call)
+
+    async def stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """토큰이 도착하는 대로 content 조각을 반환"""
+        response = await self._with_retry(
+            lambda: self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                stream=True
+            )
+        )
+        try:
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await response.close()
+
+    async def complete_json(self, messages: List[Dict[str, str]], stream: Optional[bool] = None) -> str:
+        """
+        응답에서 JSON 객체 문자열만 추출하여 반환
+        스트리밍 모드에서는 JSON 객체가 닫히는 즉시 나머지 응답을 기다리지 않고 반환
+        """
+        if not (settings.perplexity_stream if stream is None else stream):
+            content = (await self.complete(messages)).strip()
+            return content[content.find("{"):content.rfind("}") + 1]
+
+        scanner = _JsonObjectScanner()
+        async with upstream_metrics.track("perplexity.stream"), aclosing(self.stream(messages)) as chunks:
+            async for text in chunks:
+                json_str = scanner.feed(text)
+                if json_str is not None:
+                    return json_str
+        return "".join(scanner.buffer)
+
+
+# 전역 인스턴스 생성
+gemini_client = GeminiClient(
+    model_name=settings.llm_model,
+    timeout=settings.llm_timeout,
+    max_concurrency=settings.llm_max_concurrency
+)
+
+perplexity_client = PerplexityClient(
+    model=settings.perplexity_model,
+    timeout=settings.perplexity_timeout,
+    max_retries=settings.perplexity_max_retries,
+    max_connections=settings.perplexity_max_connections
+)
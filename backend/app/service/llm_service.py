@@ -1,13 +1,34 @@
 import os
 import json
-import google.generativeai as genai
-from fastapi import UploadFile
+import hashlib
+import time
+import asyncio
+import unicodedata
 from typing import List
 from core.config import settings
-from PIL import Image
-import io
 from pydantic import BaseModel, Field
 from schemas.diary import WineTasteRequest
+from utils.image_transcoder import image_transcoder
+from service.llm_client import gemini_client, perplexity_client
+from utils.cache import TTLCache, SQLiteCache, TieredCache
+from utils.phash import dhash, LabelHashIndex
+
+# 테이스팅 노트 캐시 (메모리 LRU → 로컬 SQLite)
+taste_cache = TieredCache(
+    memory=TTLCache(maxsize=settings.taste_cache_memory_size, ttl=settings.taste_cache_ttl),
+    disk=SQLiteCache(
+        path=os.path.join(settings.cache_dir, "llm_cache.sqlite3"),
+        table="wine_taste",
+        ttl=settings.taste_cache_ttl,
+        max_entries=settings.taste_cache_max_entries
+    )
+)
+
+# 라벨 이미지 지각 해시(dHash) 기반 분석 결과 캐시
+label_index = LabelHashIndex(
+    max_distance=settings.label_hash_max_distance,
+    max_entries=settings.label_hash_max_entries
+)
 
 class WineInfo(BaseModel):
     name: str = Field(default="")
@@ -17,41 +38,42 @@ class WineInfo(BaseModel):
     type: str = Field(default="")
     alcohol: str = Field(default="")
 
-async def analyze_wine_images(image_files: List[UploadFile]):
+async def analyze_wine_images(contents_list: List[bytes]):
     """
     Gemini를 사용하여 와인 이미지 2장을 분석하는 함수
+    (엔드포인트에서 크기 검사와 함께 한 번 읽은 이미지 바이트를 그대로 사용)
     """
     try:
         print("\n=== 와인 이미지 분석 시작 ===")
-        print(f"받은 이미지 개수: {len(image_files)}")
-
-        # 이미지 데이터 준비
-        image_parts = []
-        for idx, file in enumerate(image_files):
-            print(f"\n이미지 {idx+1} 읽기 시작...")
-            contents = await file.read()
+        print(f"받은 이미지 개수: {len(contents_list)}")
+        for idx, contents in enumerate(contents_list):
             print(f"이미지 {idx+1} 크기:", len(contents), "bytes")
-            
-            # 바이너리 데이터를 PIL Image로 변환
-            image = Image.open(io.BytesIO(contents))
-            
-            # RGBA 이미지를 RGB로 변환 (필요한 경우)
-            if image.mode == 'RGBA':
-                image = image.convert('RGB')
-            
-            # 이미지를 바이트로 다시 변환
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format=image.format or 'JPEG')
-            img_byte_arr = img_byte_arr.getvalue()
-            
-            image_parts.append({
+
+        # 라벨 해시로 유사한 라벨 쌍의 이전 분석 결과 조회
+        front_hash, back_hash = await asyncio.gather(
+            *[image_transcoder.submit(dhash, contents) for contents in contents_list]
+        )
+        cached_info = label_index.lookup(front_hash, back_hash)
+        if cached_info is not None:
+            print("라벨 해시 캐시 적중 - 모델 호출 생략")
+            return {
+                "success": True,
+                "analysis": {
+                    "wine_analysis": dict(cached_info)
+                }
+            }
+
+        # RGBA → RGB 변환 및 재인코딩 (프로세스 풀에서 처리)
+        normalized_list = await asyncio.gather(
+            *[image_transcoder.normalize(contents) for contents in contents_list]
+        )
+        image_parts = [
+            {
                 'mime_type': 'image/jpeg',
                 'data': img_byte_arr
-            })
-            await file.seek(0)
-
-        print("\nGemini 모델 생성 중...")
-        model = genai.GenerativeModel(settings.llm_model)
+            }
+            for img_byte_arr in normalized_list
+        ]
 
         # 프롬프트 작성
         prompt = """
@@ -82,12 +104,18 @@ async def analyze_wine_images(image_files: List[UploadFile]):
         """
 
         print("\nGemini API 호출 시작...")
-        response = model.generate_content([prompt, *image_parts])
+        started = time.perf_counter()
+        response = await gemini_client.generate([prompt, *image_parts])
+        model_ms = (time.perf_counter() - started) * 1000
         print("Gemini API 응답 받음")
         
         # JSON 문자열 추출 및 파싱
         json_str = response.text.strip('`json\n').strip('`')  # 백틱과 'json' 태그 제거
         wine_info = WineInfo.parse_raw(json_str)
+
+        # 라벨을 인식한 경우에만 캐시에 저장
+        if wine_info.name:
+            label_index.add(front_hash, back_hash, wine_info.dict(), model_ms=model_ms)
         
         return {
             "success": True,
@@ -106,20 +134,35 @@ async def analyze_wine_images(image_files: List[UploadFile]):
             "error": f"{type(e).__name__}: {str(e)}"
         }
 
+def _normalize_field(value: str) -> str:
+    """캐시 키용 정규화: 유니코드 NFKC, 대소문자 무시, 공백 정리"""
+    if not value:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", value).casefold().split())
+
+def _taste_cache_key(request: WineTasteRequest) -> str:
+    fields = [
+        _normalize_field(request.name),
+        _normalize_field(request.origin),
+        _normalize_field(request.grape),
+        _normalize_field(request.year),
+        _normalize_field(request.type),
+    ]
+    return hashlib.sha256(json.dumps(fields, ensure_ascii=False).encode("utf-8")).hexdigest()
+
 async def analyze_wine_taste(request: WineTasteRequest):
     """
     Perplexity AI를 사용하여 와인의 테이스팅 노트를 분석하는 함수
+    동일한 와인 정보로 조회한 결과는 캐시에서 바로 반환
     """
+    cache_key = _taste_cache_key(request)
+    cached_result = await taste_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+
     try:
-        from openai import OpenAI
-        
         print("\n=== 와인 테이스팅 노트 분석 시작 ===")
         print(f"입력 데이터: {request.dict()}")
-        
-        client = OpenAI(
-            api_key=settings.perplexity_api_key,
-            base_url="https://api.perplexity.ai"
-        )
 
         messages = [
             {
@@ -154,20 +197,8 @@ async def analyze_wine_taste(request: WineTasteRequest):
         ]
 
         print("\nAPI 요청 보내는 중...")
-        response = client.chat.completions.create(
-            model="sonar-pro",
-            messages=messages
-        )
-        print("\nAPI 응답 받음:")
-        print("전체 응답 객체:", response)
-        print("\n응답 내용:", response.choices[0].message.content)
-
-        # content에서 JSON 문자열 찾기
-        content = response.choices[0].message.content.strip()
-        print("\n정제된 content:", content)
-        
-        # JSON 부분만 추출 (중괄호로 둘러싸인 부분)
-        json_str = content[content.find("{"):content.rfind("}")+1]
+        # JSON 부분만 추출 (스트리밍 모드에서는 JSON 객체가 완성되는 즉시 반환)
+        json_str = await perplexity_client.complete_json(messages)
         print("\n추출된 JSON 문자열:", json_str)
         
         result = json.loads(json_str)
@@ -187,13 +218,14 @@ async def analyze_wine_taste(request: WineTasteRequest):
         }
         print("\n최종 결과:", final_result)
         print("=== 와인 테이스팅 노트 분석 완료 ===\n")
+        await taste_cache.set(cache_key, final_result)
         return final_result
 
     except Exception as e:
         print("\n!!! 테이스팅 노트 분석 중 에러 발생 !!!")
         print("에러 타입:", type(e).__name__)
         print("에러 메시지:", str(e))
-        print("API 응답:", response.choices[0].message.content if 'response' in locals() else "응답 없음")
+        print("API 응답:", json_str if 'json_str' in locals() else "응답 없음")
         print("=== 와인 테이스팅 노트 분석 실패 ===\n")
         return {
             "success": False,
@@ -0,0 +1,203 @@
+import asyncio
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from crud import diary as diary_crud
+from db.database import SessionLocal
+from schemas.diary import DiaryResponse
+from utils.pagination import encode_cursor, decode_cursor
+
+FeedKey = Tuple[datetime, int, int]
+
+
+def _aware(value: Optional[datetime]) -> datetime:
+    # naive 값(datetime.now()로 만든 객체, SQLite에서 읽은 값)은 서버 로컬 시간
+    # (asyncpg도 naive를 astimezone()으로 로컬 시간으로 해석해 저장, 운영 TZ=Asia/Seoul)
+    if value is None:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    return value if value.tzinfo else value.astimezone()
+
+
+def _feed_key(entry: DiaryResponse) -> FeedKey:
+    return _aware(entry.createdAt), entry.user_id, entry.id
+
+
+class PublicFeedService:
+    """
+    공개 일기 피드 캐시: 최신 공개 일기(와인 정보 포함)를 직렬화해 링 버퍼(deque)에 보관
+    피드 페이지는 버퍼에서 바로 응답하고, 버퍼보다 오래된 페이지만 DB에서 조회
+    공개 일기 저장/수정/삭제 시 버퍼를 갱신하고, 다른 워커 프로세스의 변경은 주기적 재적재로 반영
+    재적재 전까지 다른 워커가 비공개로 바꾸거나 삭제한 일기는 페이지마다 기본 키로 공개 여부만 확인해서 제외
+    """
+
+    def __init__(self, size: int, refresh_interval: float):
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: Deque[DiaryResponse] = deque(maxlen=size)
+        # 페이지 조회용 오래된 순 목록과 정렬 키 (버퍼가 바뀌면 None, 다음 조회 때 다시 만듦)
+        self._sorted: Optional[Tuple[List[DiaryResponse], List[FeedKey]]] = None
+        self._complete = False  # 공개 일기 전체가 버퍼에 들어 있는지
+        self._loaded_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """DB에서 최신 공개 일기로 버퍼 채우기 (콜드 스타트)"""
+        async with SessionLocal() as db:
+            diaries, next_cursor = await diary_crud.get_public_diaries(db, None, self.size)
+        self._entries = deque((DiaryResponse.model_validate(diary) for diary in diaries), maxlen=self.size)
+        self._sorted = None
+        self._complete = next_cursor is None
+        self._loaded_at = time.monotonic()
+        self.version += 1
+
+    def _schedule_refresh(self) -> None:
+        if self._loaded_at is None or time.monotonic() - self._loaded_at < self.refresh_interval:
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        try:
+            await self.start()
+        except Exception as e:
+            print(f"공개 피드 재적재 실패: {e}")
+
+    def _snapshot(self) -> Tuple[List[DiaryResponse], List[FeedKey]]:
+        if self._sorted is None:
+            entries = list(reversed(self._entries))
+            self._sorted = entries, [_feed_key(entry) for entry in entries]
+        return self._sorted
+
+    def _candidates(self, cursor: Optional[str], limit: int) -> Optional[List[DiaryResponse]]:
+        """커서 다음 일기 최대 limit + 1개 (최신순), 버퍼로 한 페이지를 채울 수 없으면 None"""
+        if self._loaded_at is None:
+            return None
+        self._schedule_refresh()
+
+        entries, keys = self._snapshot()
+        end = len(entries)
+        if cursor:
+            created_at, user_id, diary_id = decode_cursor(cursor, 3)
+            end = bisect_left(keys, (_aware(created_at), user_id, diary_id))
+
+        items = entries[max(0, end - limit - 1):end][::-1]
+        if len(items) <= limit and not self._complete:
+            # 버퍼 끝에 걸려 한 페이지를 다 채우지 못하면 DB에서 조회 (짧은 페이지 방지)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return items
+
+    @staticmethod
+    def _to_page(items: List[DiaryResponse], limit: int) -> Tuple[List[DiaryResponse], Optional[str]]:
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            return items, encode_cursor(last.createdAt, last.user_id, last.id)
+        return items, None
+
+    def page(self, cursor: Optional[str], limit: int) -> Optional[Tuple[List[DiaryResponse], Optional[str]]]:
+        """
+        버퍼에서 피드 한 페이지 조회 (DB 확인 없이)
+
+        Returns:
+            tuple | None: (일기 목록, 다음 커서), 버퍼로 한 페이지를 채울 수 없으면 None (DB에서 조회)
+        """
+        items = self._candidates(cursor, limit)
+        return None if items is None else self._to_page(items, limit)
+
+    async def visible_page(
+        self,
+        db: AsyncSession,
+        cursor: Optional[str],
+        limit: int
+    ) -> Optional[Tuple[List[DiaryResponse], Optional[str]]]:
+        """
+        page()와 같지만 페이지 일기가 아직 공개 상태로 남아 있는지 기본 키로 확인
+        (다른 워커에서 비공개 전환/삭제된 일기는 버퍼에서 지우고 다시 조회)
+        """
+        while True:
+            items = self._candidates(cursor, limit)
+            if items is None:
+                return None
+            visible = await diary_crud.get_public_diary_keys(db, [(item.user_id, item.id) for item in items])
+            stale = [item for item in items if (item.user_id, item.id) not in visible]
+            if not stale:
+                return self._to_page(items, limit)
+            for item in stale:
+                self._remove(item.user_id, item.id)
+            self.version += 1
+
+    def _remove(self, user_id: int, diary_id: int) -> bool:
+        for entry in self._entries:
+            if entry.user_id == user_id and entry.id == diary_id:
+                self._entries.remove(entry)
+                self._sorted = None
+                return True
+        return False
+
+    def _insert(self, entry: DiaryResponse) -> None:
+        self._sorted = None
+        key = _feed_key(entry)
+        if not self._entries or key > _feed_key(self._entries[0]):
+            # 새 일기는 거의 항상 가장 최신 → 앞에 추가 (가득 차면 가장 오래된 항목이 밀려남)
+            if len(self._entries) == self.size:
+                self._complete = False
+            self._entries.appendleft(entry)
+            return
+
+        # 오래된 일기가 공개로 바뀐 경우: 버퍼 범위 안이면 정렬 위치에 넣고 다시 구성
+        if not self._complete and key < _feed_key(self._entries[-1]):
+            return
+        entries = sorted([*self._entries, entry], key=_feed_key, reverse=True)
+        if len(entries) > self.size:
+            self._complete = False
+        self._entries = deque(entries[:self.size], maxlen=self.size)
+
+    async def on_diary_saved(self, db: AsyncSession, user_id: int, diary_id: int) -> None:
+        """
+        일기 저장/수정 커밋 후 호출: 공개 일기면 버퍼에 반영, 비공개로 바뀌었으면 제거
+        (버퍼 갱신 실패가 저장 응답을 실패시키지 않도록 로그만 남김)
+        """
+        if self._loaded_at is None:
+            return
+        try:
+            # 세션에 남아 있는 커밋 전 객체 대신 DB에 저장된 값으로 다시 읽음
+            diary = await diary_crud.get_diary_by_id(db, user_id, diary_id, with_wine=True, populate_existing=True)
+            removed = self._remove(user_id, diary_id)
+            if diary is not None and diary.isPublic:
+                self._insert(DiaryResponse.model_validate(diary))
+            elif not removed:
+                return
+            self.version += 1
+        except Exception as e:
+            print(f"공개 피드 갱신 실패 ({user_id}, {diary_id}): {e}")
+
+    def on_diary_deleted(self, user_id: int, diary_id: int) -> None:
+        """일기 삭제 커밋 후 호출"""
+        if self._remove(user_id, diary_id):
+            self.version += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "size": self.size,
+            "complete": self._complete,
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# 싱글톤 인스턴스
+public_feed_service = PublicFeedService(
+    size=settings.public_feed_size,
+    refresh_interval=settings.public_feed_refresh_interval
+)
@@ -0,0 +1,74 @@
+import asyncio
+from typing import Optional
+from core.config import settings
+from crud import storage_outbox
+from db.database import SessionLocal
+from utils.storage import ncp_storage
+
+
+class StorageCleanupService:
+    """
+    storage_deletion_outbox에 쌓인 객체를 주기적으로 일괄 삭제하는 백그라운드 스위퍼
+    요청 처리 경로에서는 outbox에 기록만 하고 Object Storage 호출은 여기서만 수행
+    """
+
+    def __init__(self, interval: float, batch_size: int, max_attempts: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # 배치가 가득 차면 남은 행이 있을 수 있으므로 바로 다음 배치 처리
+                while await self.sweep() >= self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"스토리지 정리 실패: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def sweep(self) -> int:
+        """
+        outbox 한 배치 삭제 (행 잠금은 삭제가 끝나고 커밋할 때까지 유지)
+        
+        Returns:
+            int: 처리한 행 수
+        """
+        async with SessionLocal() as db:
+            rows = await storage_outbox.claim_batch(db, self.batch_size, self.max_attempts)
+            if not rows:
+                await db.commit()
+                return 0
+
+            errors = await asyncio.to_thread(ncp_storage.delete_keys, [row.object_key for row in rows])
+
+            await storage_outbox.complete(db, [row.id for row in rows if row.object_key not in errors])
+            await storage_outbox.record_failures(
+                db, {row.id: errors[row.object_key] for row in rows if row.object_key in errors}
+            )
+            await db.commit()
+
+            if errors:
+                print(f"스토리지 객체 삭제 실패 {len(errors)}건 (다음 스윕에서 재시도)")
+            return len(rows)
+
+
+# 싱글톤 인스턴스
+storage_cleanup_service = StorageCleanupService(
+    interval=settings.storage_sweep_interval,
+    batch_size=settings.storage_sweep_batch_size,
+    max_attempts=settings.storage_sweep_max_attempts
+)
@@ -1,15 +1,39 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
+from core.config import settings
 from models.user import User
+from schemas.user import UserIdentity
+from utils.cache import TTLCache
+
+# 인증 요청마다 반복되는 사용자 조회 캐시 (키: JWT sub = kakao_id)
+user_identity_cache = TTLCache(
+    maxsize=settings.user_cache_size,
+    ttl=settings.user_cache_ttl,
+    enabled=settings.user_cache_enabled
+)
 
 class UserService:
-    def get_user_by_kakao_id(self, db: Session, kakao_id: str) -> Optional[User]:
-        return db.query(User).filter(User.kakao_id == kakao_id).first()
+    async def get_user_by_kakao_id(self, db: AsyncSession, kakao_id: str) -> Optional[User]:
+        result = await db.execute(select(User).where(User.kakao_id == kakao_id).limit(1))
+        return result.scalars().first()
+    
+    async def get_user_identity(self, db: AsyncSession, kakao_id: str) -> Optional[UserIdentity]:
+        """인증용 사용자 식별 정보 조회 (TTL 캐시 우선)"""
+        identity = user_identity_cache.get(kakao_id)
+        if identity is None:
+            user = await self.get_user_by_kakao_id(db, kakao_id)
+            if not user:
+                return None
+            identity = UserIdentity.model_validate(user)
+            user_identity_cache.set(kakao_id, identity)
+        return identity
     
-    def get_user_by_id(self, db: Session, user_id: int) -> Optional[User]:
-        return db.query(User).filter(User.id == user_id).first()
+    async def get_user_by_id(self, db: AsyncSession, user_id: int) -> Optional[User]:
+        result = await db.execute(select(User).where(User.id == user_id).limit(1))
+        return result.scalars().first()
     
-    def create_user(self, db: Session, kakao_user_data: dict, refresh_token: str) -> User:
+    async def create_user(self, db: AsyncSession, kakao_user_data: dict, refresh_token: str) -> User:
         profile = kakao_user_data.get("kakao_account", {}).get("profile", {})
         
         db_user = User(
@@ -20,12 +44,14 @@ class UserService:
             refresh_token=refresh_token
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
+        user_identity_cache.invalidate(db_user.kakao_id)
         return db_user
     
-    def update_user_refresh_token(self, db: Session, user: User, refresh_token: str) -> User:
+    async def update_user_refresh_token(self, db: AsyncSession, user: User, refresh_token: str) -> User:
         user.refresh_token = refresh_token
-        db.commit()
-        db.refresh(user)
-        return user
\ No newline at end of file
+        await db.commit()
+        await db.refresh(user)
+        user_identity_cache.invalidate(user.kakao_id)
+        return user
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Tuple
+from core.config import settings
+from crud import wine as wine_crud
+from db.database import engine, SessionLocal
+from models.wine import Wine, WINE_SEARCH_WEIGHTS
+from utils.ngram import NgramIndex
+from utils.prefix_index import PrefixIndex
+
+
+class WineSearchService:
+    """
+    와인 부분 일치 검색 + 이름 자동완성
+    PostgreSQL은 pg_trgm GIN 인덱스로 검색하고, 그 외(SQLite/테스트)는 메모리 trigram 인덱스 사용
+    자동완성은 항상 메모리 접두사 인덱스(키 입력마다 DB 조회 없음)
+    이 워커에서 커밋한 와인은 바로 반영하고, 다른 워커 프로세스가 추가한 와인은 주기적 재적재로 반영
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self.use_database = engine.dialect.name == "postgresql"
+        self._index = NgramIndex(WINE_SEARCH_WEIGHTS.keys(), WINE_SEARCH_WEIGHTS)
+        self._prefix = PrefixIndex()
+        self._loaded_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._added_while_loading: Optional[List[Tuple[int, Dict[str, str]]]] = None
+
+    def _build(self, rows: List[Tuple]) -> Tuple[PrefixIndex, NgramIndex]:
+        prefix = PrefixIndex()
+        prefix.build([(wine_id, values[0]) for wine_id, *values in rows])
+        index = NgramIndex(WINE_SEARCH_WEIGHTS.keys(), WINE_SEARCH_WEIGHTS)
+        if not self.use_database:
+            for wine_id, *values in rows:
+                index.add(wine_id, dict(zip(WINE_SEARCH_WEIGHTS, values)))
+        return prefix, index
+
+    async def start(self) -> None:
+        """메모리 인덱스 구성 (trigram 인덱스는 PostgreSQL이면 생략)"""
+        self._added_while_loading = []
+        try:
+            async with SessionLocal() as db:
+                rows = await wine_crud.get_search_rows(db)
+            # 재적재 중에도 기존 인덱스로 응답하도록 새 인덱스를 스레드에서 만든 뒤 교체
+            prefix, index = await asyncio.to_thread(self._build, rows)
+            # 조회 이후 이 워커에서 추가된 와인은 새 인덱스에도 반영
+            for wine_id, values in self._added_while_loading:
+                self._add(prefix, index, wine_id, values)
+            self._prefix, self._index = prefix, index
+            self._loaded_at = time.monotonic()
+        finally:
+            self._added_while_loading = None
+
+    def _schedule_refresh(self) -> None:
+        if self._loaded_at is None or time.monotonic() - self._loaded_at < self.refresh_interval:
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        try:
+            await self.start()
+        except Exception as e:
+            print(f"와인 검색 인덱스 재적재 실패: {e}")
+
+    def _add(self, prefix: PrefixIndex, index: NgramIndex, wine_id: int, values: Dict[str, str]) -> None:
+        prefix.add(wine_id, values["name"])
+        if not self.use_database:
+            index.add(wine_id, values)
+
+    def add(self, wine: Wine) -> None:
+        """새로 커밋된 와인을 메모리 인덱스에 반영"""
+        values = {column: getattr(wine, column) for column in WINE_SEARCH_WEIGHTS}
+        if self._added_while_loading is not None:
+            self._added_while_loading.append((wine.id, values))
+        self._add(self._prefix, self._index, wine.id, values)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """이름 접두사 자동완성 [(와인 id, 이름)]"""
+        self._schedule_refresh()
+        return self._prefix.suggest(prefix, limit)
+
+    def stats(self) -> dict:
+        return {
+            "suggest_names": len(self._prefix),
+            "search_backend": "pg_trgm" if self.use_database else "memory",
+            "search_documents": len(self._index),
+        }
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[List[Tuple[Wine, float]], Optional[int]]:
+        """
+        검색 결과 (와인, 점수) 목록과 다음 페이지 offset
+        """
+        if self.use_database:
+            results = await wine_crud.search_wines(db, query, limit + 1, offset)
+        else:
+            self._schedule_refresh()
+            ranked = self._index.search(query, limit + 1, offset)
+            wines = await wine_crud.get_wines_by_ids(db, [wine_id for wine_id, _ in ranked])
+            scores = dict(ranked)
+            results = [(wine, scores[wine.id]) for wine in wines]
+
+        next_offset = offset + limit if len(results) > limit else None
+        return results[:limit], next_offset
+
+
+# 싱글톤 인스턴스
+wine_search_service = WineSearchService(refresh_interval=settings.wine_index_refresh_interval)
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from core.config import settings
+from crud import wine as wine_crud
+from db.database import SessionLocal
+from models.wine import Wine
+from utils.taste_vectors import TasteVectorIndex, TASTE_FIELDS, taste_vector
+
+
+def _type_value(wine_type) -> str:
+    return getattr(wine_type, "value", wine_type)
+
+
+class WineSimilarityService:
+    """
+    맛 프로필(당도/산도/타닌/바디)이 비슷한 와인 추천
+    카탈로그 맛 벡터를 메모리 행렬로 유지하고 새 와인은 커밋 후 추가
+    다른 워커 프로세스가 추가한 와인은 주기적 재적재로 반영 (wine_search와 같은 방식)
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._index = TasteVectorIndex()
+        self._loaded_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._added_while_loading: Optional[List[Tuple[int, str, Tuple[float, ...]]]] = None
+
+    @staticmethod
+    def _build(rows: List[Tuple]) -> TasteVectorIndex:
+        index = TasteVectorIndex()
+        for wine_id, wine_type, *values in rows:
+            index.add(wine_id, _type_value(wine_type), taste_vector(values))
+        return index
+
+    async def start(self) -> None:
+        """맛 벡터 인덱스 구성"""
+        self._added_while_loading = []
+        try:
+            async with SessionLocal() as db:
+                rows = await wine_crud.get_taste_rows(db)
+            # 재적재 중에도 기존 인덱스로 응답하도록 새 인덱스를 스레드에서 만든 뒤 교체
+            index = await asyncio.to_thread(self._build, rows)
+            # 조회 이후 이 워커에서 추가된 와인은 새 인덱스에도 반영
+            for wine_id, wine_type, vector in self._added_while_loading:
+                index.add(wine_id, wine_type, vector)
+            self._index = index
+            self._loaded_at = time.monotonic()
+        finally:
+            self._added_while_loading = None
+
+    def _schedule_refresh(self) -> None:
+        if self._loaded_at is None or time.monotonic() - self._loaded_at < self.refresh_interval:
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        try:
+            await self.start()
+        except Exception as e:
+            print(f"맛 벡터 인덱스 재적재 실패: {e}")
+
+    def add(self, wine: Wine) -> None:
+        """새로 커밋된 와인을 맛 벡터 행렬에 반영"""
+        wine_type = _type_value(wine.type)
+        vector = taste_vector([getattr(wine, field) for field in TASTE_FIELDS])
+        if self._added_while_loading is not None:
+            self._added_while_loading.append((wine.id, wine_type, vector))
+        self._index.add(wine.id, wine_type, vector)
+
+    async def similar(
+        self,
+        db: AsyncSession,
+        wine_ids: List[int],
+        k: int = 10,
+        wine_type: Optional[str] = None
+    ) -> List[List[Tuple[Wine, float]]]:
+        """
+        와인별 맛이 비슷한 와인 k개 (가까운 순, 와인 id 순서대로 한 번에 계산)
+        인덱스에 없는 와인(다른 워커에서 생성 등)은 DB에서 읽어 추가
+        """
+        self._schedule_refresh()
+        for wine_id in wine_ids:
+            if self._index.vector(wine_id) is None:
+                wine = await db.get(Wine, wine_id)
+                if wine is not None:
+                    self.add(wine)
+
+        known = [wine_id for wine_id in wine_ids if self._index.vector(wine_id) is not None]
+        neighbours = dict(zip(known, self._index.knn(
+            [self._index.vector(wine_id) for wine_id in known], k, wine_type, exclude=known
+        )))
+
+        wines = await wine_crud.get_wines_by_ids(
+            db, list({neighbour_id for rows in neighbours.values() for neighbour_id, _ in rows})
+        )
+        wines_by_id = {wine.id: wine for wine in wines}
+        return [
+            [
+                (wines_by_id[neighbour_id], distance)
+                for neighbour_id, distance in neighbours.get(wine_id, [])
+                if neighbour_id in wines_by_id
+            ]
+            for wine_id in wine_ids
+        ]
+
+    def stats(self) -> dict:
+        return {"wines": len(self._index)}
+
+
+# 싱글톤 인스턴스
+wine_similarity_service = WineSimilarityService(refresh_interval=settings.wine_index_refresh_interval)
@@ -1,10 +1,11 @@
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status, Depends, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.config import settings
-from db.database import SessionLocal
+from db.database import get_db
 from service.user_service import UserService
+from schemas.user import UserIdentity
 
 SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm
@@ -67,15 +68,8 @@ class CookieOrHeaderBearer:
 
 cookie_scheme = CookieOrHeaderBearer()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-async def get_current_user(token: str = Depends(cookie_scheme), db: Session = Depends(get_db)):
-    """쿠키의 토큰을 검증해서 현재 사용자 반환"""
+async def get_current_user(token: str = Depends(cookie_scheme), db: AsyncSession = Depends(get_db)) -> UserIdentity:
+    """쿠키의 토큰을 검증해서 현재 사용자 반환 (사용자 조회는 TTL 캐시 사용)"""
     payload = verify_token(token)
     
     if payload is None or payload.get("type") != "access":
@@ -93,7 +87,7 @@ async def get_current_user(token: str = Depends(cookie_scheme), db: Session = De
         )
     
     user_service = UserService()
-    user = user_service.get_user_by_kakao_id(db, kakao_id)
+    user = await user_service.get_user_identity(db, kakao_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    프로세스 내 LRU + TTL 캐시 (hit/miss 카운터 포함)
+    maxsize를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300, enabled: bool = True):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled and maxsize > 0
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+
+        self._data[key] = (value, time.monotonic() + (ttl if ttl is not None else self.ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+class SQLiteCache:
+    """
+    로컬 SQLite 파일에 저장되는 영구 캐시 (JSON 직렬화 가능한 값만 저장)
+    TTL 만료 항목과 max_entries 초과분은 주기적으로 정리
+    """
+
+    _PRUNE_EVERY = 100  # set 호출 N회마다 정리
+
+    def __init__(self, path: str, table: str, ttl: float, max_entries: int = 100000):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{self.table}_expires ON {self.table} (expires_at)")
+            self._conn = conn
+        return self._conn
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0])
+
+    def _set(self, key: str, value: Any) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time() + self.ttl)
+            )
+            self._writes += 1
+            if self._writes % self._PRUNE_EVERY == 0:
+                self._prune(conn)
+            conn.commit()
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),))
+        # 가장 먼저 만료될 항목부터 max_entries 초과분 제거
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class TieredCache:
+    """
+    메모리(LRU) → SQLite 2단계 캐시
+    SQLite에서 찾은 값은 메모리 계층으로 올려서 다음 조회는 메모리에서 응답
+    """
+
+    def __init__(self, memory: TTLCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.disk_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        if self.disk is not None:
+            try:
+                value = await self.disk.get(key)
+            except Exception as e:
+                print(f"캐시 조회 실패 ({self.disk.table}): {e}")
+                value = None
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                await self.disk.set(key, value)
+            except Exception as e:
+                print(f"캐시 저장 실패 ({self.disk.table}): {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        memory_stats = self.memory.stats()
+        total = memory_stats["hits"] + self.disk_hits + self.misses
+        return {
+            "memory": memory_stats,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((memory_stats["hits"] + self.disk_hits) / total, 4) if total else 0.0
+        }
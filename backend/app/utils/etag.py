@@ -0,0 +1,51 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Optional
+from fastapi import Request, Response
+
+# 응답은 사용자별이므로 공유 캐시에는 저장하지 않고, 클라이언트는 매번 ETag로 재검증
+CACHE_CONTROL = "private, no-cache"
+
+# 사용자와 무관한 응답(공개 피드)은 공유 캐시(CDN/프록시)도 저장하되 매번 ETag로 재검증
+PUBLIC_CACHE_CONTROL = "public, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    리소스 버전 값(updatedAt, 개수, 버전 카운터 등)으로 strong ETag 생성
+    """
+    raw = "|".join(part.isoformat() if isinstance(part, datetime) else repr(part) for part in parts)
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    If-None-Match 헤더가 ETag와 일치하는지 (If-None-Match는 weak 비교: W/ 접두사 무시)
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [value.strip() for value in header.split(",")]
+    return any(value.removeprefix("W/") == etag for value in candidates)
+
+
+def set_etag(response: Response, etag: str, cache_control: str = CACHE_CONTROL) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str = CACHE_CONTROL
+) -> Optional[Response]:
+    """
+    조건부 요청 처리: 일치하면 본문 없는 304 응답을 반환, 아니면 응답에 ETag 헤더를 설정하고 None
+    """
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    set_etag(response, etag, cache_control)
+    return None
@@ -0,0 +1,185 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+from typing import Any, Callable, Dict, Optional, Tuple
+from PIL import Image
+from core.config import settings
+
+
+class TranscoderBusyError(Exception):
+    """이미지 처리 대기열이 가득 차서 작업을 받을 수 없을 때 발생"""
+
+
+# 아래 함수들은 프로세스 풀 워커에서 실행되므로 모듈 최상위에 정의 (pickle 가능해야 함)
+def transcode_image(
+    data: bytes,
+    max_size: Tuple[int, int] = (1920, 1080),
+    image_format: str = "JPEG",
+    quality: int = 85
+) -> bytes:
+    """
+    이미지를 RGB로 변환하고 최대 크기에 맞춰 리사이즈 후 재인코딩
+    """
+    image = Image.open(BytesIO(data))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    image.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+    output = BytesIO()
+    image.save(output, format=image_format, quality=quality, optimize=True)
+    return output.getvalue()
+
+
+def transcode_derivatives(data: bytes, specs: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, bytes], float]:
+    """
+    원본 한 장을 한 번만 디코딩해서 설정된 파생 이미지(썸네일/피드/원본 크기 등)를 모두 생성
+    큰 크기부터 차례로 줄여 나가므로 작은 파생 이미지는 이전 단계 결과를 재사용
+    
+    Args:
+        specs: {이름: {"max_size": [w, h], "format": "WEBP" | "JPEG", "quality": int}}
+        
+    Returns:
+        tuple: ({이름: 인코딩된 바이트}, 사용한 CPU 시간(ms))
+    """
+    cpu_started = time.process_time()
+    ordered = sorted(specs.items(), key=lambda item: item[1]["max_size"][0] * item[1]["max_size"][1], reverse=True)
+
+    image = Image.open(BytesIO(data))
+    # JPEG은 필요한 최대 크기 근처로 축소 디코딩
+    largest = tuple(ordered[0][1]["max_size"])
+    image.draft('RGB', largest)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    outputs = {}
+    for name, spec in ordered:
+        image.thumbnail(tuple(spec["max_size"]), Image.Resampling.LANCZOS)
+        output = BytesIO()
+        image.save(output, format=spec["format"], quality=spec.get("quality", 85), optimize=True)
+        outputs[name] = output.getvalue()
+
+    return outputs, (time.process_time() - cpu_started) * 1000
+
+
+def normalize_image(data: bytes) -> bytes:
+    """
+    LLM 전송용 정규화: RGBA 이미지를 RGB로 변환하고 원본 포맷으로 다시 인코딩
+    """
+    image = Image.open(BytesIO(data))
+    image_format = image.format or 'JPEG'
+    if image.mode == 'RGBA':
+        image = image.convert('RGB')
+
+    output = BytesIO()
+    image.save(output, format=image_format)
+    return output.getvalue()
+
+
+def available_cpus() -> int:
+    """
+    컨테이너에서 실제로 쓸 수 있는 CPU 수
+    os.cpu_count()는 호스트 코어 수를 돌려주므로 CPU affinity와 cgroup CPU quota 중 작은 값을 사용
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+
+    quota = None
+    try:
+        # cgroup v2: "<quota> <period>" 또는 "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            limit, period = f.read().split()[:2]
+            if limit != "max":
+                quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            # cgroup v1
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                limit = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+            if limit > 0 and period > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return max(1, cpus)
+
+
+class ImageTranscoder:
+    """
+    CPU 작업(이미지 디코딩/인코딩)을 전용 프로세스 풀에서 처리하는 서비스
+    대기 중인 작업 수를 제한하여 풀이 포화되면 호출자가 기다리도록(backpressure) 한다
+    """
+
+    def __init__(self, max_workers: int = 0, max_pending: int = 0, queue_timeout: float = 10.0):
+        # max_workers(TRANSCODE_WORKERS)가 0이면 컨테이너 CPU quota 기준
+        self.max_workers = max_workers or available_cpus()
+        self.max_pending = max_pending or self.max_workers * 2
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        if self._executor is None:
+            # 부모 프로세스는 스레드(boto3, to_thread)를 사용하므로 fork 대신 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def submit(self, fn: Callable, *args, **kwargs):
+        """
+        프로세스 풀에 작업 제출 (대기열이 가득 차면 queue_timeout 동안 대기 후 TranscoderBusyError)
+        """
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise TranscoderBusyError("이미지 처리 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요")
+
+        try:
+            self.start()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+        finally:
+            self._slots.release()
+
+    async def transcode(
+        self,
+        data: bytes,
+        max_size: Tuple[int, int] = (1920, 1080),
+        image_format: str = "JPEG",
+        quality: int = 85
+    ) -> bytes:
+        """업로드용 리사이즈 + 재인코딩"""
+        return await self.submit(transcode_image, data, max_size, image_format, quality)
+
+    async def derivatives(self, data: bytes, specs: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, bytes], float]:
+        """설정된 파생 이미지 일괄 생성"""
+        return await self.submit(transcode_derivatives, data, specs)
+
+    async def normalize(self, data: bytes) -> bytes:
+        """LLM 분석용 정규화"""
+        return await self.submit(normalize_image, data)
+
+
+# 전역 인스턴스 생성
+image_transcoder = ImageTranscoder(
+    max_workers=settings.transcode_workers,
+    max_pending=settings.transcode_max_pending,
+    queue_timeout=settings.transcode_queue_timeout
+)
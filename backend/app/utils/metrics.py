@@ -0,0 +1,74 @@
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict
+
+
+class _LatencyStats:
+    __slots__ = ("count", "errors", "total_ms", "max_ms", "samples")
+
+    def __init__(self, sample_size: int):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+
+    def add(self, elapsed_ms: float, error: bool) -> None:
+        self.count += 1
+        self.errors += int(error)
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.samples.append(elapsed_ms)
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+
+        def percentile(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 1)
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(self.max_ms, 1)
+        }
+
+
+class LatencyRecorder:
+    """
+    외부 호출(업스트림)별 지연 시간 기록 (최근 sample_size개로 p50/p95 계산)
+    """
+
+    def __init__(self, sample_size: int = 512):
+        self.sample_size = sample_size
+        self._stats: Dict[str, _LatencyStats] = {}
+
+    def record(self, name: str, elapsed_ms: float, error: bool = False) -> None:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _LatencyStats(self.sample_size)
+        stats.add(elapsed_ms, error)
+
+    @asynccontextmanager
+    async def track(self, name: str):
+        started = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000, error)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.summary() for name, stats in self._stats.items()}
+
+
+# 전역 인스턴스 생성
+upstream_metrics = LatencyRecorder()
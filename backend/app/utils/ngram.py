@@ -0,0 +1,112 @@
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Sequence, Set, Tuple
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_text(value: str) -> str:
+    """검색용 정규화 (NFKC + 대소문자 무시 + 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFKC", value or "").casefold().split())
+
+
+def trigrams(value: str) -> Set[str]:
+    """
+    pg_trgm과 같은 방식의 trigram 집합 (단어마다 앞 공백 2개, 뒤 공백 1개를 붙여서 분해)
+    한글/라틴 문자 모두 단어 문자로 취급
+    """
+    grams = set()
+    for word in _WORD_RE.findall(normalize_text(value)):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NgramIndex:
+    """
+    pg_trgm을 쓸 수 없는 환경(SQLite/테스트)용 메모리 trigram 역색인
+    점수는 word_similarity와 비슷하게 "검색어 trigram 중 필드에 포함된 비율"의 필드별 가중 최대값
+    """
+
+    def __init__(self, fields: Sequence[str], weights: Dict[str, float], threshold: float = 0.5):
+        self.fields = tuple(fields)
+        self.weights = weights
+        self.threshold = threshold
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._docs: Dict[int, Dict[str, Tuple[str, Set[str]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id: int, values: Dict[str, str]) -> None:
+        self.remove(doc_id)
+        doc = {}
+        for field in self.fields:
+            text = normalize_text(values.get(field, ""))
+            grams = trigrams(text)
+            doc[field] = (text, grams)
+            for gram in grams:
+                self._postings[gram].add(doc_id)
+        self._docs[doc_id] = doc
+
+    def remove(self, doc_id: int) -> None:
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for _, grams in doc.values():
+            for gram in grams:
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard(doc_id)
+                    if not postings:
+                        del self._postings[gram]
+
+    def score(self, doc_id: int, query: str, query_grams: Set[str]) -> float:
+        best = 0.0
+        for field, (text, grams) in self._docs[doc_id].items():
+            if query and query in text:
+                similarity = 1.0
+            elif query_grams:
+                similarity = len(query_grams & grams) / len(query_grams)
+            else:
+                similarity = 0.0
+            best = max(best, similarity * self.weights.get(field, 1.0))
+        return best
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> List[Tuple[int, float]]:
+        """
+        검색어와 비슷한 문서를 점수순으로 반환
+
+        Returns:
+            list: [(문서 id, 점수)] (점수 내림차순, 같으면 id 오름차순)
+        """
+        query = normalize_text(query)
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        # 필드를 합친 일치 개수가 기준에 못 미치면 어떤 필드도 기준을 넘을 수 없으므로 후보에서 제외
+        counts: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for doc_id in self._postings.get(gram, ()):
+                counts[doc_id] += 1
+        min_count = self.threshold * len(query_grams) / max(self.weights.get(f, 1.0) for f in self.fields)
+
+        ranked = []
+        for doc_id, count in counts.items():
+            if count < min_count:
+                continue
+            score = self.score(doc_id, query, query_grams)
+            if score >= self.threshold:
+                ranked.append((doc_id, round(score, 4)))
+
+        # 부분 문자열 일치는 trigram이 모자라도 포함 (짧은 검색어)
+        if len(query) < 3:
+            seen = {doc_id for doc_id, _ in ranked}
+            for doc_id, doc in self._docs.items():
+                if doc_id not in seen and any(query in text for text, _ in doc.values()):
+                    ranked.append((doc_id, round(self.score(doc_id, query, query_grams), 4)))
+
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked[offset:offset + limit]
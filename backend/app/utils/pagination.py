@@ -0,0 +1,36 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+
+class InvalidCursorError(ValueError):
+    """커서 토큰을 해석할 수 없을 때 발생"""
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    정렬 키 값들을 불투명한 커서 토큰(base64url JSON)으로 변환
+    datetime은 ISO 8601 문자열로 저장
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    """
+    커서 토큰을 정렬 키 값 목록으로 복원 (첫 번째 값은 datetime, 나머지는 정수 id)
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("cursor size mismatch")
+        values[0] = datetime.fromisoformat(values[0])
+        # 나머지 값이 SQL 비교/메모리 피드 비교로 그대로 들어가므로 정수만 허용 (bool 제외)
+        if any(type(value) is not int for value in values[1:]):
+            raise ValueError("cursor id must be an integer")
+        return values
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"잘못된 커서입니다: {token}") from e
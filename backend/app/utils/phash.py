@@ -0,0 +1,135 @@
+import threading
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+from PIL import Image
+
+
+def dhash(data: bytes, hash_size: int = 8) -> int:
+    """
+    차이 해시(dHash) 계산: 회색조로 줄인 이미지에서 인접 픽셀 밝기 비교 결과를 비트로 표현
+    (프로세스 풀 워커에서 실행되므로 모듈 최상위에 정의)
+    """
+    image = Image.open(BytesIO(data))
+    # JPEG은 디코딩 단계에서 축소하여 큰 사진도 빠르게 처리
+    image.draft('L', (hash_size * 8, hash_size * 8))
+    image = image.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = list(image.getdata())
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] < pixels[offset + col + 1])
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class _BKNode:
+    __slots__ = ("key", "value", "children")
+
+    def __init__(self, key: int, value: Any):
+        self.key = key
+        self.value = value
+        self.children: Dict[int, "_BKNode"] = {}
+
+
+class LabelHashIndex:
+    """
+    앞면/뒷면 라벨 해시 쌍을 키로 하는 최근접 이웃 인덱스 (해밍 거리 기반 BK-tree)
+    max_entries를 넘으면 오래된 절반을 버리고 트리를 다시 구성
+    """
+
+    def __init__(self, max_distance: int = 10, max_entries: int = 50000):
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+        self._model_ms_total = 0.0
+        self._model_calls = 0
+        self._lock = threading.Lock()
+        self._root: Optional[_BKNode] = None
+        self._entries: List[Tuple[int, Any]] = []
+
+    @staticmethod
+    def pair_key(front_hash: int, back_hash: int) -> int:
+        return (front_hash << 64) | back_hash
+
+    def _insert(self, key: int, value: Any) -> None:
+        if self._root is None:
+            self._root = _BKNode(key, value)
+            return
+
+        node = self._root
+        while True:
+            distance = hamming_distance(key, node.key)
+            if distance == 0:
+                node.value = value
+                return
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _BKNode(key, value)
+                return
+            node = child
+
+    def _nearest(self, key: int) -> Tuple[Optional[_BKNode], int]:
+        best, best_distance = None, self.max_distance + 1
+        stack = [self._root] if self._root else []
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(key, node.key)
+            if distance < best_distance:
+                best, best_distance = node, distance
+            # 삼각 부등식으로 탐색 범위 제한
+            low, high = distance - self.max_distance, distance + self.max_distance
+            stack.extend(child for d, child in node.children.items() if low <= d <= high)
+        return best, best_distance
+
+    def lookup(self, front_hash: int, back_hash: int) -> Optional[Any]:
+        """가장 가까운 라벨 쌍 결과 반환 (앞/뒷면이 바뀐 경우도 확인)"""
+        with self._lock:
+            best, best_distance = self._nearest(self.pair_key(front_hash, back_hash))
+            swapped, swapped_distance = self._nearest(self.pair_key(back_hash, front_hash))
+            if swapped_distance < best_distance:
+                best = swapped
+
+            if best is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            if self._model_calls:
+                self.saved_ms += self._model_ms_total / self._model_calls
+            return best.value
+
+    def add(self, front_hash: int, back_hash: int, value: Any, model_ms: float = 0.0) -> None:
+        """모델 분석 결과 저장 (model_ms: 절약 시간 통계용 모델 호출 시간)"""
+        key = self.pair_key(front_hash, back_hash)
+        with self._lock:
+            if model_ms:
+                self._model_ms_total += model_ms
+                self._model_calls += 1
+
+            self._entries.append((key, value))
+            if len(self._entries) > self.max_entries:
+                self._entries = self._entries[len(self._entries) // 2:]
+                self._root = None
+                for entry_key, entry_value in self._entries:
+                    self._insert(entry_key, entry_value)
+            else:
+                self._insert(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_distance": self.max_distance,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "avg_model_ms": round(self._model_ms_total / self._model_calls, 1) if self._model_calls else 0.0,
+            "latency_saved_ms": round(self.saved_ms, 1)
+        }
@@ -0,0 +1,148 @@
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterator, List, Tuple
+from utils.ngram import normalize_text
+
+
+def fold_text(value: str) -> str:
+    """
+    자동완성용 정규화: normalize_text + 라틴 문자 악센트 제거 (château → chateau)
+    한글은 NFD 후 NFC로 다시 합쳐지므로 그대로 유지
+    """
+    decomposed = unicodedata.normalize("NFD", normalize_text(value))
+    return unicodedata.normalize("NFC", "".join(ch for ch in decomposed if not unicodedata.combining(ch)))
+
+# _text에서 이름 사이 구분자 (fold_text 결과에는 공백 외 공백 문자가 없음)
+_SEPARATOR = "\n"
+# 정렬할 때 키 문자열을 한 번에 만드는 최대 개수
+_SORT_CHUNK = 4096
+
+
+def _sorted_order(text: str, offsets: List[int], ids: List[int]) -> List[int]:
+    """
+    오프셋 인덱스를 (오프셋부터 구분자까지의 문자열, id) 순으로 정렬
+    앞에서부터 한 글자씩 묶음으로 나누고(MSD 기수 정렬), _SORT_CHUNK개 이하가 된 묶음만 키 문자열을 잘라 정렬
+    → 전체 키를 동시에 복사하지 않으므로 정렬 중 추가 메모리는 인덱스 리스트 + 묶음 하나의 키
+    """
+    order = []
+    stack = [(list(range(len(offsets))), 0)]  # (인덱스 묶음, 이미 같은 것으로 확인한 글자 수 / -1이면 키 전체가 같음)
+    while stack:
+        indexes, depth = stack.pop()
+        if depth < 0:
+            order.extend(sorted(indexes, key=ids.__getitem__))
+            continue
+        if len(indexes) <= _SORT_CHUNK:
+            order.extend(sorted(
+                indexes, key=lambda index: (text[offsets[index]:text.index(_SEPARATOR, offsets[index])], ids[index])
+            ))
+            continue
+
+        groups: Dict[str, List[int]] = {}
+        for index in indexes:
+            ch = text[offsets[index] + depth]
+            # 키가 끝난 항목("")은 더 긴 키보다 앞
+            groups.setdefault("" if ch == _SEPARATOR else ch, []).append(index)
+        for ch in sorted(groups, reverse=True):
+            stack.append((groups[ch], -1 if ch == "" else depth + 1))
+    return order
+
+
+class PrefixIndex:
+    """
+    접두사 자동완성 인덱스
+    정규화한 이름을 하나의 문자열(_text)로 이어 붙이고, 이름 전체와 각 단어 시작 위치의 오프셋을
+    그 위치부터의 문자열 순서로 정렬한 정수 배열(_offsets)에서 이분 탐색 ("margaux"로 "Château Margaux"도 찾음)
+    키 문자열을 따로 만들지 않으므로 이름 수에 비례하는 메모리는 정수 배열 두 개 + 원래 이름
+    build 이후 추가된 이름은 작은 정렬 리스트(_recent)에 두고, max_recent를 넘으면 전체를 다시 구성
+    """
+
+    def __init__(self, max_scan: int = 2000, max_recent: int = 1000):
+        self.max_scan = max_scan
+        self.max_recent = max_recent
+        self._text = ""
+        self._offsets = array("q")
+        self._ids = array("q")
+        self._recent: List[Tuple[str, int, bool]] = []  # (키, 와인 id, 이름 전체 여부)
+        self._names: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @staticmethod
+    def _word_starts(folded: str) -> Iterator[int]:
+        for position, ch in enumerate(folded):
+            if ch != " " and (position == 0 or folded[position - 1] == " "):
+                yield position
+
+    def _key(self, offset: int) -> str:
+        return self._text[offset:self._text.index(_SEPARATOR, offset)]
+
+    def build(self, rows: List[Tuple[int, str]]) -> None:
+        """(id, 이름) 목록으로 인덱스 전체 재구성"""
+        self._names = {wine_id: name for wine_id, name in rows if name}
+        parts, offsets, ids = [], [], []
+        position = 0
+        for wine_id, name in self._names.items():
+            folded = fold_text(name)
+            for start in self._word_starts(folded):
+                offsets.append(position + start)
+                ids.append(wine_id)
+            parts.append(folded + _SEPARATOR)
+            position += len(folded) + 1
+
+        text = "".join(parts)
+        order = _sorted_order(text, offsets, ids)
+        self._text = text
+        self._offsets = array("q", (offsets[index] for index in order))
+        self._ids = array("q", (ids[index] for index in order))
+        self._recent = []
+
+    def add(self, wine_id: int, name: str) -> None:
+        """이름 하나 추가 (이미 있으면 무시)"""
+        if not name or wine_id in self._names:
+            return
+        self._names[wine_id] = name
+        folded = fold_text(name)
+        for start in self._word_starts(folded):
+            insort(self._recent, (folded[start:], wine_id, start == 0))
+        if len(self._recent) > self.max_recent:
+            self.build(list(self._names.items()))
+
+    def _matches(self, prefix: str) -> Iterator[Tuple[int, bool]]:
+        """접두사로 시작하는 키의 (와인 id, 이름 전체 일치 여부) - 정렬 배열과 최근 추가분에서 각각 max_scan개까지"""
+        position = bisect_left(self._offsets, prefix, key=self._key)
+        end = min(position + self.max_scan, len(self._offsets))
+        while position < end and self._text.startswith(prefix, self._offsets[position]):
+            offset = self._offsets[position]
+            yield self._ids[position], offset == 0 or self._text[offset - 1] == _SEPARATOR
+            position += 1
+
+        position = bisect_left(self._recent, (prefix,))
+        end = min(position + self.max_scan, len(self._recent))
+        while position < end and self._recent[position][0].startswith(prefix):
+            _, wine_id, whole = self._recent[position]
+            yield wine_id, whole
+            position += 1
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """
+        접두사로 시작하는 이름 (같은 이름은 하나만)
+        이름 전체가 접두사로 시작하는 항목을 단어 중간 일치보다 먼저, 그 안에서는 짧은 이름 순
+
+        Returns:
+            list: [(와인 id, 이름)]
+        """
+        prefix = fold_text(prefix)
+        if not prefix:
+            return []
+
+        matches = {}
+        for wine_id, whole in self._matches(prefix):
+            name = self._names[wine_id]
+            rank = (not whole, len(name), name)
+            if name not in matches or rank < matches[name][0]:
+                matches[name] = (rank, wine_id)
+
+        ranked = sorted(matches.items(), key=lambda item: item[1][0])
+        return [(wine_id, name) for name, (_, wine_id) in ranked[:limit]]
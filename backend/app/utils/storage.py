@@ -1,15 +1,16 @@
+import asyncio
 import boto3
 import uuid
 import base64
 from datetime import datetime
-from io import BytesIO
-from PIL import Image
 from botocore.exceptions import ClientError
 from core.config import settings
+from utils.image_transcoder import image_transcoder
+from utils.upload import read_upload, ALLOWED_IMAGE_TYPES, InvalidUploadError
 import os
 from dotenv import load_dotenv
 from fastapi import UploadFile
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # .env 파일 명시적 로드
 load_dotenv()
@@ -21,6 +22,20 @@ NCP_REGION = os.getenv("NCP_REGION", "kr")
 NCP_BUCKET_NAME = os.getenv("NCP_BUCKET_NAME", "winelog-images")
 NCP_ENDPOINT = f"https://{NCP_BUCKET_NAME}.{NCP_REGION}.ncloudstorage.com"
 
+# 인코딩 포맷별 (확장자, Content-Type)
+IMAGE_FORMATS = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "WEBP": ("webp", "image/webp"),
+    "PNG": ("png", "image/png"),
+}
+
+# 클라이언트 직접 업로드(presigned POST) 객체 경로: uploads/{user_id}/...
+DIRECT_UPLOAD_PREFIX = "uploads"
+
+def file_extension(filename: str, default: str = "jpg") -> str:
+    """파일명에서 확장자 추출 (없으면 default)"""
+    return filename.split('.')[-1] if filename and '.' in filename else default
+
 class NCPObjectStorageService:
     def __init__(self):
         self.s3_client = boto3.client(
@@ -33,7 +48,7 @@ class NCPObjectStorageService:
         self.bucket_name = NCP_BUCKET_NAME
         self.region_code = NCP_REGION
     
-    def upload_base64_image(self, base64_string: str, folder: str = "images") -> str:
+    async def upload_base64_image(self, base64_string: str, folder: str = "images") -> str:
         """
         Base64 이미지를 Naver Cloud Object Storage에 업로드
         
@@ -50,44 +65,12 @@ class NCPObjectStorageService:
                 base64_string = base64_string.split(',')[1]
             
             image_data = base64.b64decode(base64_string)
-            
-            # 파일명 생성 (타임스탬프 + UUID)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_id = str(uuid.uuid4())[:8]
-            file_name = f"{folder}/{timestamp}_{unique_id}.jpg"
-            
-            # 이미지 최적화
-            image = Image.open(BytesIO(image_data))
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # 이미지 리사이즈 (최대 1920x1080)
-            image.thumbnail((1920, 1080), Image.Resampling.LANCZOS)
-            
-            # 최적화된 이미지를 BytesIO로 변환
-            output = BytesIO()
-            image.save(output, format='JPEG', quality=85, optimize=True)
-            output.seek(0)
-            
-            # NCP Object Storage 업로드
-            self.s3_client.upload_fileobj(
-                output,
-                self.bucket_name,
-                file_name,
-                ExtraArgs={
-                    'ContentType': 'image/jpeg',
-                    'CacheControl': 'max-age=31536000'  # 1년 캐시
-                }
-            )
-            
-            # NCP Object Storage URL 형식으로 반환
-            image_url = f"https://{self.bucket_name}.{self.region_code}.ncloudstorage.com/{file_name}"
-            return image_url
+            return await self.upload_image_bytes(image_data, folder)
             
         except Exception as e:
             raise Exception(f"NCP Object Storage 업로드 실패: {str(e)}")
     
-    def upload_multiple_images(self, images: list, folder: str = "images") -> list:
+    async def upload_multiple_images(self, images: list, folder: str = "images") -> list:
         """
         여러 이미지를 한번에 업로드
         
@@ -98,14 +81,12 @@ class NCPObjectStorageService:
         Returns:
             list: 업로드된 이미지 URL 리스트 (None 포함 가능)
         """
-        uploaded_urls = []
-        for image_base64 in images:
+        async def upload_one(image_base64):
             if image_base64:  # None이 아닌 경우만
-                url = self.upload_base64_image(image_base64, folder)
-                uploaded_urls.append(url)
-            else:
-                uploaded_urls.append(None)
-        return uploaded_urls
+                return await self.upload_base64_image(image_base64, folder)
+            return None
+        
+        return list(await asyncio.gather(*[upload_one(image) for image in images]))
     
     def delete_image(self, image_url: str) -> bool:
         """
@@ -118,12 +99,8 @@ class NCPObjectStorageService:
             bool: 삭제 성공 여부
         """
         try:
-            # URL에서 파일 경로 추출
-            # https://bucket.kr-standard.ncloudstorage.com/folder/file.jpg → folder/file.jpg
-            url_parts = image_url.split(f"{self.bucket_name}.{self.region_code}.ncloudstorage.com/")
-            if len(url_parts) > 1:
-                file_name = url_parts[1]
-            else:
+            file_name = self.object_key(image_url)
+            if file_name is None:
                 raise Exception("잘못된 URL 형식")
             
             self.s3_client.delete_object(
@@ -135,6 +112,38 @@ class NCPObjectStorageService:
             print(f"NCP Object Storage 삭제 실패: {str(e)}")
             return False
     
+    def object_key(self, image_url: str) -> Optional[str]:
+        """
+        URL에서 객체 키(파일 경로) 추출
+        https://bucket.kr-standard.ncloudstorage.com/folder/file.jpg → folder/file.jpg
+        """
+        url_parts = image_url.split(f"{self.bucket_name}.{self.region_code}.ncloudstorage.com/")
+        return url_parts[1] if len(url_parts) > 1 and url_parts[1] else None
+    
+    def delete_keys(self, keys: List[str]) -> Dict[str, str]:
+        """
+        객체들을 delete_objects로 일괄 삭제 (요청당 최대 1000개, boto3 블로킹 호출)
+        이미 없는 키는 성공으로 처리
+        
+        Returns:
+            dict: 삭제에 실패한 {키: 오류 메시지}
+        """
+        errors = {}
+        for start in range(0, len(keys), 1000):
+            batch = keys[start:start + 1000]
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+                )
+            except Exception as e:
+                errors.update({key: str(e) for key in batch})
+                continue
+            for error in response.get("Errors", []):
+                if error.get("Code") != "NoSuchKey":
+                    errors[error["Key"]] = f"{error.get('Code')}: {error.get('Message')}"
+        return errors
+    
     def get_presigned_url(self, file_name: str, expiration: int = 3600) -> str:
         """
         Presigned URL 생성 (임시 접근 URL)
@@ -156,6 +165,159 @@ class NCPObjectStorageService:
         except Exception as e:
             raise Exception(f"Presigned URL 생성 실패: {str(e)}")
     
+    def create_presigned_upload(self, user_id: int, content_type: str) -> dict:
+        """
+        클라이언트가 이미지를 Object Storage에 직접 올릴 수 있는 presigned POST 발급
+        크기(content-length-range)와 Content-Type은 정책 조건으로 고정
+        업로드된 원본은 uploads/{user_id}/ 아래에 저장되며 일기 저장 시 파생 이미지 생성에만 사용
+        
+        Returns:
+            dict: {"url", "fields", "key", "expires_in"}
+        """
+        extension = ALLOWED_IMAGE_TYPES.get(content_type)
+        if extension is None:
+            raise InvalidUploadError(f"지원하지 않는 파일 형식입니다: {content_type}. 지원 형식: jpeg, jpg, png, webp")
+        
+        key = self._new_file_name(f"{DIRECT_UPLOAD_PREFIX}/{user_id}", extension)
+        expiration = settings.presigned_upload_expiration
+        try:
+            response = self.s3_client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=key,
+                Fields={"Content-Type": content_type},
+                Conditions=[
+                    {"Content-Type": content_type},
+                    ["content-length-range", 1, settings.max_file_size],
+                ],
+                ExpiresIn=expiration
+            )
+        except Exception as e:
+            raise Exception(f"Presigned 업로드 URL 생성 실패: {str(e)}")
+        
+        return {
+            "url": response["url"],
+            "fields": response["fields"],
+            "key": key,
+            "expires_in": expiration
+        }
+    
+    def _head_object(self, key: str) -> dict:
+        return self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
+    
+    def _get_object(self, key: str) -> bytes:
+        response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        return response["Body"].read()
+    
+    async def verify_direct_upload(self, user_id: int, key: str) -> str:
+        """
+        직접 업로드된 객체 검증 (소유자 경로, 존재 여부, 크기, Content-Type)
+        
+        Returns:
+            str: 확장자
+        """
+        if not key.startswith(f"{DIRECT_UPLOAD_PREFIX}/{user_id}/") or ".." in key:
+            raise InvalidUploadError(f"업로드 키를 사용할 수 없습니다: {key}")
+        
+        try:
+            head = await asyncio.to_thread(self._head_object, key)
+        except ClientError:
+            raise InvalidUploadError(f"업로드된 파일을 찾을 수 없습니다: {key}")
+        
+        size = head.get("ContentLength", 0)
+        if size <= 0 or size > settings.max_file_size:
+            raise InvalidUploadError(f"파일 크기가 허용 범위를 벗어났습니다: {key} ({size}바이트)")
+        
+        extension = ALLOWED_IMAGE_TYPES.get(head.get("ContentType"))
+        if extension is None:
+            raise InvalidUploadError(f"지원하지 않는 파일 형식입니다: {head.get('ContentType')}")
+        return extension
+    
+    async def read_direct_upload(self, key: str) -> bytes:
+        """직접 업로드된 원본 이미지 다운로드 (검증은 verify_direct_upload에서)"""
+        data = await asyncio.to_thread(self._get_object, key)
+        if len(data) > settings.max_file_size:
+            raise InvalidUploadError(f"파일 크기가 허용 범위를 벗어났습니다: {key}")
+        return data
+    
+    def _put_object(self, data: bytes, file_name: str, content_type: str = 'image/jpeg') -> None:
+        """
+        NCP Object Storage에 업로드 (boto3 블로킹 호출)
+        """
+        # 이미 메모리에 있는 바이트를 그대로 본문으로 전송 (BytesIO 복사/멀티파트 스레드 없음)
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key=file_name,
+            Body=data,
+            ContentType=content_type,
+            CacheControl='max-age=31536000'  # 1년 캐시
+        )
+    
+    @staticmethod
+    def _new_file_name(folder: str, extension: str) -> str:
+        # 파일명 생성 (타임스탬프 + UUID)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        unique_id = str(uuid.uuid4())[:8]
+        return f"{folder}/{timestamp}_{unique_id}.{extension}"
+    
+    def _public_url(self, file_name: str) -> str:
+        # NCP Object Storage URL 형식
+        return f"https://{self.bucket_name}.{self.region_code}.ncloudstorage.com/{file_name}"
+    
+    async def upload_image_bytes(self, contents: bytes, folder: str = "images", extension: str = "jpg") -> str:
+        """
+        이미지 바이트를 최적화 후 업로드 (블로킹 작업은 이벤트 루프 밖에서 실행)
+        
+        Args:
+            contents: 원본 이미지 바이트
+            folder: 저장할 폴더 경로
+            extension: 저장할 파일 확장자
+            
+        Returns:
+            str: 업로드된 이미지 URL
+        """
+        file_name = self._new_file_name(folder, extension)
+        
+        # 이미지 최적화는 프로세스 풀에서, 업로드는 스레드 풀에서 처리
+        optimized = await image_transcoder.transcode(contents)
+        await asyncio.to_thread(self._put_object, optimized, file_name)
+        
+        return self._public_url(file_name)
+    
+    async def upload_derivatives(
+        self,
+        contents: bytes,
+        folder: str = "images",
+        uploaded: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """
+        원본 한 장에서 settings.image_derivatives에 정의된 파생 이미지를 만들어 모두 업로드
+        
+        Args:
+            contents: 원본 이미지 바이트
+            folder: 저장할 폴더 경로 (파생 이미지 이름이 하위 폴더가 됨)
+            uploaded: 업로드가 끝난 파생 이미지를 바로 기록할 dict (일부가 실패해도 호출자가 정리 가능)
+            
+        Returns:
+            dict: {파생 이미지 이름: URL} (이미지 manifest)
+        """
+        specs = settings.image_derivatives
+        encoded, _ = await image_transcoder.derivatives(contents, specs)
+        uploaded = {} if uploaded is None else uploaded
+        
+        async def put(name: str, data: bytes) -> None:
+            image_format = specs[name]["format"].upper()
+            extension, content_type = IMAGE_FORMATS.get(image_format, ("jpg", "image/jpeg"))
+            file_name = self._new_file_name(f"{folder}/{name}", extension)
+            await asyncio.to_thread(self._put_object, data, file_name, content_type)
+            uploaded[name] = self._public_url(file_name)
+        
+        # 하나가 실패해도 나머지 업로드가 끝날 때까지 기다린 뒤 예외 전파 (기록 누락 방지)
+        results = await asyncio.gather(*[put(name, data) for name, data in encoded.items()], return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return uploaded
+    
     async def upload_file_objects(self, files: List[UploadFile], folder: str = "images") -> List[str]:
         """
         UploadFile 객체들을 직접 업로드
@@ -171,48 +333,13 @@ class NCPObjectStorageService:
         
         for file in files:
             try:
-                # 파일 내용 읽기
-                contents = await file.read()
-                
-                # 파일명 생성 (타임스탬프 + UUID)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                unique_id = str(uuid.uuid4())[:8]
+                # 파일 내용 읽기 (청크 단위 크기 검사)
+                contents = await read_upload(file)
                 
                 # 원본 파일 확장자 유지
-                original_extension = file.filename.split('.')[-1] if '.' in file.filename else 'jpg'
-                file_name = f"{folder}/{timestamp}_{unique_id}.{original_extension}"
-                
-                # 이미지 최적화
-                image = Image.open(BytesIO(contents))
-                if image.mode != 'RGB':
-                    image = image.convert('RGB')
-                
-                # 이미지 리사이즈 (최대 1920x1080)
-                image.thumbnail((1920, 1080), Image.Resampling.LANCZOS)
-                
-                # 최적화된 이미지를 BytesIO로 변환
-                output = BytesIO()
-                image.save(output, format='JPEG', quality=85, optimize=True)
-                output.seek(0)
-                
-                # NCP Object Storage 업로드
-                self.s3_client.upload_fileobj(
-                    output,
-                    self.bucket_name,
-                    file_name,
-                    ExtraArgs={
-                        'ContentType': 'image/jpeg',
-                        'CacheControl': 'max-age=31536000'  # 1년 캐시
-                    }
-                )
-                
-                # NCP Object Storage URL 형식으로 반환
-                image_url = f"https://{self.bucket_name}.{self.region_code}.ncloudstorage.com/{file_name}"
+                image_url = await self.upload_image_bytes(contents, folder, file_extension(file.filename))
                 uploaded_urls.append(image_url)
                 
-                # 파일 포인터 리셋
-                await file.seek(0)
-                
             except Exception as e:
                 raise Exception(f"파일 업로드 실패 ({file.filename}): {str(e)}")
         
@@ -222,7 +349,7 @@ class NCPObjectStorageService:
 ncp_storage = NCPObjectStorageService()
 
 # 편의 함수들
-def upload_diary_images(front_image: str = None, back_image: str = None, 
+async def upload_diary_images(front_image: str = None, back_image: str = None, 
                        thumbnail_image: str = None, download_image: str = None) -> tuple:
     """
     일기 관련 이미지들을 업로드하는 편의 함수
@@ -232,10 +359,10 @@ def upload_diary_images(front_image: str = None, back_image: str = None,
     """
     folder = f"diary/{datetime.now().strftime('%Y/%m')}"
     images = [front_image, back_image, thumbnail_image, download_image]
-    urls = ncp_storage.upload_multiple_images(images, folder)
+    urls = await ncp_storage.upload_multiple_images(images, folder)
     return tuple(urls)
 
-def upload_wine_images(front_image: str = None, back_image: str = None) -> tuple:
+async def upload_wine_images(front_image: str = None, back_image: str = None) -> tuple:
     """
     와인 라벨 이미지들을 업로드하는 편의 함수 (미래를 위해)
     
@@ -244,12 +371,28 @@ def upload_wine_images(front_image: str = None, back_image: str = None) -> tuple
     """
     folder = f"wine/{datetime.now().strftime('%Y/%m')}"
     images = [front_image, back_image]
-    urls = ncp_storage.upload_multiple_images(images, folder)
+    urls = await ncp_storage.upload_multiple_images(images, folder)
     return tuple(urls)
 
+def diary_image_keys(diary_data: dict) -> List[str]:
+    """
+    일기 관련 모든 이미지(파생 이미지 포함)의 객체 키 목록
+    
+    Args:
+        diary_data: 이미지 URL들(+ imageManifest)이 포함된 딕셔너리
+    """
+    image_fields = ['frontImage', 'backImage', 'thumbnailImage', 'downloadImage']
+    urls = [diary_data.get(field) for field in image_fields]
+    for derivatives in (diary_data.get('imageManifest') or {}).values():
+        urls.extend(derivatives.values())
+    
+    keys = [ncp_storage.object_key(url) for url in urls if url]
+    return list(dict.fromkeys(key for key in keys if key))
+
 def delete_diary_images(diary_data: dict) -> bool:
     """
-    일기 관련 모든 이미지 삭제
+    일기 관련 모든 이미지 일괄 삭제 (delete_objects)
+    요청 처리 중에는 storage_deletion_outbox에 기록하고 스위퍼가 삭제하도록 할 것
     
     Args:
         diary_data: 이미지 URL들이 포함된 딕셔너리
@@ -257,12 +400,5 @@ def delete_diary_images(diary_data: dict) -> bool:
     Returns:
         bool: 모든 삭제 성공 여부
     """
-    image_fields = ['frontImage', 'backImage', 'thumbnailImage', 'downloadImage']
-    success_count = 0
-    
-    for field in image_fields:
-        if diary_data.get(field):
-            if ncp_storage.delete_image(diary_data[field]):
-                success_count += 1
-    
-    return success_count > 0  # 하나라도 성공하면 True 
\ No newline at end of file
+    keys = diary_image_keys(diary_data)
+    return bool(keys) and not ncp_storage.delete_keys(keys) 
\ No newline at end of file
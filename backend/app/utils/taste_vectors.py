@@ -0,0 +1,134 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+# 맛 벡터 차원 (Wine 컬럼 순서)
+TASTE_FIELDS = ("sweetness", "acidity", "tannin", "body")
+
+# 같은 벡터로 묶는 양자화 단위 (0-5 척도에서 0.1 단위)
+_QUANTIZE = 10
+
+
+def taste_vector(values: Sequence[int]) -> Tuple[float, ...]:
+    """
+    맛 점수를 0-5 척도로 정규화 (기존 데이터는 1-5, LLM 분석 결과는 0-100 척도가 섞여 있음)
+    """
+    return tuple(value / 20 if value > 5 else float(value) for value in values)
+
+
+class _VectorTable:
+    """
+    서로 다른 맛 벡터만 행으로 저장하는 행렬 (같은 벡터의 와인은 members에 묶음)
+    점수가 정수라 카탈로그가 커져도 고유 벡터 수는 작게 유지됨
+    용량이 부족하면 두 배로 늘려서 추가 비용을 상각
+    """
+
+    def __init__(self, dims: int, capacity: int = 1024):
+        self.count = 0
+        self._matrix = np.zeros((capacity, dims), dtype=np.float32)
+        self._norms = np.zeros(capacity, dtype=np.float32)
+        self._rows: Dict[Tuple[int, ...], int] = {}
+        self.members: List[List[int]] = []
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._matrix[:self.count]
+
+    @property
+    def norms(self) -> np.ndarray:
+        return self._norms[:self.count]
+
+    def add(self, wine_id: int, vector: Tuple[float, ...]) -> None:
+        key = tuple(int(round(value * _QUANTIZE)) for value in vector)
+        row = self._rows.get(key)
+        if row is not None:
+            self.members[row].append(wine_id)
+            return
+
+        if self.count == len(self._matrix):
+            self._matrix = np.concatenate([self._matrix, np.zeros_like(self._matrix)])
+            self._norms = np.concatenate([self._norms, np.zeros_like(self._norms)])
+
+        row = self.count
+        self._matrix[row] = np.asarray(key, dtype=np.float32) / _QUANTIZE
+        self._norms[row] = float(np.dot(self._matrix[row], self._matrix[row]))
+        self._rows[key] = row
+        self.members.append([wine_id])
+        self.count += 1
+
+
+class TasteVectorIndex:
+    """
+    와인 맛 벡터 최근접 이웃(kNN) 인덱스
+    전체 카탈로그와 와인 종류별 테이블을 함께 유지하여 종류 필터 검색도 같은 비용으로 처리
+    """
+
+    def __init__(self, dims: int = len(TASTE_FIELDS)):
+        self.dims = dims
+        self._all = _VectorTable(dims)
+        self._by_type: Dict[str, _VectorTable] = {}
+        self._vectors: Dict[int, Tuple[float, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def vector(self, wine_id: int) -> Optional[Tuple[float, ...]]:
+        return self._vectors.get(wine_id)
+
+    def add(self, wine_id: int, wine_type: str, vector: Tuple[float, ...]) -> None:
+        """와인 추가 (맛 점수는 생성 후 바뀌지 않으므로 이미 있으면 무시)"""
+        if wine_id in self._vectors:
+            return
+        self._vectors[wine_id] = vector
+        self._all.add(wine_id, vector)
+        self._by_type.setdefault(wine_type, _VectorTable(self.dims)).add(wine_id, vector)
+
+    def knn(
+        self,
+        queries: Sequence[Tuple[float, ...]],
+        k: int = 10,
+        wine_type: Optional[str] = None,
+        exclude: Optional[Sequence[Optional[int]]] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        여러 쿼리 벡터의 k개 최근접 와인을 한 번의 행렬 연산으로 계산 (유클리드 거리)
+
+        Args:
+            exclude: 쿼리별로 결과에서 뺄 와인 id (자기 자신)
+
+        Returns:
+            list: 쿼리별 [(와인 id, 거리)] (가까운 순)
+        """
+        table = self._all if wine_type is None else self._by_type.get(wine_type)
+        if table is None or table.count == 0 or not queries:
+            return [[] for _ in queries]
+
+        query_matrix = np.asarray(queries, dtype=np.float32)
+        # |q - x|^2 = |q|^2 - 2 q·x + |x|^2
+        distances = (
+            (query_matrix ** 2).sum(axis=1, keepdims=True)
+            - 2 * query_matrix @ table.matrix.T
+            + table.norms
+        )
+        np.maximum(distances, 0, out=distances)
+
+        # 자기 자신이 빠질 수 있으므로 고유 벡터는 k+1개까지 후보로
+        candidates = min(k + 1, table.count)
+        if candidates < table.count:
+            nearest = np.argpartition(distances, candidates - 1, axis=1)[:, :candidates]
+        else:
+            nearest = np.broadcast_to(np.arange(table.count), (len(queries), table.count))
+
+        results = []
+        for index, rows in enumerate(nearest):
+            skip = exclude[index] if exclude else None
+            rows = rows[np.argsort(distances[index, rows], kind="stable")]
+            neighbours = []
+            for row in rows:
+                distance = float(np.sqrt(distances[index, row]))
+                for wine_id in table.members[row]:
+                    if wine_id != skip:
+                        neighbours.append((wine_id, distance))
+                if len(neighbours) >= k:
+                    break
+            results.append(neighbours[:k])
+        return results
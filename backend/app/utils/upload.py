@@ -0,0 +1,89 @@
+import asyncio
+import os
+from typing import BinaryIO, Optional
+from fastapi import UploadFile
+from core.config import settings
+
+# 업로드 파일을 읽을 때 한 번에 읽는 크기
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+# 업로드를 허용하는 이미지 Content-Type별 확장자
+ALLOWED_IMAGE_TYPES = {
+    "image/jpeg": "jpg",
+    "image/jpg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+}
+
+
+class InvalidUploadError(ValueError):
+    """업로드 파일(또는 직접 업로드한 객체)이 검증을 통과하지 못했을 때 발생"""
+
+
+class UploadTooLargeError(InvalidUploadError):
+    """업로드 파일이 최대 크기를 넘을 때 발생"""
+
+
+def _check_declared_size(file: UploadFile, max_size: int) -> None:
+    # multipart 파서가 알려준 크기가 있으면 읽기 전에 바로 거절
+    if file.size is not None and file.size > max_size:
+        raise UploadTooLargeError(f"파일 크기가 너무 큽니다: {file.filename}. 최대 {max_size}바이트")
+
+
+async def read_upload(file: UploadFile, max_size: Optional[int] = None) -> bytes:
+    """
+    업로드 파일을 청크 단위로 읽으면서 크기를 검사하고 한 번만 합쳐서 반환
+    최대 크기를 넘는 순간 읽기를 중단 (UploadTooLargeError)
+    """
+    max_size = max_size or settings.max_file_size
+    _check_declared_size(file, max_size)
+
+    await file.seek(0)
+    chunks = []
+    total = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_size:
+            raise UploadTooLargeError(f"파일 크기가 너무 큽니다: {file.filename}. 최대 {max_size}바이트")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _copy_chunks(source: BinaryIO, target: BinaryIO, name: str, max_size: int) -> int:
+    total = 0
+    while True:
+        chunk = source.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            return total
+        total += len(chunk)
+        if total > max_size:
+            raise UploadTooLargeError(f"파일 크기가 너무 큽니다: {name}. 최대 {max_size}바이트")
+        target.write(chunk)
+
+
+async def save_upload(file: UploadFile, path: str, max_size: Optional[int] = None) -> int:
+    """
+    업로드 파일을 메모리에 모으지 않고 청크 단위로 디스크에 복사
+
+    Returns:
+        int: 저장한 바이트 수
+    """
+    max_size = max_size or settings.max_file_size
+    _check_declared_size(file, max_size)
+
+    def copy() -> int:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file.file.seek(0)
+        try:
+            with open(path, "wb") as target:
+                return _copy_chunks(file.file, target, file.filename, max_size)
+        except Exception:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+
+    return await asyncio.to_thread(copy)
@@ -0,0 +1,127 @@
+"""
+동기 Session vs AsyncSession 동시 요청 처리량 (user-001)
+
+async 핸들러 안에서 동기 세션으로 쿼리하던 이전 방식(이벤트 루프 블로킹)과
+비동기 엔진(create_async_engine + AsyncSession)을 같은 DB, 같은 쿼리로 비교
+- 요청: 일기 목록 조회 쿼리 한 번 (사용자별 최신순 20건, 와인 JOIN)
+- 동시에 가벼운 요청(ping) 지연도 측정해서 느린 쿼리가 다른 요청을 막는지 확인
+- 로컬 SQLite는 네트워크 왕복이 없으므로 --db-latency(ms)로 쿼리당 DB 왕복 지연을 더함
+  (동기 드라이버는 그동안 스레드를 붙잡고, 비동기 드라이버는 이벤트 루프를 양보)
+  실제 PostgreSQL로 측정하려면 DATABASE_URL을 지정하고 --db-latency 0
+
+실행 (backend 디렉터리에서):
+    python benchmarks/bench_async_db.py [--requests 200] [--concurrency 50] [--db-latency 2]
+"""
+import argparse
+import asyncio
+import os
+import time
+from bench_common import Timer, latency_summary, report, reset_database
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import Session
+from db.database import SessionLocal, engine
+from models import Diary, Wine
+from models.user import User
+
+USERS = 50
+DIARIES_PER_USER = 200
+
+
+async def seed() -> None:
+    await reset_database()
+    async with SessionLocal() as db:
+        await db.execute(insert(User), [
+            {"id": user_id, "kakao_id": str(user_id), "nickname": f"u{user_id}", "diary_seq": DIARIES_PER_USER}
+            for user_id in range(1, USERS + 1)
+        ])
+        await db.execute(insert(Wine), [
+            {"id": wine_id, "name": f"Wine {wine_id}", "origin": "France", "grape": "Merlot", "year": "2020",
+             "alcohol": "13%", "type": "red", "aroma_note": "", "taste_note": "", "finish_note": "",
+             "sweetness": 1, "acidity": 3, "tannin": 3, "body": 4}
+            for wine_id in range(1, 101)
+        ])
+        await db.execute(insert(Diary), [
+            {"id": diary_id, "user_id": user_id, "wine_id": (user_id * diary_id) % 100 + 1, "rating": 4,
+             "review": "x" * 200, "isPublic": diary_id % 2 == 0}
+            for user_id in range(1, USERS + 1) for diary_id in range(1, DIARIES_PER_USER + 1)
+        ])
+        await db.commit()
+
+
+def list_query(user_id: int):
+    return (
+        select(Diary, Wine).join(Wine, Wine.id == Diary.wine_id)
+        .where(Diary.user_id == user_id)
+        .order_by(Diary.createdAt.desc(), Diary.id.desc())
+        .limit(20)
+    )
+
+
+async def run(handler, requests: int, concurrency: int):
+    """handler(user_id)를 concurrency개씩 동시에 실행하고 처리량/지연, ping 지연 측정"""
+    slots = asyncio.Semaphore(concurrency)
+    latencies, ping_latencies = [], []
+    done = asyncio.Event()
+
+    async def one(index: int):
+        async with slots:
+            started = time.perf_counter()
+            await handler(index % USERS + 1)
+            latencies.append(time.perf_counter() - started)
+
+    async def ping():
+        # 이벤트 루프가 막히지 않았다면 sleep(0.005)는 거의 정확히 5ms 뒤에 깨어남
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            ping_latencies.append(time.perf_counter() - started - 0.005)
+
+    pinger = asyncio.create_task(ping())
+    with Timer() as timer:
+        await asyncio.gather(*[one(index) for index in range(requests)])
+    done.set()
+    await pinger
+    return requests / timer.seconds, latencies, ping_latencies
+
+
+async def main(requests: int, concurrency: int, db_latency: float) -> None:
+    await seed()
+    sync_url = os.environ["DATABASE_URL"]
+    if sync_url.startswith("postgresql+asyncpg://"):
+        sync_url = "postgresql://" + sync_url[len("postgresql+asyncpg://"):]
+    sync_engine = create_engine(sync_url, pool_size=concurrency, max_overflow=0) \
+        if not sync_url.startswith("sqlite") else create_engine(sync_url)
+
+    async def blocking_handler(user_id: int):
+        # 이전 방식: async def 핸들러에서 동기 Session 사용
+        with Session(sync_engine) as db:
+            time.sleep(db_latency)
+            db.execute(list_query(user_id)).all()
+            time.sleep(db_latency)
+            db.execute(text("SELECT count(*) FROM diaries WHERE user_id = :u"), {"u": user_id}).scalar()
+
+    async def async_handler(user_id: int):
+        async with SessionLocal() as db:
+            await asyncio.sleep(db_latency)
+            (await db.execute(list_query(user_id))).all()
+            await asyncio.sleep(db_latency)
+            (await db.execute(text("SELECT count(*) FROM diaries WHERE user_id = :u"), {"u": user_id})).scalar()
+
+    for label, handler in (("sync Session (blocking)", blocking_handler), ("AsyncSession", async_handler)):
+        await handler(1)  # 워밍업
+        throughput, latencies, pings = await run(handler, requests, concurrency)
+        pings = latency_summary(pings)
+        report(label, throughput=f"{throughput:7.1f} req/s", **latency_summary(latencies),
+               ping_p95=pings["p95"], ping_max=pings["max"])
+
+    sync_engine.dispose()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--db-latency", type=float, default=2.0, help="쿼리당 DB 왕복 지연(ms)")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.db_latency / 1000))
@@ -0,0 +1,71 @@
+"""
+벤치마크 공통 설정
+
+앱 모듈은 import 시점에 환경 변수로 설정을 읽으므로 import 전에 기본값 지정
+DATABASE_URL을 지정하지 않으면 임시 디렉터리의 SQLite 파일 사용
+
+실행 (backend 디렉터리에서):
+    python benchmarks/bench_<이름>.py [옵션]
+"""
+import math
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Sequence
+
+TMP_DIR = tempfile.mkdtemp(prefix="winelog-bench-")
+for _key, _value in {
+    "DATABASE_URL": f"sqlite:///{os.path.join(TMP_DIR, 'bench.db')}",
+    "USER_CACHE_ENABLED": "false",
+    "SECRET_KEY": "bench-secret-key",
+    "UPLOAD_DIR": os.path.join(TMP_DIR, "uploads"),
+    "CACHE_DIR": os.path.join(TMP_DIR, "cache"),
+    "DB_ECHO": "false",
+}.items():
+    os.environ.setdefault(_key, _value)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """nearest-rank 백분위수"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, str]:
+    """지연 시간 목록(초)을 p50/p95/max(ms) 문자열로 요약"""
+    return {
+        "p50": f"{percentile(seconds, 50) * 1000:.2f}ms",
+        "p95": f"{percentile(seconds, 95) * 1000:.2f}ms",
+        "max": f"{max(seconds, default=0) * 1000:.2f}ms",
+    }
+
+
+def report(label: str, **fields) -> None:
+    print(f"{label:<34} " + "  ".join(f"{name} {value}" for name, value in fields.items()))
+
+
+async def reset_database() -> None:
+    """빈 스키마로 초기화 (현재 DATABASE_URL 대상)"""
+    import models  # noqa: F401  (메타데이터 등록)
+    import models.user  # noqa: F401
+    from db.database import Base, engine
+    from db.schema import sync_schema
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(sync_schema)
+
+
+class Timer:
+    """with 블록 경과 시간(초)"""
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.started
@@ -0,0 +1,142 @@
+"""
+조건부 GET(ETag) 재생 벤치마크: 화면 진입마다 목록/상세/내 정보를 다시 받는 모바일 클라이언트 (user-025)
+
+사용자 --users명(일기 --diaries건씩)이 화면에 들어올 때마다 GET /diary/, /diary/{id}, /auth/me를 보내는
+요청 흐름을 --focuses회 재생하고, 진입 사이 --change-rate 비율로 일기를 수정
+- 이전: If-None-Match 없이 매번 전체 응답
+- 현재: 마지막 ETag로 If-None-Match를 보내고 304면 캐시한 본문 사용
+- 측정: 응답 바이트(본문), 요청 지연, 304 비율
+- 목록 버전 조회 비용: 이전 count + max(일기/와인) JOIN 집계 vs 현재 users 한 행 + wines.updated_at 인덱스 MAX
+
+실행 (backend 디렉터리에서):
+    python benchmarks/bench_etag_replay.py [--users 50] [--diaries 2000] [--focuses 1000] [--change-rate 0.1]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from bench_common import Timer, latency_summary, report, reset_database
+import httpx
+from sqlalchemy import func, insert, select, update
+from crud import diary as diary_crud
+from db.database import SessionLocal, engine
+from main import app
+from models import Diary, Wine
+from models.user import User
+from service.diary_service import diary_service
+from utils.auth import create_access_token
+
+PATHS = ["/api/v1/diary/", "/api/v1/diary/{diary_id}", "/api/v1/auth/me"]
+
+
+async def seed(users: int, diaries: int) -> None:
+    rng = random.Random(9)
+    await reset_database()
+    async with SessionLocal() as db:
+        await db.execute(insert(User), [
+            {"id": user_id, "kakao_id": str(user_id), "nickname": f"u{user_id}", "diary_seq": diaries}
+            for user_id in range(1, users + 1)
+        ])
+        await db.execute(insert(Wine), [
+            {"id": wine_id, "name": f"Wine {wine_id}", "origin": "France, Bordeaux", "grape": "Merlot, Cabernet Franc",
+             "year": "2020", "alcohol": "13.5%", "type": "red", "aroma_note": "plum, cedar", "taste_note": "round",
+             "finish_note": "medium", "sweetness": 1, "acidity": 3, "tannin": 3, "body": 4}
+            for wine_id in range(1, 501)
+        ])
+        await db.commit()
+
+    started_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for user_id in range(1, users + 1):
+        async with SessionLocal() as db:
+            await db.execute(insert(Diary), [
+                {"id": diary_id, "user_id": user_id, "wine_id": rng.randint(1, 500), "rating": rng.randint(1, 5),
+                 "review": "향이 좋고 여운이 길다 " * 4, "price": 30000, "isPublic": False,
+                 "createdAt": started_at + timedelta(hours=diary_id), "updatedAt": started_at + timedelta(hours=diary_id)}
+                for diary_id in range(1, diaries + 1)
+            ])
+            await db.commit()
+
+
+async def replay(client, args, conditional: bool):
+    rng = random.Random(4)
+    cache = {}  # (user_id, url) → (ETag, 본문)
+    latencies, body_bytes, not_modified = [], 0, 0
+    for _ in range(args.focuses):
+        user_id = rng.randint(1, args.users)
+        if rng.random() < args.change_rate:
+            async with SessionLocal() as db:
+                await diary_service.update_diary(db, user_id, rng.randint(1, args.diaries), {"rating": rng.randint(1, 5)})
+
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+        for path in PATHS:
+            url = path.format(diary_id=rng.randint(1, 5))
+            request_headers = dict(headers)
+            if conditional and (user_id, url) in cache:
+                request_headers["If-None-Match"] = cache[(user_id, url)][0]
+            started = time.perf_counter()
+            response = await client.get(url, headers=request_headers)
+            latencies.append(time.perf_counter() - started)
+            body_bytes += len(response.content)
+            if response.status_code == 304:
+                not_modified += 1
+            elif conditional:
+                cache[(user_id, url)] = (response.headers["ETag"], response.content)
+    return latencies, body_bytes, not_modified
+
+
+async def version_query_ms(query, user_id: int, repeat: int = 200) -> float:
+    samples = []
+    async with SessionLocal() as db:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await query(db, user_id)
+            samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+async def aggregate_version(db, user_id: int):
+    """이전 목록 버전: 사용자 일기 전체 집계 + 와인 JOIN"""
+    result = await db.execute(
+        select(func.count(), func.max(Diary.updatedAt), func.max(Wine.updated_at))
+        .join(Wine, Wine.id == Diary.wine_id)
+        .where(Diary.user_id == user_id)
+    )
+    return tuple(result.one())
+
+
+async def main(args) -> None:
+    with Timer() as timer:
+        await seed(args.users, args.diaries)
+    report("seed", users=args.users, diaries_per_user=args.diaries, seconds=f"{timer.seconds:.1f}")
+
+    # 수정된 와인이 있어야 wines.updated_at MAX가 의미 있음
+    async with SessionLocal() as db:
+        await db.execute(update(Wine).where(Wine.id <= 50).values(taste_note="edited"))
+        await db.commit()
+    before = await version_query_ms(aggregate_version, 1)
+    after = await version_query_ms(diary_crud.get_user_diaries_version, 1)
+    report("list version query", aggregate=f"{before:.2f}ms", user_row=f"{after:.2f}ms")
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        results = {}
+        for label, conditional in (("full responses (before)", False), ("conditional GET (after)", True)):
+            latencies, body_bytes, hits = await replay(client, args, conditional)
+            results[label] = (latencies, body_bytes)
+            report(label, requests=len(latencies), body=f"{body_bytes / 1e6:6.2f}MB",
+                   not_modified=f"{hits / len(latencies):.0%}", **latency_summary(latencies))
+
+    (before_latencies, before_bytes), (after_latencies, after_bytes) = results.values()
+    report("saved", body=f"{1 - after_bytes / before_bytes:.0%}",
+           total_time=f"{sum(before_latencies) - sum(after_latencies):.1f}s of {sum(before_latencies):.1f}s")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--diaries", type=int, default=2000)
+    parser.add_argument("--focuses", type=int, default=1000)
+    parser.add_argument("--change-rate", type=float, default=0.1, help="화면 진입 사이에 일기가 수정될 확률")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,109 @@
+"""
+일기 저장 1건당 전송 바이트/서버 CPU: 클라이언트 생성 파생본 vs 서버 파생본 (user-016)
+
+- 이전: 클라이언트가 frontImage/backImage와 함께 thumbnailImage/downloadImage를 직접 만들어 4장 업로드,
+  서버는 4장 각각을 transcode_image(1920x1080 JPEG)로 재인코딩해서 저장
+- 현재: 클라이언트는 원본 2장만 업로드, 서버가 한 번 디코딩해서 settings.image_derivatives
+  (썸네일/피드 WebP, 원본 크기 JPEG)를 만들어 저장
+- 사진은 휴대폰 카메라 크기(기본 4032x3024)의 합성 이미지, 클라이언트 파생본 크기는 옵션으로 지정
+
+실행 (backend 디렉터리에서):
+    python benchmarks/bench_image_derivatives.py [--saves 5] [--photo 4032x3024]
+"""
+import argparse
+import random
+import statistics
+import time
+from io import BytesIO
+from bench_common import report
+from PIL import Image, ImageDraw, ImageFilter
+from core.config import settings
+from utils.image_transcoder import transcode_derivatives, transcode_image
+
+
+def phone_photo(size, rng: random.Random) -> bytes:
+    """그라데이션 + 도형 + 노이즈로 만든 사진 비슷한 JPEG (휴대폰 기본 품질)"""
+    width, height = size
+    base = Image.linear_gradient("L").resize(size).convert("RGB")
+    draw = ImageDraw.Draw(base)
+    for _ in range(30):
+        x, y = rng.randrange(width), rng.randrange(height)
+        radius = rng.randint(width // 40, width // 6)
+        draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=tuple(rng.randint(0, 255) for _ in range(3)))
+    base = base.filter(ImageFilter.GaussianBlur(4))
+    noise = Image.effect_noise(size, 24).convert("RGB")
+    photo = Image.blend(base, noise, 0.12)
+    output = BytesIO()
+    photo.save(output, format="JPEG", quality=90)
+    return output.getvalue()
+
+
+def client_derivative(data: bytes, max_size, quality: int) -> bytes:
+    """이전 앱이 기기에서 만들던 파생본 (JPEG)"""
+    return transcode_image(data, tuple(max_size), "JPEG", quality)
+
+
+def cpu_ms(fn, *args):
+    started = time.process_time()
+    result = fn(*args)
+    return result, (time.process_time() - started) * 1000
+
+
+def main(args) -> None:
+    rng = random.Random(3)
+    size = tuple(int(value) for value in args.photo.split("x"))
+    before_wire, before_cpu, before_stored = [], [], []
+    after_wire, after_cpu, after_stored = [], [], []
+
+    for _ in range(args.saves):
+        front, back = phone_photo(size, rng), phone_photo(size, rng)
+
+        # 이전: 원본 2장 + 클라이언트 썸네일/다운로드 이미지
+        uploads = [
+            front, back,
+            client_derivative(front, args.client_thumbnail, 80),
+            client_derivative(front, args.client_download, 90),
+        ]
+        cpu, stored = 0.0, 0
+        for data in uploads:
+            output, spent = cpu_ms(transcode_image, data, (1920, 1080), "JPEG", 85)
+            cpu += spent
+            stored += len(output)
+        before_wire.append(sum(len(data) for data in uploads))
+        before_cpu.append(cpu)
+        before_stored.append(stored)
+
+        # 현재: 원본 2장, 서버에서 파생본 생성
+        cpu, stored = 0.0, 0
+        for data in (front, back):
+            outputs, spent = transcode_derivatives(data, settings.image_derivatives)
+            cpu += spent
+            stored += sum(len(output) for output in outputs.values())
+        after_wire.append(len(front) + len(back))
+        after_cpu.append(cpu)
+        after_stored.append(stored)
+
+    for label, wire, cpu, stored in (
+        ("client derivatives (before)", before_wire, before_cpu, before_stored),
+        ("server derivatives (after)", after_wire, after_cpu, after_stored),
+    ):
+        report(
+            label,
+            wire=f"{statistics.mean(wire) / 1e6:6.2f}MB/save",
+            server_cpu=f"{statistics.mean(cpu):7.1f}ms/save",
+            stored=f"{statistics.mean(stored) / 1e6:5.2f}MB/save",
+        )
+    specs = [
+        f"{name} {spec['max_size'][0]}x{spec['max_size'][1]} {spec['format']}"
+        for name, spec in settings.image_derivatives.items()
+    ]
+    print("derivatives: " + ", ".join(specs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--saves", type=int, default=5)
+    parser.add_argument("--photo", default="4032x3024", help="원본 사진 크기 (WxH)")
+    parser.add_argument("--client-thumbnail", type=int, nargs=2, default=[320, 320], help="이전 앱 썸네일 최대 크기")
+    parser.add_argument("--client-download", type=int, nargs=2, default=[4032, 4032], help="이전 앱 다운로드 이미지 최대 크기")
+    main(parser.parse_args())
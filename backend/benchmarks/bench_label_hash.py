@@ -0,0 +1,134 @@
+"""
+라벨 지각 해시(dHash) 캐시 적중률/절약 시간 (user-005)
+
+같은 라벨을 여러 사용자가 조금씩 다르게 찍은 사진 쌍을 analyze_wine_images에 차례로 넣고
+모델 호출(gemini_client.generate)을 고정 지연의 가짜 응답으로 바꿔 측정
+- 적중률, 잘못된 라벨로 적중한 비율(오탐), 절약한 모델 시간
+- 해시 계산 + 인덱스 조회에 드는 추가 지연
+
+이미지 세트:
+- --images DIR: DIR/<라벨>/front*.jpg, back*.jpg 형태의 실제 사진 (같은 라벨 폴더끼리 같은 와인)
+- 지정하지 않으면 합성 라벨을 만들고 크기/위치/밝기/각도/JPEG 품질을 흔들어 촬영 변형을 흉내냄
+
+실행 (backend 디렉터리에서):
+    python benchmarks/bench_label_hash.py [--labels 60] [--requests 400] [--model-ms 300] [--max-distance 10]
+"""
+import argparse
+import asyncio
+import contextlib
+import glob
+import json
+import os
+import random
+import time
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+from bench_common import latency_summary, report
+from PIL import Image, ImageDraw, ImageEnhance
+from service import llm_service
+from service.llm_client import gemini_client
+from utils.image_transcoder import image_transcoder
+from utils.phash import LabelHashIndex
+
+
+def synthetic_label(rng: random.Random) -> Image.Image:
+    """도형과 글자로 된 임의의 라벨 디자인"""
+    image = Image.new("RGB", (600, 800), tuple(rng.randint(0, 255) for _ in range(3)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(rng.randint(4, 9)):
+        box = sorted(rng.sample(range(600), 2)), sorted(rng.sample(range(800), 2))
+        shape = draw.rectangle if rng.random() < 0.5 else draw.ellipse
+        shape([box[0][0], box[1][0], box[0][1], box[1][1]], fill=tuple(rng.randint(0, 255) for _ in range(3)))
+    for line in range(3):
+        draw.text((rng.randint(20, 300), 100 + line * 200), f"CHATEAU {rng.randint(0, 9999)}", fill=(0, 0, 0))
+    return image
+
+
+def photograph(label: Image.Image, rng: random.Random) -> bytes:
+    """같은 라벨을 다른 사람이 찍은 것처럼 변형"""
+    image = label.rotate(rng.uniform(-2, 2), resample=Image.Resampling.BICUBIC, expand=False, fillcolor=(128, 128, 128))
+    width, height = image.size
+    dx, dy = int(width * rng.uniform(0, 0.04)), int(height * rng.uniform(0, 0.04))
+    image = image.crop((dx, dy, width - int(width * rng.uniform(0, 0.04)), height - int(height * rng.uniform(0, 0.04))))
+    scale = rng.uniform(0.6, 1.6)
+    image = image.resize((int(image.width * scale), int(image.height * scale)))
+    image = ImageEnhance.Brightness(image).enhance(rng.uniform(0.85, 1.15))
+    output = BytesIO()
+    image.save(output, format="JPEG", quality=rng.randint(60, 92))
+    return output.getvalue()
+
+
+def load_image_set(path: str):
+    """실제 사진 세트: [(라벨, [(front, back), ...]), ...]"""
+    labels = []
+    for folder in sorted(glob.glob(os.path.join(path, "*"))):
+        fronts = sorted(glob.glob(os.path.join(folder, "front*")))
+        backs = sorted(glob.glob(os.path.join(folder, "back*")))
+        pairs = [(open(front, "rb").read(), open(back, "rb").read()) for front, back in zip(fronts, backs)]
+        if pairs:
+            labels.append((os.path.basename(folder), pairs))
+    return labels
+
+
+async def main(args) -> None:
+    rng = random.Random(7)
+    if args.images:
+        labels = load_image_set(args.images)
+        requests = [(name, rng.choice(pairs)) for name, pairs in labels for _ in range(len(pairs))]
+        rng.shuffle(requests)
+    else:
+        designs = [(f"wine-{index}", synthetic_label(rng), synthetic_label(rng)) for index in range(args.labels)]
+        # 인기 라벨일수록 자주 찍힘 (Zipf 분포)
+        weights = [1 / (rank + 1) for rank in range(len(designs))]
+        requests = []
+        for name, front, back in rng.choices(designs, weights=weights, k=args.requests):
+            pair = (photograph(front, rng), photograph(back, rng))
+            requests.append((name, pair if rng.random() < 0.9 else pair[::-1]))
+
+    current = {}
+
+    async def fake_generate(contents, timeout=None):
+        await asyncio.sleep(args.model_ms / 1000)
+        return SimpleNamespace(text=json.dumps({"name": current["label"], "type": "red"}))
+
+    gemini_client.generate = fake_generate
+    llm_service.label_index = LabelHashIndex(max_distance=args.max_distance)
+    image_transcoder.start()
+
+    wrong, latencies, hit_latencies = 0, [], []
+    try:
+        for label, (front, back) in requests:
+            current["label"] = label
+            calls_before = llm_service.label_index.hits
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(StringIO()):  # 분석 함수의 진행 로그 생략
+                result = await llm_service.analyze_wine_images([front, back])
+            elapsed = time.perf_counter() - started
+            latencies.append(elapsed)
+            if llm_service.label_index.hits > calls_before:
+                hit_latencies.append(elapsed)
+                if result["analysis"]["wine_analysis"]["name"] != label:
+                    wrong += 1
+    finally:
+        image_transcoder.shutdown()
+
+    stats = llm_service.label_index.stats()
+    distinct = len({label for label, _ in requests})
+    total_ms = sum(latencies) * 1000
+    report("requests", count=len(requests), distinct_labels=distinct,
+           best_possible_hit_rate=f"{(len(requests) - distinct) / len(requests):.3f}")
+    report("label hash cache", hit_rate=f"{stats['hit_rate']:.3f}", hits=stats["hits"], wrong_hits=wrong,
+           latency_saved=f"{stats['latency_saved_ms'] / 1000:.1f}s")
+    report("wall time", with_cache=f"{total_ms / 1000:.1f}s",
+           without_cache=f"{len(requests) * args.model_ms / 1000:.1f}s (model only)")
+    report("hit latency (hash + lookup)", **latency_summary(hit_latencies))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", help="실제 사진 세트 디렉터리 (DIR/<라벨>/front*, back*)")
+    parser.add_argument("--labels", type=int, default=60)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--model-ms", type=float, default=300, help="가짜 모델 응답 지연(ms)")
+    parser.add_argument("--max-distance", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
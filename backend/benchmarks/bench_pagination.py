@@ -0,0 +1,128 @@
+"""
+키셋(커서) vs OFFSET 페이지네이션 깊이별 비용 (user-009)
+
+합성 일기 --rows건(기본 100만, 절반 공개)을 넣고 깊이별로 한 페이지 조회 시간을 비교
+- 공개 피드: get_public_diaries (createdAt, user_id, id) 커서
+- 내 일기 목록: 일기가 많은 사용자 1명에 대해 get_user_diaries (createdAt, id) 커서
+- 비교 대상: 같은 정렬에 OFFSET (N-1) * limit
+
+실행 (backend 디렉터리에서):
+    python benchmarks/bench_pagination.py [--rows 1000000] [--limit 20]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from bench_common import Timer, report, reset_database
+from sqlalchemy import insert, select
+from sqlalchemy.orm import joinedload
+from crud import diary as diary_crud
+from db.database import SessionLocal, engine
+from models import Diary, Wine
+from models.user import User
+from utils.pagination import encode_cursor
+
+USERS = 10000
+HEAVY_USER_SHARE = 0.2  # 사용자 1이 전체 일기의 20%를 가짐
+DEPTHS = [1, 10, 100, 1000, 10000]
+REPEAT = 15
+
+
+async def seed(rows: int) -> None:
+    rng = random.Random(1)
+    await reset_database()
+    async with SessionLocal() as db:
+        await db.execute(insert(User), [
+            {"id": user_id, "kakao_id": str(user_id), "nickname": f"u{user_id}"} for user_id in range(1, USERS + 1)
+        ])
+        await db.execute(insert(Wine), [
+            {"id": wine_id, "name": f"Wine {wine_id}", "origin": "France", "grape": "Merlot", "year": "2020",
+             "alcohol": "13%", "type": "red", "aroma_note": "", "taste_note": "", "finish_note": "",
+             "sweetness": 1, "acidity": 3, "tannin": 3, "body": 4}
+            for wine_id in range(1, 1001)
+        ])
+        await db.commit()
+
+    seqs = [0] * (USERS + 1)
+    started_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    batch = []
+    for index in range(rows):
+        user_id = 1 if rng.random() < HEAVY_USER_SHARE else rng.randint(2, USERS)
+        seqs[user_id] += 1
+        batch.append({
+            "id": seqs[user_id], "user_id": user_id, "wine_id": rng.randint(1, 1000), "rating": rng.randint(1, 5),
+            "isPublic": rng.random() < 0.5,
+            # 같은 시각에 여러 일기가 생기는 경우도 포함
+            "createdAt": started_at + timedelta(seconds=index // 2), "updatedAt": started_at,
+        })
+        if len(batch) == 50000:
+            async with SessionLocal() as db:
+                await db.execute(insert(Diary), batch)
+                await db.commit()
+            batch = []
+    if batch:
+        async with SessionLocal() as db:
+            await db.execute(insert(Diary), batch)
+            await db.commit()
+
+
+async def median_ms(run) -> float:
+    samples = []
+    for _ in range(REPEAT):
+        async with SessionLocal() as db:
+            started = time.perf_counter()
+            await run(db)
+            samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+async def compare(label: str, base, order_by, cursor_keys, keyset_page, limit: int) -> None:
+    for depth in DEPTHS:
+        offset = (depth - 1) * limit
+        async with SessionLocal() as db:
+            # 깊이 N 페이지 직전 행의 정렬 키로 커서 생성 (측정에서 제외)
+            previous = (await db.execute(base.order_by(*order_by).offset(offset - 1).limit(1))).scalars().first() \
+                if offset else None
+        if offset and previous is None:
+            break
+        cursor = encode_cursor(*cursor_keys(previous)) if previous else None
+
+        keyset_ms = await median_ms(lambda db: keyset_page(db, cursor))
+        offset_ms = await median_ms(lambda db: db.execute(
+            base.options(joinedload(Diary.wine)).order_by(*order_by).offset(offset).limit(limit)
+        ))
+        report(f"{label} page {depth}", keyset=f"{keyset_ms:7.2f}ms", offset=f"{offset_ms:8.2f}ms")
+
+
+async def main(rows: int, limit: int) -> None:
+    with Timer() as timer:
+        await seed(rows)
+    report("seed", rows=rows, seconds=f"{timer.seconds:.1f}")
+
+    await compare(
+        "public feed",
+        select(Diary).where(Diary.isPublic == True),
+        (Diary.createdAt.desc(), Diary.user_id.desc(), Diary.id.desc()),
+        lambda diary: (diary.createdAt, diary.user_id, diary.id),
+        lambda db, cursor: diary_crud.get_public_diaries(db, cursor=cursor, limit=limit),
+        limit,
+    )
+    await compare(
+        "my diaries (heavy user)",
+        select(Diary).where(Diary.user_id == 1),
+        (Diary.createdAt.desc(), Diary.id.desc()),
+        lambda diary: (diary.createdAt, diary.id),
+        lambda db, cursor: diary_crud.get_user_diaries(db, 1, cursor=cursor, limit=limit),
+        limit,
+    )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.limit))
@@ -0,0 +1,107 @@
+"""
+요청당 세션 공유 전/후 커넥션 풀 부하 테스트 (user-014)
+
+인증된 GET /api/v1/diary/ 를 동시에 보내고 풀 크기별로 비교
+- 공유: get_current_user와 핸들러가 db.database.get_db 세션 하나를 사용 (현재)
+- 분리: get_current_user가 자기 세션을 열어 요청이 끝날 때까지 유지 (이전 utils/auth.get_db)
+- 목록 조회에 --query-ms 지연을 더해 느린 쿼리 동안 커넥션을 붙잡는 상황을 재현
+- 측정: 처리량, 지연, 풀 타임아웃 수, 동시에 목록 쿼리를 실행한 요청 수(최대)
+
+실행 (backend 디렉터리에서):
+    python benchmarks/bench_pool_sharing.py [--pool-sizes 5 10] [--concurrency 50] [--requests 500] [--query-ms 20]
+"""
+import argparse
+import asyncio
+import time
+from bench_common import Timer, latency_summary, report, reset_database
+import httpx
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from db.database import SessionLocal, engine, _db_url
+from main import app
+from models.user import User
+from service.diary_service import diary_service
+from utils.auth import cookie_scheme, create_access_token, get_current_user
+
+
+async def separate_session_user(token: str = Depends(cookie_scheme)):
+    """이전 방식: 인증 의존성이 별도 세션(커넥션)을 요청 끝까지 보유"""
+    async with SessionLocal() as db:
+        yield await get_current_user(token, db)
+
+
+async def run(pool_size: int, separate: bool, args) -> None:
+    # SQLite(aiosqlite) 기본값은 NullPool이므로 운영과 같은 크기 제한 풀을 명시
+    bench_engine = create_async_engine(
+        _db_url, poolclass=AsyncAdaptedQueuePool,
+        pool_size=pool_size, max_overflow=0, pool_timeout=args.pool_timeout
+    )
+    SessionLocal.configure(bind=bench_engine)
+    app.dependency_overrides.clear()
+    if separate:
+        app.dependency_overrides[get_current_user] = separate_session_user
+
+    in_flight, peak = 0, 0
+    original = diary_service.get_user_diaries
+
+    async def slow_get_user_diaries(*call_args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(args.query_ms / 1000)
+            return await original(*call_args, **kwargs)
+        finally:
+            in_flight -= 1
+
+    diary_service.get_user_diaries = slow_get_user_diaries
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+    slots = asyncio.Semaphore(args.concurrency)
+    latencies, statuses = [], []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one():
+            async with slots:
+                started = time.perf_counter()
+                try:
+                    response = await client.get("/api/v1/diary/", headers=headers)
+                    statuses.append(response.status_code)
+                except Exception:
+                    # 풀 타임아웃(TimeoutError)은 ASGI 앱 밖으로 전파됨
+                    statuses.append("timeout")
+                latencies.append(time.perf_counter() - started)
+
+        with Timer() as timer:
+            await asyncio.gather(*[one() for _ in range(args.requests)])
+
+    diary_service.get_user_diaries = original
+    await bench_engine.dispose()
+    ok = sum(1 for status in statuses if status == 200)
+    report(
+        f"pool {pool_size:<3} {'separate' if separate else 'shared'}",
+        ok=ok, failed=len(statuses) - ok, throughput=f"{ok / timer.seconds:6.1f} req/s",
+        peak_queries=peak, **latency_summary(latencies)
+    )
+
+
+async def main(args) -> None:
+    await reset_database()
+    async with SessionLocal() as db:
+        db.add(User(id=1, kakao_id="1", nickname="bench"))
+        await db.commit()
+    await engine.dispose()
+
+    for pool_size in args.pool_sizes:
+        for separate in (True, False):
+            await run(pool_size, separate, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[5, 10])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--query-ms", type=float, default=20, help="목록 쿼리에 더할 지연(ms)")
+    parser.add_argument("--pool-timeout", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,96 @@
+"""
+자동완성 접두사 인덱스 구성 메모리/시간과 suggest 지연 (user-021)
+
+--wines개 합성 이름(흔한 단어 + 생산자/퀴베 역할의 합성 단어, 한국어/라틴 혼합)으로 PrefixIndex.build를 실행하고 tracemalloc 최대 사용량 비교
+- 이전 정렬: 모든 오프셋의 키 문자열을 잘라 sorted의 key로 사용 (키 전체가 동시에 메모리에 있음)
+- 현재 정렬: _sorted_order - 한 글자씩 묶음으로 나누고 작은 묶음만 키를 잘라 정렬
+- 구성 후 남는 메모리(이름 10만 개당 인덱스 크기)와 무작위 접두사 suggest 지연(µs)
+
+실행 (backend 디렉터리에서):
+    python benchmarks/bench_prefix_index.py [--wines 100000] [--queries 2000]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from bench_common import Timer, percentile, report
+import utils.prefix_index as prefix_index
+from utils.prefix_index import PrefixIndex
+
+COMMON = [
+    "château", "domaine", "pinot", "noir", "cabernet", "réserve", "grand", "cru",
+    "샤토", "까베르네", "소비뇽", "리슬링", "brut",
+]
+LATIN_SYLLABLES = ["ma", "gau", "pau", "lac", "ba", "ro", "rio", "ja", "cha", "bli", "san", "cer", "re", "vi", "let", "mon", "tra"]
+HANGUL_SYLLABLES = ["마", "고", "라", "투", "르", "바", "롤", "로", "샤", "블", "리", "몽", "테", "네"]
+
+
+def vocabulary(rng: random.Random, size: int):
+    """생산자/퀴베 이름 역할의 합성 단어 (라틴 80%, 한글 20%)"""
+    words = set()
+    while len(words) < size:
+        syllables = HANGUL_SYLLABLES if rng.random() < 0.2 else LATIN_SYLLABLES
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def slice_sorted_order(text, offsets, ids):
+    """이전 build의 정렬 (비교용)"""
+    return sorted(
+        range(len(offsets)),
+        key=lambda index: (text[offsets[index]:text.index(prefix_index._SEPARATOR, offsets[index])], ids[index])
+    )
+
+
+def build(names, sort):
+    original = prefix_index._sorted_order
+    prefix_index._sorted_order = sort
+    try:
+        # 시간은 tracemalloc 없이, 메모리는 tracemalloc을 켜고 한 번 더 구성해서 측정
+        with Timer() as timer:
+            PrefixIndex().build(names)
+        tracemalloc.start()
+        index = PrefixIndex()
+        index.build(names)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        prefix_index._sorted_order = original
+    return index, timer.seconds, retained, peak
+
+
+def main(args) -> None:
+    rng = random.Random(42)
+    words = vocabulary(rng, 5000)
+    names = [
+        (wine_id, " ".join(rng.sample(COMMON, rng.randint(0, 2)) + rng.sample(words, rng.randint(1, 2))) + f" {wine_id % 1000}")
+        for wine_id in range(1, args.wines + 1)
+    ]
+
+    for label, sort in (("build, slice sort (before)", slice_sorted_order), ("build, chunked sort (after)", prefix_index._sorted_order)):
+        index, seconds, retained, peak = build(names, sort)
+        report(
+            label, seconds=f"{seconds:6.2f}", peak=f"{peak / 1e6:7.1f}MB",
+            retained_per_100k=f"{retained / 1e6 * 100_000 / args.wines:6.1f}MB"
+        )
+
+    prefixes = [name[:rng.randint(1, 8)] for _, name in rng.sample(names, 200)]
+    latencies = {}
+    for query in range(args.queries):
+        prefix = prefixes[query % len(prefixes)]
+        started = time.perf_counter()
+        index.suggest(prefix)
+        # 짧은 접두사는 max_scan개까지 후보를 훑으므로 길이별로 나눠서 보고
+        bucket = "1-2" if len(prefix) <= 2 else "3-5" if len(prefix) <= 5 else "6+"
+        latencies.setdefault(bucket, []).append(time.perf_counter() - started)
+    for bucket in ("1-2", "3-5", "6+"):
+        values = latencies.get(bucket, [])
+        report(f"suggest, {bucket} chars ({len(values)})", **{
+            name: f"{percentile(values, p) * 1e6:.0f}µs" for name, p in (("p50", 50), ("p95", 95), ("p99", 99))
+        })
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wines", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    main(parser.parse_args())
@@ -0,0 +1,95 @@
+"""
+공개 피드 첫 페이지들: DB 조회 vs 메모리 버퍼 + 공개 여부 확인 (user-024)
+
+합성 일기 --rows건(절반 공개)을 넣고 피드 앞쪽 --pages 페이지를 넘기는 시간을 비교
+- DB: diary_crud.get_public_diaries (공개 일기 인덱스 + 와인 JOIN)
+- 버퍼: public_feed_service.visible_page (정렬 스냅샷에서 bisect, 페이지 일기의 기본 키로 공개 여부만 조회)
+- 버퍼(확인 없음): public_feed_service.page (다른 워커의 비공개 전환/삭제를 재적재 전까지 반영하지 못하던 이전 방식)
+
+실행 (backend 디렉터리에서):
+    python benchmarks/bench_public_feed.py [--rows 200000] [--pages 5] [--limit 20]
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from bench_common import Timer, latency_summary, report, reset_database
+from sqlalchemy import insert
+from crud import diary as diary_crud
+from db.database import SessionLocal, engine
+from models import Diary, Wine
+from models.user import User
+from service.public_feed import public_feed_service
+
+USERS = 1000
+REPEAT = 200
+
+
+async def seed(rows: int) -> None:
+    rng = random.Random(2)
+    await reset_database()
+    async with SessionLocal() as db:
+        await db.execute(insert(User), [
+            {"id": user_id, "kakao_id": str(user_id), "nickname": f"u{user_id}"} for user_id in range(1, USERS + 1)
+        ])
+        await db.execute(insert(Wine), [
+            {"id": wine_id, "name": f"Wine {wine_id}", "origin": "France", "grape": "Merlot", "year": "2020",
+             "alcohol": "13%", "type": "red", "aroma_note": "", "taste_note": "", "finish_note": "",
+             "sweetness": 1, "acidity": 3, "tannin": 3, "body": 4}
+            for wine_id in range(1, 1001)
+        ])
+        await db.commit()
+
+    seqs = [0] * (USERS + 1)
+    started_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    batch = []
+    for index in range(rows):
+        user_id = rng.randint(1, USERS)
+        seqs[user_id] += 1
+        batch.append({
+            "id": seqs[user_id], "user_id": user_id, "wine_id": rng.randint(1, 1000), "rating": rng.randint(1, 5),
+            "isPublic": rng.random() < 0.5, "createdAt": started_at + timedelta(seconds=index), "updatedAt": started_at,
+        })
+        if len(batch) == 50000 or index == rows - 1:
+            async with SessionLocal() as db:
+                await db.execute(insert(Diary), batch)
+                await db.commit()
+            batch = []
+
+
+async def walk(fetch, pages: int, limit: int) -> float:
+    """피드 앞쪽 pages 페이지를 넘기는 데 걸린 시간 (초)"""
+    async with SessionLocal() as db:
+        started = time.perf_counter()
+        cursor = None
+        for _ in range(pages):
+            items, cursor = await fetch(db, cursor, limit)
+        return time.perf_counter() - started
+
+
+async def main(args) -> None:
+    with Timer() as timer:
+        await seed(args.rows)
+    report("seed", rows=args.rows, seconds=f"{timer.seconds:.1f}")
+    await public_feed_service.start()
+
+    async def from_buffer(db, cursor, limit):
+        return public_feed_service.page(cursor, limit)
+
+    for label, fetch in (
+        ("database", diary_crud.get_public_diaries),
+        ("buffer + visibility check", public_feed_service.visible_page),
+        ("buffer only (before)", from_buffer),
+    ):
+        latencies = [await walk(fetch, args.pages, args.limit) for _ in range(REPEAT)]
+        report(f"{label}, {args.pages} pages", **latency_summary(latencies))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
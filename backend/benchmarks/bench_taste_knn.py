@@ -0,0 +1,70 @@
+"""
+맛 벡터 kNN 질의 지연, 카탈로그 --wines개 (기본 100만) (user-022)
+
+무작위 맛 점수로 TasteVectorIndex를 채우고 (1-5 척도만 / LLM 분석 결과의 0-100 척도를 --llm-share 비율로 섞은 경우)
+고유 벡터 수가 질의 비용을 정하므로 두 분포를 각각 측정
+- 단건 질의(GET /wines/{id}/similar 1회에 해당)와 종류 필터 질의 지연
+- 여러 와인을 한 번의 행렬 연산으로 묶은 배치 질의의 질의당 지연
+- 구성 시간과 고유 벡터 수 (같은 벡터는 한 행으로 묶임)
+
+실행 (backend 디렉터리에서):
+    python benchmarks/bench_taste_knn.py [--wines 1000000] [--queries 2000] [--batch 64] [--llm-share 0.3]
+"""
+import argparse
+import random
+import time
+from bench_common import Timer, percentile, report
+from utils.taste_vectors import TasteVectorIndex, taste_vector
+
+WINE_TYPES = ["red", "white", "sparkling", "rose"]
+
+
+def random_scores(rng: random.Random, llm_share: float):
+    if rng.random() < llm_share:
+        return [rng.randint(0, 100) for _ in range(4)]
+    return [rng.randint(1, 5) for _ in range(4)]
+
+
+def microseconds(seconds) -> dict:
+    return {name: f"{percentile(seconds, p) * 1e6:.0f}µs" for name, p in (("p50", 50), ("p95", 95), ("p99", 99))}
+
+
+def run(args, llm_share: float) -> None:
+    rng = random.Random(7)
+    index = TasteVectorIndex()
+    with Timer() as timer:
+        for wine_id in range(1, args.wines + 1):
+            index.add(wine_id, rng.choice(WINE_TYPES), taste_vector(random_scores(rng, llm_share)))
+    print(f"-- 0-100 scale share {llm_share:.0%}")
+    report("build", wines=len(index), seconds=f"{timer.seconds:.1f}", unique_vectors=index._all.count)
+
+    wine_ids = [rng.randint(1, args.wines) for _ in range(args.queries)]
+    for label, wine_type in (("single query", None), ("single query, type=red", "red")):
+        latencies = []
+        for wine_id in wine_ids:
+            started = time.perf_counter()
+            index.knn([index.vector(wine_id)], k=10, wine_type=wine_type, exclude=[wine_id])
+            latencies.append(time.perf_counter() - started)
+        report(label, **microseconds(latencies))
+
+    latencies = []
+    for start in range(0, len(wine_ids), args.batch):
+        batch = wine_ids[start:start + args.batch]
+        started = time.perf_counter()
+        index.knn([index.vector(wine_id) for wine_id in batch], k=10, exclude=batch)
+        latencies.append((time.perf_counter() - started) / len(batch))
+    report(f"batch of {args.batch}, per query", **microseconds(latencies))
+
+
+def main(args) -> None:
+    for llm_share in (0.0, args.llm_share):
+        run(args, llm_share)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wines", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--llm-share", type=float, default=0.3, help="0-100 척도 점수를 가진 와인 비율")
+    main(parser.parse_args())
@@ -0,0 +1,109 @@
+"""
+업로드 처리 메모리: 파일 전체 반복 읽기 vs 청크 단위 크기 검사 + 한 번 읽기 (user-017)
+
+동시에 --concurrency개 요청이 --size-mb 크기 이미지 2장을 올리는 상황에서 tracemalloc 최대 사용량 비교
+(업로드 원본은 Starlette처럼 SpooledTemporaryFile에 있고, 요청마다 --hold-ms 동안 버퍼를 쥔 채 모델 응답을 기다림)
+- wine-analysis: 이전은 크기 검사용 read() 후 분석에서 다시 read(), 현재는 read_upload 한 번
+- oversized: 최대 크기의 3배인 파일 - 이전은 끝까지 읽은 뒤 거절, 현재는 최대 크기를 넘는 순간 중단
+- async save spool: 이전은 read() 후 통째로 쓰기, 현재는 save_upload 청크 복사
+
+실행 (backend 디렉터리에서):
+    python benchmarks/bench_upload_memory.py [--concurrency 10] [--size-mb 10] [--hold-ms 50]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import tracemalloc
+from bench_common import TMP_DIR, report
+from fastapi import UploadFile
+from core.config import settings
+from utils.upload import read_upload, save_upload, UploadTooLargeError
+
+
+def make_upload(data: bytes, name: str) -> UploadFile:
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(data)
+    spooled.seek(0)
+    return UploadFile(file=spooled, filename=name)
+
+
+async def old_wine_analysis(files, hold: float) -> None:
+    # 크기 검사: 전체를 읽고 되감기 (마지막 contents는 요청이 끝날 때까지 참조됨)
+    for file in files:
+        contents = await file.read()
+        if len(contents) > settings.max_file_size:
+            raise UploadTooLargeError(file.filename)
+        await file.seek(0)
+    # 분석: 다시 전체 읽기
+    images = [await file.read() for file in files]
+    await asyncio.sleep(hold)
+    del contents, images
+
+
+async def new_wine_analysis(files, hold: float) -> None:
+    images = [await read_upload(file) for file in files]
+    await asyncio.sleep(hold)
+    del images
+
+
+async def old_spool(files, hold: float) -> None:
+    for file in files:
+        contents = await file.read()
+        if len(contents) > settings.max_file_size:
+            raise UploadTooLargeError(file.filename)
+        path = os.path.join(TMP_DIR, "spool", f"{id(file)}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as target:
+            target.write(contents)
+    await asyncio.sleep(hold)
+
+
+async def new_spool(files, hold: float) -> None:
+    for file in files:
+        await save_upload(file, os.path.join(TMP_DIR, "spool", f"{id(file)}"))
+    await asyncio.sleep(hold)
+
+
+async def peak_mb(handler, size: int, concurrency: int, hold: float) -> float:
+    data = os.urandom(size)
+    requests = [[make_upload(data, "front.jpg"), make_upload(data, "back.jpg")] for _ in range(concurrency)]
+    del data
+
+    async def one(files):
+        try:
+            await handler(files, hold)
+        except UploadTooLargeError:
+            pass
+
+    tracemalloc.start()
+    await asyncio.gather(*[one(files) for files in requests])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for files in requests:
+        for file in files:
+            file.file.close()
+    return peak / 1e6
+
+
+async def main(args) -> None:
+    size = int(args.size_mb * 1024 * 1024)
+    hold = args.hold_ms / 1000
+    settings.max_file_size = size
+    scenarios = (
+        ("wine-analysis", size, old_wine_analysis, new_wine_analysis),
+        ("oversized (3x max)", size * 3, old_wine_analysis, new_wine_analysis),
+        ("async save spool", size, old_spool, new_spool),
+    )
+    for label, file_size, old, new in scenarios:
+        before = await peak_mb(old, file_size, args.concurrency, hold)
+        after = await peak_mb(new, file_size, args.concurrency, hold)
+        report(label, before=f"{before:7.1f}MB", after=f"{after:7.1f}MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--size-mb", type=float, default=10)
+    parser.add_argument("--hold-ms", type=float, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,97 @@
+"""
+와인 검색(GET /wines/search) p95 지연, 카탈로그 --wines개 (기본 50만) (user-020)
+
+한국어/라틴 문자가 섞인 합성 와인 카탈로그를 넣고 wine_search_service.search로 질의
+- DATABASE_URL이 PostgreSQL(pg_trgm)이면 GIN 인덱스 검색, 그 외에는 메모리 trigram 인덱스
+- 질의: 이름 일부, 품종, 원산지, 한국어, 오타 섞인 질의, 2글자 짧은 질의
+
+실행 (backend 디렉터리에서):
+    python benchmarks/bench_wine_search.py [--wines 500000] [--queries 500]
+"""
+import argparse
+import asyncio
+import random
+import resource
+import time
+from bench_common import Timer, latency_summary, report, reset_database
+from sqlalchemy import insert
+from db.database import SessionLocal, engine
+from models import Wine
+from service.wine_search import wine_search_service
+
+PRODUCERS = ["Château", "Domaine", "Bodega", "Tenuta", "Weingut", "Clos", "Maison", "샤토", "도멘", "테누타"]
+NAMES = ["Margaux", "Latour", "Pavillon", "Rouge", "Blanc", "Réserve", "Sassicaia", "Ornellaia", "Opus", "Cloudy Bay",
+         "Montrachet", "Chablis", "Barolo", "Rioja", "마고", "라투르", "루즈", "블랑", "리저브", "바롤로", "Grand Cru", "Vieilles Vignes"]
+GRAPES = ["Cabernet Sauvignon", "Merlot", "Pinot Noir", "Chardonnay", "Sauvignon Blanc", "Syrah", "Riesling", "Nebbiolo",
+          "Tempranillo", "Sangiovese", "까베르네 소비뇽", "메를로", "피노 누아", "샤르도네", "시라", "리슬링"]
+ORIGINS = ["France, Bordeaux", "France, Bourgogne", "Italy, Piemonte", "Italy, Toscana", "Spain, Rioja", "USA, Napa Valley",
+           "New Zealand, Marlborough", "Germany, Mosel", "프랑스 보르도", "이탈리아 토스카나", "칠레", "호주 바로사 밸리"]
+QUERIES = ["margaux", "chateau lat", "pinot", "cabernet sauv", "bordeaux", "napa", "마고", "샤토", "까베르네", "보르도",
+           "sasicaia", "montrachet", "grand cru", "메를", "ri", "op", "리저브 2015", "vieilles", "mosel riesling", "토스카나"]
+
+
+def catalog(count: int):
+    rng = random.Random(11)
+    for wine_id in range(1, count + 1):
+        words = rng.sample(NAMES, rng.randint(1, 3))
+        yield {
+            "id": wine_id, "name": f"{rng.choice(PRODUCERS)} {' '.join(words)} {wine_id}",
+            "origin": rng.choice(ORIGINS), "grape": ", ".join(rng.sample(GRAPES, rng.randint(1, 2))),
+            "year": str(rng.randint(1990, 2023)), "alcohol": "13.5%", "type": rng.choice(["red", "white", "sparkling"]),
+            "aroma_note": "", "taste_note": "", "finish_note": "",
+            "sweetness": rng.randint(1, 5), "acidity": rng.randint(1, 5), "tannin": rng.randint(1, 5), "body": rng.randint(1, 5),
+        }
+
+
+async def seed(count: int) -> None:
+    await reset_database()
+    batch = []
+    for row in catalog(count):
+        batch.append(row)
+        if len(batch) == 20000:
+            async with SessionLocal() as db:
+                await db.execute(insert(Wine), batch)
+                await db.commit()
+            batch = []
+    if batch:
+        async with SessionLocal() as db:
+            await db.execute(insert(Wine), batch)
+            await db.commit()
+
+
+async def main(args) -> None:
+    with Timer() as timer:
+        await seed(args.wines)
+    report("seed", wines=args.wines, seconds=f"{timer.seconds:.1f}")
+
+    wine_search_service.__init__(refresh_interval=3600)
+    # tracemalloc은 인덱스 구성을 크게 느리게 하므로 최대 RSS 증가량으로 측정 (Linux: KB 단위)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with Timer() as timer:
+        await wine_search_service.start()
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    report("index build", backend=wine_search_service.stats()["search_backend"],
+           seconds=f"{timer.seconds:.1f}", max_rss_growth=f"{rss_growth / 1024:.0f}MB")
+
+    rng = random.Random(5)
+    latencies = {query: [] for query in QUERIES}
+    for _ in range(args.queries):
+        query = rng.choice(QUERIES)
+        async with SessionLocal() as db:
+            started = time.perf_counter()
+            await wine_search_service.search(db, query, limit=20)
+            latencies[query].append(time.perf_counter() - started)
+
+    every = [value for values in latencies.values() for value in values]
+    report(f"search ({len(every)} queries)", **latency_summary(every))
+    slowest = sorted(latencies.items(), key=lambda item: -max(item[1], default=0))[:3]
+    for query, values in slowest:
+        report(f"  slowest '{query}'", **latency_summary(values))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wines", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
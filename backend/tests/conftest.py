@@ -0,0 +1,155 @@
+"""
+테스트 공통 설정
+
+앱 모듈은 import 시점에 환경 변수로 설정을 읽으므로 import 전에 테스트용 값을 지정
+- DB: 임시 디렉터리의 SQLite 파일 (aiosqlite)
+- Object Storage: moto (NCP 엔드포인트를 moto 커스텀 엔드포인트로 등록)
+
+실행 (backend 디렉터리에서):
+    pip install -r requirements.txt -r requirements-dev.txt
+    python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+
+_TMP_DIR = tempfile.mkdtemp(prefix="winelog-test-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_TMP_DIR, 'test.db')}",
+    "USER_CACHE_ENABLED": "false",
+    "SECRET_KEY": "test-secret-key",
+    "UPLOAD_DIR": os.path.join(_TMP_DIR, "uploads"),
+    "CACHE_DIR": os.path.join(_TMP_DIR, "cache"),
+    "TRANSCODE_WORKERS": "2",
+    "NCP_ACCESS_KEY": "test",
+    "NCP_SECRET_KEY": "test",
+    "NCP_REGION": "kr",
+    "NCP_BUCKET_NAME": "winelog-images",
+    "MOTO_S3_CUSTOM_ENDPOINTS": "https://winelog-images.kr.ncloudstorage.com",
+    "KAKAO_CLIENT_ID": "test-client",
+    "KAKAO_REDIRECT_URI": "http://testserver/api/v1/auth/kakao/callback",
+})
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import io
+import json
+import pytest
+import httpx
+from moto import mock_s3
+from PIL import Image
+from db.database import Base, engine, SessionLocal
+from db.schema import sync_schema
+from main import app
+from models.user import User
+from service.diary_job_service import diary_job_service
+from service.public_feed import public_feed_service
+from service.wine_search import wine_search_service
+from service.wine_similarity import wine_similarity_service
+from utils.auth import create_access_token
+from utils.image_transcoder import image_transcoder
+from utils.storage import ncp_storage
+
+WINE_DATA = {
+    "name": "Château Margaux",
+    "origin": "France",
+    "grape": "Cabernet Sauvignon, Merlot",
+    "year": "2015",
+    "alcohol": "13.5%",
+    "type": "red",
+    "aromaNote": "blackcurrant",
+    "tasteNote": "silky",
+    "finishNote": "long",
+    "sweetness": 1,
+    "acidity": 4,
+    "tannin": 4,
+    "body": 5,
+}
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # 세션 전체에서 이벤트 루프 하나를 공유 (엔진 커넥션 풀/모듈 전역 세마포어가 루프에 묶임)
+    return "asyncio"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def transcoder():
+    yield
+    image_transcoder.shutdown()
+
+
+@pytest.fixture(autouse=True)
+async def database(anyio_backend):
+    """테스트마다 빈 스키마로 시작하고 메모리 인덱스/피드 버퍼/작업 큐 초기화"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(sync_schema)
+    public_feed_service.__init__(public_feed_service.size, public_feed_service.refresh_interval)
+    wine_search_service.__init__(wine_search_service.refresh_interval)
+    wine_similarity_service.__init__(wine_similarity_service.refresh_interval)
+    diary_job_service.__init__(diary_job_service.workers, diary_job_service.stale_after)
+    yield
+    await engine.dispose()
+
+
+@pytest.fixture
+def storage():
+    """moto로 가짜 Object Storage 버킷 생성"""
+    with mock_s3():
+        ncp_storage.s3_client.create_bucket(
+            Bucket=ncp_storage.bucket_name,
+            CreateBucketConfiguration={"LocationConstraint": ncp_storage.region_code}
+        )
+        yield ncp_storage.s3_client
+
+
+def stored_keys(client) -> set:
+    response = client.list_objects_v2(Bucket=ncp_storage.bucket_name)
+    return {item["Key"] for item in response.get("Contents", [])}
+
+
+def jpeg_bytes(size=(64, 48), color=(120, 20, 40)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+async def create_user(kakao_id: str = "1001", nickname: str = "tester") -> User:
+    async with SessionLocal() as db:
+        user = User(kakao_id=kakao_id, nickname=nickname)
+        db.add(user)
+        await db.commit()
+        return user
+
+
+def auth_headers(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.kakao_id})}"}
+
+
+@pytest.fixture
+async def user():
+    return await create_user()
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+        yield client
+
+
+async def save_diary(client, user, wine=None, rating=4, price="30000", is_public=True, files=None, mode="sync"):
+    """/diary/save 호출 (multipart form)"""
+    response = await client.post(
+        f"/api/v1/diary/save?mode={mode}",
+        headers=auth_headers(user),
+        data={
+            "wineData": json.dumps(wine or WINE_DATA),
+            "drinkDate": "2026-10-01",
+            "rating": str(rating),
+            "review": "good",
+            "price": price,
+            "isPublic": "true" if is_public else "false",
+        },
+        files=files or None,
+    )
+    return response
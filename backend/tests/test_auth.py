@@ -0,0 +1,75 @@
+from urllib.parse import parse_qs, urlparse
+import httpx
+import pytest
+from sqlalchemy import select
+from db.database import SessionLocal
+from models.user import User
+from service.kakao_auth import kakao_auth_service
+from utils.auth import verify_token
+
+pytestmark = pytest.mark.anyio
+
+
+class KakaoStandIn:
+    """kauth/kapi 대신 응답하는 가짜 카카오 서버 (httpx MockTransport)"""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path == "/oauth/token":
+            form = parse_qs(request.content.decode())
+            if form.get("code") != ["good-code"]:
+                return httpx.Response(400, json={"error": "invalid_grant"})
+            return httpx.Response(200, json={"access_token": "kakao-token"})
+        if request.url.path == "/v2/user/me":
+            if request.headers.get("Authorization") != "Bearer kakao-token":
+                return httpx.Response(401)
+            return httpx.Response(200, json={
+                "id": 777,
+                "kakao_account": {"email": "wine@example.com", "profile": {"nickname": "sommelier"}},
+            })
+        return httpx.Response(404)
+
+
+@pytest.fixture
+async def kakao():
+    stand_in = KakaoStandIn()
+    await kakao_auth_service.close()
+    kakao_auth_service._client = httpx.AsyncClient(transport=httpx.MockTransport(stand_in))
+    yield stand_in
+    await kakao_auth_service.close()
+
+
+async def test_callback_creates_the_user_and_sets_cookies(client, kakao):
+    response = await client.get("/api/v1/auth/kakao/callback", params={"code": "good-code"})
+
+    assert response.status_code == 302
+    assert [request.url.path for request in kakao.requests] == ["/oauth/token", "/v2/user/me"]
+    assert verify_token(response.cookies["access_token"])["sub"] == "777"
+    async with SessionLocal() as db:
+        user = (await db.execute(select(User).where(User.kakao_id == "777"))).scalar_one()
+    assert (user.nickname, user.email) == ("sommelier", "wine@example.com")
+    assert user.refresh_token == response.cookies["refresh_token"]
+
+    me = await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {response.cookies['access_token']}"})
+    assert me.json()["nickname"] == "sommelier"
+
+
+async def test_second_login_reuses_the_user_and_the_pooled_client(client, kakao):
+    pooled = kakao_auth_service.client
+    await client.get("/api/v1/auth/kakao/callback", params={"code": "good-code"})
+    response = await client.get("/api/v1/auth/kakao/callback", params={"code": "good-code", "state": "ios"})
+
+    assert kakao_auth_service.client is pooled
+    location = urlparse(response.headers["location"])
+    assert parse_qs(location.query)["nickname"] == ["sommelier"]
+    async with SessionLocal() as db:
+        assert len((await db.execute(select(User))).scalars().all()) == 1
+
+
+async def test_rejected_code_returns_400(client, kakao):
+    response = await client.get("/api/v1/auth/kakao/callback", params={"code": "bad-code"})
+    assert response.status_code == 400
+    assert [request.url.path for request in kakao.requests] == ["/oauth/token"]
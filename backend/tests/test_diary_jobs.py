@@ -0,0 +1,133 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select, update
+from conftest import auth_headers, create_user, jpeg_bytes, save_diary, stored_keys
+from db.database import SessionLocal
+from models import StorageDeletion
+from models.diary_job import DiarySaveJob, JobStatus
+from service.diary_job_service import diary_job_service, _job_dir
+
+pytestmark = pytest.mark.anyio
+
+
+async def job_status(client, user, job_id):
+    response = await client.get(f"/api/v1/diary/jobs/{job_id}", headers=auth_headers(user))
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_async_save_commits_first_and_uploads_in_the_worker(client, user, storage):
+    response = await save_diary(client, user, mode="async", files={"frontImage": ("front.jpg", jpeg_bytes(), "image/jpeg")})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    detail = (await client.get("/api/v1/diary/1", headers=auth_headers(user))).json()
+    assert detail["imageStatus"] == "pending"
+    assert (await job_status(client, user, job_id))["status"] == "pending"
+    assert os.path.isdir(_job_dir(job_id))
+
+    await diary_job_service._process(job_id)
+
+    status = await job_status(client, user, job_id)
+    assert (status["status"], status["progress"]) == ("completed", 100)
+    assert set(status["uploaded_images"]["imageManifest"]["frontImage"]) == {"thumbnail", "feed", "full"}
+    assert (await client.get("/api/v1/diary/1", headers=auth_headers(user))).json()["imageStatus"] == "ready"
+    assert len(stored_keys(storage)) == 3
+    assert not os.path.exists(_job_dir(job_id))
+
+
+async def test_failed_job_marks_the_diary_and_enqueues_uploaded_objects(client, user, storage, monkeypatch):
+    response = await save_diary(client, user, mode="async", files={"frontImage": ("front.jpg", jpeg_bytes(), "image/jpeg")})
+    job_id = response.json()["job_id"]
+
+    from crud import diary as diary_crud
+    original_update = diary_crud.update_diary
+
+    async def fail_ready_update(db, user_id, diary_id, update_data):
+        if update_data.get("imageStatus") == "ready":
+            raise RuntimeError("db down")
+        return await original_update(db, user_id, diary_id, update_data)
+
+    monkeypatch.setattr(diary_crud, "update_diary", fail_ready_update)
+    with pytest.raises(RuntimeError):
+        await diary_job_service._process(job_id)
+
+    status = await job_status(client, user, job_id)
+    assert status["status"] == "failed"
+    assert (await client.get("/api/v1/diary/1", headers=auth_headers(user))).json()["imageStatus"] == "failed"
+    async with SessionLocal() as db:
+        queued = set((await db.execute(select(StorageDeletion.object_key))).scalars().all())
+    assert queued == stored_keys(storage)
+    assert len(queued) == 3
+
+
+async def test_feed_failure_after_completion_keeps_the_job_completed(client, user, storage, monkeypatch):
+    from service.public_feed import public_feed_service
+    response = await save_diary(client, user, mode="async", files={"frontImage": ("front.jpg", jpeg_bytes(), "image/jpeg")})
+    job_id = response.json()["job_id"]
+
+    async def broken_feed(*args, **kwargs):
+        raise RuntimeError("feed unavailable")
+
+    monkeypatch.setattr(public_feed_service, "on_diary_saved", broken_feed)
+    # 오류는 워커 로그로 전파되지만 이미 커밋된 완료 상태는 그대로
+    with pytest.raises(RuntimeError):
+        await diary_job_service._process(job_id)
+
+    assert (await job_status(client, user, job_id))["status"] == "completed"
+    async with SessionLocal() as db:
+        assert (await db.execute(select(StorageDeletion))).first() is None
+
+
+async def test_jobs_are_private_to_their_owner(client, user):
+    job_id = (await save_diary(client, user, mode="async")).json()["job_id"]
+    other = await create_user(kakao_id="5005")
+    assert (await client.get(f"/api/v1/diary/jobs/{job_id}", headers=auth_headers(other))).status_code == 404
+    assert (await job_status(client, user, job_id))["status"] == "completed"
+
+
+async def test_a_job_is_claimed_by_one_worker_only(client, user, storage, monkeypatch):
+    from service.diary_service import DiaryService
+    response = await save_diary(client, user, mode="async", files={"frontImage": ("front.jpg", jpeg_bytes(), "image/jpeg")})
+    job_id = response.json()["job_id"]
+
+    calls = []
+    original_upload = DiaryService.upload_diary_image_data
+
+    async def counting_upload(*args, **kwargs):
+        calls.append(args)
+        return await original_upload(*args, **kwargs)
+
+    monkeypatch.setattr(DiaryService, "upload_diary_image_data", counting_upload)
+    # 같은 작업을 두 워커(예: 배포 중인 이전/새 컨테이너)가 동시에 꺼낸 경우
+    await asyncio.gather(diary_job_service._process(job_id), diary_job_service._process(job_id))
+
+    assert len(calls) == 1
+    assert (await job_status(client, user, job_id))["status"] == "completed"
+    assert len(stored_keys(storage)) == 3
+
+
+async def test_only_jobs_with_a_stale_heartbeat_are_recovered(client, user, storage):
+    response = await save_diary(client, user, mode="async", files={"frontImage": ("front.jpg", jpeg_bytes(), "image/jpeg")})
+    job_id = response.json()["job_id"]
+    async with SessionLocal() as db:
+        await db.execute(update(DiarySaveJob).where(DiarySaveJob.id == job_id).values(status=JobStatus.processing))
+        await db.commit()
+
+    # 다른 워커가 처리 중(하트비트 유지)인 작업은 복구하지도, 다시 처리하지도 않음
+    assert await diary_job_service.recover() == 0
+    await diary_job_service._process(job_id)
+    assert (await job_status(client, user, job_id))["status"] == "processing"
+    assert stored_keys(storage) == set()
+
+    stale = datetime.now(timezone.utc) - timedelta(seconds=diary_job_service.stale_after + 60)
+    async with SessionLocal() as db:
+        await db.execute(update(DiarySaveJob).where(DiarySaveJob.id == job_id).values(updated_at=stale))
+        await db.commit()
+    assert await diary_job_service.recover() == 1
+    assert diary_job_service._queue.get_nowait() == job_id
+
+    await diary_job_service._process(job_id)
+    assert (await job_status(client, user, job_id))["status"] == "completed"
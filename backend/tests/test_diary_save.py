@@ -0,0 +1,131 @@
+import asyncio
+import pytest
+from sqlalchemy import select, func
+from conftest import WINE_DATA, auth_headers, create_user, jpeg_bytes, save_diary, stored_keys
+from db.database import SessionLocal
+from models import Diary, Wine, StorageDeletion, UserDiaryStats
+from models.user import User
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_parallel_saves_for_one_user_and_wine(client, user):
+    responses = await asyncio.gather(*[save_diary(client, user, rating=index % 5 + 1) for index in range(10)])
+
+    assert [response.status_code for response in responses] == [200] * 10
+    diary_ids = sorted(response.json()["diary_id"] for response in responses)
+    assert diary_ids == list(range(1, 11))
+    assert {response.json()["wine_id"] for response in responses} == {responses[0].json()["wine_id"]}
+
+    async with SessionLocal() as db:
+        assert await db.scalar(select(func.count()).select_from(Wine)) == 1
+        assert await db.scalar(select(func.count()).select_from(Diary)) == 10
+        assert (await db.get(User, user.id)).diary_seq == 10
+        stats = await db.get(UserDiaryStats, user.id)
+        assert stats.diary_count == 10
+        assert stats.rating_sum == sum(index % 5 + 1 for index in range(10))
+        assert stats.type_counts == {"red": 10}
+        assert stats.grape_counts == {"Cabernet Sauvignon": 10, "Merlot": 10}
+
+
+async def test_parallel_saves_for_different_users_keep_separate_counters(client):
+    users = [await create_user(kakao_id=str(2000 + index)) for index in range(3)]
+    responses = await asyncio.gather(*[save_diary(client, user) for user in users for _ in range(3)])
+
+    assert all(response.status_code == 200 for response in responses)
+    async with SessionLocal() as db:
+        rows = (await db.execute(select(Diary.user_id, Diary.id).order_by(Diary.user_id, Diary.id))).all()
+    assert rows == [(user.id, diary_id) for user in users for diary_id in (1, 2, 3)]
+
+
+async def test_invalid_wine_json_is_rejected(client, user):
+    response = await client.post(
+        "/api/v1/diary/save",
+        headers=auth_headers(user),
+        data={"wineData": "{", "drinkDate": "2026-10-01", "rating": "4"},
+    )
+    assert response.status_code == 400
+
+
+async def test_unauthenticated_save_is_rejected(client):
+    response = await client.post("/api/v1/diary/save", data={"wineData": "{}", "drinkDate": "x", "rating": "1"})
+    assert response.status_code == 401
+
+
+async def test_save_for_a_missing_user_raises_not_found():
+    from crud.diary import UserNotFoundError
+    from service.diary_service import DiaryService
+
+    async with SessionLocal() as db:
+        with pytest.raises(UserNotFoundError, match="999"):
+            await DiaryService.create_wine_diary(db, 999, WINE_DATA, {"rating": 4}, {})
+        assert await db.scalar(select(func.count()).select_from(Diary)) == 0
+
+
+async def test_save_uploads_images_and_derivatives(client, user, storage):
+    response = await save_diary(client, user, files={"frontImage": ("front.jpg", jpeg_bytes(), "image/jpeg")})
+
+    assert response.status_code == 200
+    images = response.json()["diary_data"]["uploaded_images"]
+    assert set(images["imageManifest"]["frontImage"]) == {"thumbnail", "feed", "full"}
+    assert images["frontImage"] == images["imageManifest"]["frontImage"]["full"]
+    assert images["thumbnailImage"] == images["imageManifest"]["frontImage"]["thumbnail"]
+    assert len(stored_keys(storage)) == 3
+
+
+async def test_failed_save_enqueues_every_uploaded_object(client, user, storage, monkeypatch):
+    # 파생 이미지 업로드는 끝났지만 DB 저장이 실패하는 경우
+    from crud import diary as diary_crud
+
+    async def broken_create_diary(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(diary_crud, "create_diary", broken_create_diary)
+    response = await save_diary(client, user, files={
+        "frontImage": ("front.jpg", jpeg_bytes(), "image/jpeg"),
+        "thumbnailImage": ("thumb.jpg", jpeg_bytes((32, 32)), "image/jpeg"),
+    })
+
+    assert response.status_code == 500
+    async with SessionLocal() as db:
+        queued = set((await db.execute(select(StorageDeletion.object_key))).scalars().all())
+    assert queued == stored_keys(storage)
+    assert len(queued) == 4
+
+
+async def test_partial_upload_failure_enqueues_finished_uploads(client, user, storage, monkeypatch):
+    # 한 이미지 업로드가 실패해도 이미 올라간 다른 이미지는 정리 대상으로 기록
+    from utils.storage import ncp_storage
+
+    async def broken_upload(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("storage unavailable")
+
+    monkeypatch.setattr(ncp_storage, "upload_image_bytes", broken_upload)
+    response = await save_diary(client, user, files={
+        "frontImage": ("front.jpg", jpeg_bytes(), "image/jpeg"),
+        "thumbnailImage": ("thumb.jpg", jpeg_bytes((32, 32)), "image/jpeg"),
+    })
+
+    assert response.status_code == 500
+    async with SessionLocal() as db:
+        queued = set((await db.execute(select(StorageDeletion.object_key))).scalars().all())
+        assert await db.scalar(select(func.count()).select_from(Diary)) == 0
+    assert queued == stored_keys(storage)
+    assert len(queued) == 3
+
+
+async def test_failure_after_commit_keeps_the_diary(client, user, storage, monkeypatch):
+    from service.wine_search import wine_search_service
+
+    def broken_add(wine):
+        raise RuntimeError("index unavailable")
+
+    monkeypatch.setattr(wine_search_service, "add", broken_add)
+    response = await save_diary(client, user, files={"frontImage": ("front.jpg", jpeg_bytes(), "image/jpeg")})
+
+    assert response.status_code == 200
+    async with SessionLocal() as db:
+        assert await db.scalar(select(func.count()).select_from(Diary)) == 1
+        assert await db.scalar(select(func.count()).select_from(StorageDeletion)) == 0
+    assert len(stored_keys(storage)) == 3
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import select
+from conftest import auth_headers, jpeg_bytes, stored_keys
+from db.database import SessionLocal
+from models import StorageDeletion
+from utils.storage import ncp_storage
+
+pytestmark = pytest.mark.anyio
+
+
+async def presign(client, user, content_type="image/jpeg"):
+    return await client.post("/api/v1/diary/uploads/presign", json={"content_type": content_type}, headers=auth_headers(user))
+
+
+async def test_presigned_upload_is_scoped_to_the_user(client, user, storage):
+    response = await presign(client, user)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["key"].startswith(f"uploads/{user.id}/")
+    assert body["fields"]["Content-Type"] == "image/jpeg"
+    assert (await presign(client, user, "application/pdf")).status_code == 400
+
+
+async def test_save_with_a_directly_uploaded_key_builds_derivatives_and_enqueues_the_original(client, user, storage):
+    key = (await presign(client, user)).json()["key"]
+    storage.put_object(Bucket=ncp_storage.bucket_name, Key=key, Body=jpeg_bytes(), ContentType="image/jpeg")
+
+    response = await client.post(
+        "/api/v1/diary/save",
+        headers=auth_headers(user),
+        data={"wineData": '{"name": "Direct"}', "drinkDate": "2026-10-01", "rating": "4", "frontImageKey": key},
+    )
+
+    assert response.status_code == 200
+    async with SessionLocal() as db:
+        rows = (await db.execute(select(StorageDeletion.object_key, StorageDeletion.reason))).all()
+    assert rows == [(key, "staged_upload")]
+    assert len(stored_keys(storage)) == 4
+
+
+@pytest.mark.parametrize("make_key", [
+    lambda user: f"uploads/{user.id + 1}/someone-else.jpg",
+    lambda user: f"uploads/{user.id}/../{user.id + 1}/x.jpg",
+    lambda user: f"uploads/{user.id}/missing.jpg",
+])
+async def test_foreign_or_missing_keys_are_rejected(client, user, storage, make_key):
+    response = await client.post(
+        "/api/v1/diary/save",
+        headers=auth_headers(user),
+        data={"wineData": "{}", "drinkDate": "2026-10-01", "rating": "4", "frontImageKey": make_key(user)},
+    )
+    assert response.status_code == 400
+
+
+async def test_uploaded_objects_with_a_wrong_type_are_rejected(client, user, storage):
+    key = f"uploads/{user.id}/fake.jpg"
+    storage.put_object(Bucket=ncp_storage.bucket_name, Key=key, Body=b"%PDF", ContentType="application/pdf")
+    response = await client.post(
+        "/api/v1/diary/save",
+        headers=auth_headers(user),
+        data={"wineData": "{}", "drinkDate": "2026-10-01", "rating": "4", "frontImageKey": key},
+    )
+    assert response.status_code == 400
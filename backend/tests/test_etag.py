@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import update
+from conftest import auth_headers, save_diary
+from db.database import SessionLocal
+from models.wine import Wine
+from service.diary_service import diary_service
+
+pytestmark = pytest.mark.anyio
+
+
+async def conditional_get(client, path, user, etag):
+    return await client.get(path, headers={**auth_headers(user), "If-None-Match": etag})
+
+
+async def test_diary_list_returns_304_until_a_diary_changes(client, user):
+    await save_diary(client, user)
+    first = await client.get("/api/v1/diary/", headers=auth_headers(user))
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    cached = await conditional_get(client, "/api/v1/diary/", user, etag)
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    await save_diary(client, user)
+    assert (await conditional_get(client, "/api/v1/diary/", user, etag)).status_code == 200
+
+
+async def test_diary_list_etag_changes_when_the_wine_is_edited(client, user):
+    wine_id = (await save_diary(client, user)).json()["wine_id"]
+    etag = (await client.get("/api/v1/diary/", headers=auth_headers(user))).headers["ETag"]
+    detail_etag = (await client.get("/api/v1/diary/1", headers=auth_headers(user))).headers["ETag"]
+
+    async with SessionLocal() as db:
+        await db.execute(update(Wine).where(Wine.id == wine_id).values(taste_note="edited"))
+        await db.commit()
+
+    assert (await conditional_get(client, "/api/v1/diary/", user, etag)).status_code == 200
+    assert (await conditional_get(client, "/api/v1/diary/1", user, detail_etag)).status_code == 200
+
+
+async def test_diary_detail_etag_follows_updates(client, user):
+    await save_diary(client, user)
+    first = await client.get("/api/v1/diary/1", headers=auth_headers(user))
+    etag = first.headers["ETag"]
+    assert (await conditional_get(client, "/api/v1/diary/1", user, f'W/{etag}, "other"')).status_code == 304
+
+    async with SessionLocal() as db:
+        await diary_service.update_diary(db, user.id, 1, {"rating": 1})
+
+    assert (await conditional_get(client, "/api/v1/diary/1", user, etag)).status_code == 200
+    assert (await client.get("/api/v1/diary/2", headers=auth_headers(user))).status_code == 404
+
+
+async def test_public_feed_is_publicly_cacheable(client, user):
+    await save_diary(client, user)
+    first = await client.get("/api/v1/diary/public", headers=auth_headers(user))
+    assert first.headers["Cache-Control"] == "public, no-cache"
+
+    cached = await conditional_get(client, "/api/v1/diary/public", user, first.headers["ETag"])
+    assert cached.status_code == 304
+    assert cached.headers["Cache-Control"] == "public, no-cache"
+
+
+async def test_me_returns_304_for_matching_etag(client, user):
+    first = await client.get("/api/v1/auth/me", headers=auth_headers(user))
+    assert first.status_code == 200
+    assert (await conditional_get(client, "/api/v1/auth/me", user, first.headers["ETag"])).status_code == 304
+
+
+async def test_diary_list_version_bumps_on_update_and_delete(client, user):
+    await save_diary(client, user)
+    await save_diary(client, user)
+    etags = [(await client.get("/api/v1/diary/", headers=auth_headers(user))).headers["ETag"]]
+
+    async with SessionLocal() as db:
+        await diary_service.update_diary(db, user.id, 1, {"review": "again"})
+    etags.append((await client.get("/api/v1/diary/", headers=auth_headers(user))).headers["ETag"])
+    async with SessionLocal() as db:
+        await diary_service.delete_diary(db, user.id, 2)
+    etags.append((await client.get("/api/v1/diary/", headers=auth_headers(user))).headers["ETag"])
+    # 삭제 후 같은 개수/시각이 되는 경우도 카운터로 구분
+    await save_diary(client, user)
+    async with SessionLocal() as db:
+        await diary_service.delete_diary(db, user.id, 3)
+    etags.append((await client.get("/api/v1/diary/", headers=auth_headers(user))).headers["ETag"])
+    assert len(set(etags)) == 4
+
+
+async def test_invalid_cursor_is_rejected_before_the_etag_check(client, user):
+    await save_diary(client, user)
+    path = "/api/v1/diary/?cursor=not-a-cursor"
+    etag = (await client.get("/api/v1/diary/", headers=auth_headers(user))).headers["ETag"]
+    assert (await conditional_get(client, path, user, etag)).status_code == 400
+    assert (await conditional_get(client, path, user, "*")).status_code == 400
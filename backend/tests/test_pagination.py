@@ -0,0 +1,79 @@
+import base64
+import json
+from datetime import datetime, timezone
+import pytest
+from conftest import WINE_DATA, auth_headers, create_user, save_diary
+from utils.pagination import encode_cursor, decode_cursor, InvalidCursorError
+
+pytestmark = pytest.mark.anyio
+
+
+def raw_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 1, 12, 30, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(created_at, 7, 3), 3) == [created_at, 7, 3]
+
+
+@pytest.mark.parametrize("token", [
+    "not-base64!",
+    raw_cursor(["2026-10-01T00:00:00", 1]),
+    raw_cursor(["yesterday", 1, 2]),
+    raw_cursor(["2026-10-01T00:00:00", "1", 2]),
+    raw_cursor(["2026-10-01T00:00:00", 1.5, 2]),
+    raw_cursor(["2026-10-01T00:00:00", True, 2]),
+    raw_cursor({"id": 1}),
+])
+def test_invalid_cursors_are_rejected(token):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, 3)
+
+
+async def collect_pages(client, path, headers=None, limit=3):
+    items, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = await client.get(path, params=params, headers=headers)
+        assert response.status_code == 200
+        body = response.json()
+        items.extend(body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+async def test_my_diaries_are_paged_newest_first_without_gaps(client, user):
+    for index in range(7):
+        assert (await save_diary(client, user, rating=index % 5 + 1)).status_code == 200
+    other = await create_user(kakao_id="9999")
+    await save_diary(client, other)
+
+    items, pages = await collect_pages(client, "/api/v1/diary/", auth_headers(user))
+
+    assert [item["id"] for item in items] == [7, 6, 5, 4, 3, 2, 1]
+    assert pages == 3
+    assert all(item["user_id"] == user.id for item in items)
+    assert items[0]["wine"]["name"] == WINE_DATA["name"]
+
+
+@pytest.mark.parametrize("path", ["/api/v1/diary/", "/api/v1/diary/public"])
+async def test_invalid_cursor_returns_400(client, user, path):
+    response = await client.get(path, params={"cursor": raw_cursor(["2026-10-01", "x", 1])}, headers=auth_headers(user))
+    assert response.status_code == 400
+
+
+async def test_public_feed_pages_across_users_and_skips_private(client, user):
+    other = await create_user(kakao_id="2002")
+    for index in range(4):
+        await save_diary(client, user, is_public=index != 1)
+        await save_diary(client, other)
+
+    items, _ = await collect_pages(client, "/api/v1/diary/public", auth_headers(user), limit=2)
+
+    assert len(items) == 7
+    assert all(item["isPublic"] for item in items)
+    keys = [(item["createdAt"], item["user_id"], item["id"]) for item in items]
+    assert len(set(keys)) == 7
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import delete, update
+from conftest import auth_headers, create_user, save_diary
+from db.database import SessionLocal
+from models import Diary
+from schemas.diary import DiaryResponse
+from service.diary_service import diary_service
+from service.public_feed import PublicFeedService, public_feed_service, _aware
+
+pytestmark = pytest.mark.anyio
+
+
+def entry(index: int) -> DiaryResponse:
+    return DiaryResponse(id=index, user_id=1, wine_id=1, isPublic=True,
+                         createdAt=datetime(2026, 10, 1) + timedelta(minutes=index))
+
+
+def loaded_feed(count: int, size: int, complete: bool) -> PublicFeedService:
+    feed = PublicFeedService(size=size, refresh_interval=3600)
+    feed._entries.extend(entry(index) for index in range(count, 0, -1))
+    feed._complete = complete
+    feed._loaded_at = float("inf")
+    return feed
+
+
+def test_naive_times_are_local_time():
+    naive = datetime(2026, 10, 1, 9, 0)
+    assert _aware(naive) == naive.astimezone()
+    assert _aware(naive).utcoffset() == naive.astimezone().utcoffset()
+
+
+def test_page_falls_back_when_the_buffer_cannot_fill_a_page():
+    feed = loaded_feed(count=5, size=5, complete=False)
+
+    items, cursor = feed.page(None, 3)
+    assert [item.id for item in items] == [5, 4, 3]
+    # 남은 2개로는 3개 페이지를 채울 수 없으므로 DB 조회
+    assert feed.page(cursor, 3) is None
+    assert feed.misses == 1
+
+
+def test_page_serves_the_tail_when_the_buffer_holds_every_diary():
+    feed = loaded_feed(count=5, size=10, complete=True)
+
+    items, cursor = feed.page(None, 3)
+    items, cursor = feed.page(cursor, 3)
+    assert [item.id for item in items] == [2, 1]
+    assert cursor is None
+
+
+async def test_feed_buffer_tracks_saves_and_deletes(client, user):
+    await public_feed_service.start()
+    other = await create_user(kakao_id="3003")
+    await save_diary(client, user)
+    await save_diary(client, other, is_public=False)
+    await save_diary(client, other)
+
+    response = await client.get("/api/v1/diary/public", headers=auth_headers(user))
+    items = response.json()["items"]
+    assert [(item["user_id"], item["id"]) for item in items] == [(other.id, 2), (user.id, 1)]
+    assert items[0]["wine"]["name"]
+    assert public_feed_service.hits == 1
+
+    async with SessionLocal() as db:
+        await diary_service.delete_diary(db, other.id, 2)
+    items = (await client.get("/api/v1/diary/public", headers=auth_headers(user))).json()["items"]
+    assert [(item["user_id"], item["id"]) for item in items] == [(user.id, 1)]
+
+
+async def test_feed_buffer_matches_the_database_after_a_reload(client, user):
+    await public_feed_service.start()
+    for _ in range(3):
+        await save_diary(client, user)
+    from_buffer = (await client.get("/api/v1/diary/public", headers=auth_headers(user))).json()
+
+    await public_feed_service.start()
+    from_database = (await client.get("/api/v1/diary/public", headers=auth_headers(user))).json()
+    assert from_buffer == from_database
+
+
+def test_page_cursor_lookup_uses_the_sorted_snapshot_and_rebuilds_it_after_changes():
+    feed = loaded_feed(count=10, size=10, complete=True)
+
+    items, cursor = feed.page(None, 4)
+    items, cursor = feed.page(cursor, 4)
+    assert [item.id for item in items] == [6, 5, 4, 3]
+    snapshot = feed._sorted
+
+    feed._remove(1, 4)
+    feed._insert(entry(11))
+    assert feed._sorted is None
+    items, _ = feed.page(cursor, 4)
+    assert [item.id for item in items] == [2, 1]
+    assert feed._sorted is not snapshot
+
+
+async def test_feed_drops_diaries_another_worker_made_private_or_deleted(client, user):
+    for _ in range(4):
+        await save_diary(client, user)
+    await public_feed_service.start()
+    version = public_feed_service.version
+
+    # 다른 워커 프로세스의 수정/삭제 (이 워커의 피드 버퍼는 모름)
+    async with SessionLocal() as db:
+        await db.execute(update(Diary).where(Diary.user_id == user.id, Diary.id == 4).values(isPublic=False))
+        await db.execute(delete(Diary).where(Diary.user_id == user.id, Diary.id == 2))
+        await db.commit()
+
+    items = (await client.get("/api/v1/diary/public", params={"limit": 3}, headers=auth_headers(user))).json()["items"]
+    assert [item["id"] for item in items] == [3, 1]
+    assert public_feed_service.version == version + 1
+    assert [entry.id for entry in public_feed_service._entries] == [3, 1]
+
+
+async def test_update_and_delete_succeed_when_the_feed_update_fails(client, user, monkeypatch):
+    await public_feed_service.start()
+    await save_diary(client, user)
+
+    async def broken_saved(*args):
+        raise RuntimeError("feed down")
+
+    def broken_deleted(*args):
+        raise RuntimeError("feed down")
+
+    monkeypatch.setattr(public_feed_service, "on_diary_saved", broken_saved)
+    monkeypatch.setattr(public_feed_service, "on_diary_deleted", broken_deleted)
+    async with SessionLocal() as db:
+        diary = await diary_service.update_diary(db, user.id, 1, {"rating": 2})
+    assert diary.rating == 2
+    async with SessionLocal() as db:
+        assert await diary_service.delete_diary(db, user.id, 1) is True
+    async with SessionLocal() as db:
+        assert await db.get(Diary, (1, user.id, 1)) is None
@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from sqlalchemy import event
+from conftest import auth_headers, save_diary
+from db.database import engine
+
+pytestmark = pytest.mark.anyio
+
+
+class DatabaseUsage:
+    """요청이 실행한 SQL 문 수와 커넥션 체크아웃 수"""
+
+    def __init__(self):
+        self.statements = []
+        self.checkouts = 0
+
+    def __enter__(self):
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine.sync_engine.pool, "checkout", self._on_checkout)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine.sync_engine, "before_cursor_execute", self._on_execute)
+        event.remove(engine.sync_engine.pool, "checkout", self._on_checkout)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _on_checkout(self, *args):
+        self.checkouts += 1
+
+
+async def test_diary_list_uses_one_connection_and_a_fixed_number_of_queries(client, user):
+    for _ in range(5):
+        await save_diary(client, user)
+
+    with DatabaseUsage() as usage:
+        response = await client.get("/api/v1/diary/", params={"limit": 5}, headers=auth_headers(user))
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 5
+    # 인증 사용자 조회 + 목록 버전(ETag) + 목록(와인 JOIN) - 일기 수와 무관
+    assert len(usage.statements) == 3
+    assert usage.checkouts == 1
+
+
+async def test_concurrent_reads_each_use_a_single_connection(client, user):
+    await save_diary(client, user)
+
+    with DatabaseUsage() as usage:
+        responses = await asyncio.gather(*[
+            client.get("/api/v1/diary/", headers=auth_headers(user)) for _ in range(50)
+        ])
+    assert all(response.status_code == 200 for response in responses)
+    assert usage.checkouts == 50
+
+
+async def test_not_modified_detail_skips_the_wine_query(client, user):
+    await save_diary(client, user)
+    etag = (await client.get("/api/v1/diary/1", headers=auth_headers(user))).headers["ETag"]
+
+    with DatabaseUsage() as usage:
+        response = await client.get("/api/v1/diary/1", headers={**auth_headers(user), "If-None-Match": etag})
+    assert response.status_code == 304
+    assert len(usage.statements) == 2
+    assert usage.checkouts == 1
+
+
+async def test_not_modified_list_reads_only_the_user_version_row(client, user):
+    await save_diary(client, user)
+    etag = (await client.get("/api/v1/diary/", headers=auth_headers(user))).headers["ETag"]
+
+    with DatabaseUsage() as usage:
+        response = await client.get("/api/v1/diary/", headers={**auth_headers(user), "If-None-Match": etag})
+    assert response.status_code == 304
+    # 인증 + 버전 조회 (diaries는 읽지 않음)
+    assert len(usage.statements) == 2
+    assert "diaries" not in usage.statements[1]
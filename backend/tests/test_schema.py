@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import text
+from db import schema
+from db.database import engine, SessionLocal
+from main import app, lifespan
+from models import UserDiaryStats
+
+pytestmark = pytest.mark.anyio
+
+WINE_COLUMNS = "name, origin, grape, year, alcohol, type, aroma_note, taste_note, finish_note, sweetness, acidity, tannin, body"
+
+
+async def legacy_database_with_duplicate_wines(conn):
+    """uq_wines_identity 이전 스키마: 같은 와인이 여러 행이고 일기 PK가 합칠 때 겹침"""
+    await conn.execute(text("DROP INDEX uq_wines_identity"))
+    await conn.execute(text("INSERT INTO users (id, kakao_id, nickname, diary_seq) VALUES (1, 'a', 'a', 2), (2, 'b', 'b', 1)"))
+    for wine_id in (1, 2, 3):
+        await conn.execute(text(
+            f"INSERT INTO wines (id, {WINE_COLUMNS}) "
+            f"VALUES ({wine_id}, 'W', 'O', 'G', '2020', '13', 'red', '', '', '', 1, 1, 1, 1)"
+        ))
+    # (id, user_id, wine_id): 사용자 1의 일기 1/2가 와인 1로 합쳐질 때 서로 겹침
+    for diary_id, user_id, wine_id in [(1, 1, 1), (1, 1, 2), (2, 1, 2), (2, 1, 3), (1, 2, 3)]:
+        await conn.execute(text(f"INSERT INTO diaries (id, user_id, wine_id) VALUES ({diary_id}, {user_id}, {wine_id})"))
+
+
+async def test_duplicate_wines_are_merged_and_clashing_diaries_renumbered():
+    async with engine.begin() as conn:
+        await legacy_database_with_duplicate_wines(conn)
+    async with engine.begin() as conn:
+        await conn.run_sync(schema.sync_schema)
+
+    async with engine.connect() as conn:
+        diaries = (await conn.execute(text("SELECT user_id, id, wine_id FROM diaries ORDER BY user_id, id"))).all()
+        wines = (await conn.execute(text("SELECT id FROM wines"))).scalars().all()
+        seqs = (await conn.execute(text("SELECT id, diary_seq FROM users ORDER BY id"))).all()
+        indexes = (await conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))).scalars().all()
+
+    assert diaries == [(1, 1, 1), (1, 2, 1), (1, 3, 1), (1, 4, 1), (2, 1, 1)]
+    assert wines == [1]
+    assert seqs == [(1, 4), (2, 1)]
+    assert "uq_wines_identity" in indexes
+
+
+async def test_required_index_failure_stops_startup(monkeypatch):
+    async with engine.begin() as conn:
+        await legacy_database_with_duplicate_wines(conn)
+    monkeypatch.setitem(schema.INDEX_PREPARES, "uq_wines_identity", [])
+
+    with pytest.raises(RuntimeError, match="uq_wines_identity"):
+        async with engine.begin() as conn:
+            await conn.run_sync(schema.sync_schema)
+
+
+async def test_new_columns_are_added_and_backfilled():
+    async with engine.begin() as conn:
+        await conn.execute(text("INSERT INTO users (id, kakao_id, nickname) VALUES (1, 'a', 'a')"))
+        await conn.execute(text(f"INSERT INTO wines (id, {WINE_COLUMNS}) VALUES (1, 'W', 'O', 'G', '2020', '13', 'red', '', '', '', 1, 1, 1, 1)"))
+        await conn.execute(text("INSERT INTO diaries (id, user_id, wine_id) VALUES (5, 1, 1)"))
+        await conn.execute(text("ALTER TABLE users DROP COLUMN diary_seq"))
+    async with engine.begin() as conn:
+        assert await conn.run_sync(schema.sync_schema) == []
+        assert (await conn.execute(text("SELECT diary_seq FROM users"))).scalar() == 5
+
+
+async def test_startup_seeds_a_newly_created_stats_table():
+    async with engine.begin() as conn:
+        await conn.execute(text("INSERT INTO users (id, kakao_id, nickname) VALUES (1, 'a', 'a')"))
+        await conn.execute(text(f"INSERT INTO wines (id, {WINE_COLUMNS}) VALUES (1, 'W', 'O', 'Merlot / Syrah', '2020', '13', 'red', '', '', '', 1, 1, 1, 1)"))
+        await conn.execute(text("INSERT INTO diaries (id, user_id, wine_id, rating, price) VALUES (1, 1, 1, 4, 100), (2, 1, 1, 2, NULL)"))
+        await conn.execute(text("DROP TABLE user_diary_stats"))
+
+    async with lifespan(app):
+        async with SessionLocal() as db:
+            stats = await db.get(UserDiaryStats, 1)
+    assert (stats.diary_count, stats.rating_sum, stats.rating_count, stats.price_sum, stats.price_count) == (2, 6, 2, 100, 1)
+    assert stats.grape_counts == {"Merlot": 2, "Syrah": 2}
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import select
+from conftest import jpeg_bytes, save_diary, stored_keys
+from db.database import SessionLocal
+from models import StorageDeletion
+from service.diary_service import diary_service
+from service.storage_cleanup import StorageCleanupService
+from utils.storage import ncp_storage
+
+pytestmark = pytest.mark.anyio
+
+
+async def queued_rows():
+    async with SessionLocal() as db:
+        return list((await db.execute(select(StorageDeletion).order_by(StorageDeletion.id))).scalars().all())
+
+
+async def test_deleting_a_diary_enqueues_its_images_and_the_sweeper_removes_them(client, user, storage):
+    response = await save_diary(client, user, files={"frontImage": ("front.jpg", jpeg_bytes(), "image/jpeg")})
+    assert len(stored_keys(storage)) == 3
+
+    async with SessionLocal() as db:
+        assert await diary_service.delete_diary(db, user.id, response.json()["diary_id"])
+    # 요청 경로에서는 기록만 하고 객체는 그대로
+    assert {row.reason for row in await queued_rows()} == {"diary_deleted"}
+    assert len(stored_keys(storage)) == 3
+
+    sweeper = StorageCleanupService(interval=60, batch_size=2, max_attempts=3)
+    assert await sweeper.sweep() == 2
+    assert await sweeper.sweep() == 1
+    assert await sweeper.sweep() == 0
+    assert stored_keys(storage) == set()
+    assert await queued_rows() == []
+
+
+async def test_sweeper_treats_missing_objects_as_deleted(storage):
+    async with SessionLocal() as db:
+        db.add(StorageDeletion(object_key="diary/front/full/missing.jpg", reason="save_failed"))
+        await db.commit()
+
+    assert await StorageCleanupService(interval=60, batch_size=10, max_attempts=3).sweep() == 1
+    assert await queued_rows() == []
+
+
+async def test_sweeper_records_failures_and_stops_after_max_attempts(storage, monkeypatch):
+    async with SessionLocal() as db:
+        db.add(StorageDeletion(object_key="diary/a.jpg", reason="diary_deleted"))
+        await db.commit()
+    monkeypatch.setattr(ncp_storage, "delete_keys", lambda keys: {key: "AccessDenied: denied" for key in keys})
+
+    sweeper = StorageCleanupService(interval=60, batch_size=10, max_attempts=2)
+    assert await sweeper.sweep() == 1
+    assert await sweeper.sweep() == 1
+    assert await sweeper.sweep() == 0
+
+    [row] = await queued_rows()
+    assert row.attempts == 2
+    assert row.last_error == "AccessDenied: denied"
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import select
+from conftest import WINE_DATA, auth_headers, create_user, save_diary
+from crud import user_stats
+from db.database import SessionLocal
+from models import UserDiaryStats
+from service.diary_service import diary_service
+
+pytestmark = pytest.mark.anyio
+
+
+def snapshot(stats: UserDiaryStats) -> tuple:
+    return (stats.user_id, stats.diary_count, stats.rating_sum, stats.rating_count, stats.price_sum,
+            stats.price_count, stats.type_counts, stats.grape_counts)
+
+
+async def test_incremental_stats_match_a_full_rebuild(client, user):
+    other = await create_user(kakao_id="4004")
+    white = {**WINE_DATA, "name": "Chablis", "type": "white", "grape": "Chardonnay"}
+    await save_diary(client, user, rating=5, price="10000")
+    await save_diary(client, user, wine=white, rating=3, price="")
+    await save_diary(client, other, wine=white, rating=1)
+    async with SessionLocal() as db:
+        await diary_service.update_diary(db, user.id, 1, {"rating": 2, "price": 5000})
+    async with SessionLocal() as db:
+        await diary_service.delete_diary(db, other.id, 1)
+
+    async with SessionLocal() as db:
+        incremental = [snapshot(row) for row in (await db.execute(select(UserDiaryStats).order_by(UserDiaryStats.user_id))).scalars()]
+        await user_stats.rebuild_all(db, batch_size=1)
+        await db.commit()
+        rebuilt = [snapshot(row) for row in (await db.execute(select(UserDiaryStats).order_by(UserDiaryStats.user_id))).scalars()]
+
+    # 일기가 모두 지워진 사용자는 증분 쪽에 0인 행이 남고 재계산에는 행이 없음
+    assert [row for row in incremental if row[1]] == rebuilt
+    assert rebuilt[0][1:] == (2, 5, 2, 5000, 1, {"red": 1, "white": 1},
+                              {"Cabernet Sauvignon": 1, "Merlot": 1, "Chardonnay": 1})
+
+
+async def test_stats_endpoint_summarises_diaries(client, user):
+    assert (await client.get("/api/v1/diary/stats", headers=auth_headers(user))).json()["diary_count"] == 0
+    await save_diary(client, user, rating=4, price="20000")
+    await save_diary(client, user, rating=2, price="10000")
+
+    body = (await client.get("/api/v1/diary/stats", headers=auth_headers(user))).json()
+    assert body["diary_count"] == 2
+    assert body["average_rating"] == 3
+    assert body["total_spend"] == 30000
+    assert body["favourite_grapes"][0] == {"grape": "Cabernet Sauvignon", "count": 2}
+
+
+def test_removing_from_an_out_of_step_row_never_goes_negative():
+    stats = UserDiaryStats(user_id=1, diary_count=0, rating_sum=0, rating_count=0, price_sum=0,
+                           price_count=0, type_counts={}, grape_counts={})
+    user_stats._apply(stats, user_stats.stats_entry(5, 1000, "red", "Merlot"), -1)
+
+    assert (stats.diary_count, stats.rating_sum, stats.rating_count, stats.price_sum, stats.price_count) == (0, 0, 0, 0, 0)
+    assert stats.type_counts == {} and stats.grape_counts == {}
@@ -0,0 +1,84 @@
+import time
+import pytest
+from conftest import WINE_DATA, auth_headers, save_diary
+from db.database import SessionLocal
+from crud import diary as diary_crud
+from service.wine_search import wine_search_service
+from utils import prefix_index
+from utils.prefix_index import PrefixIndex
+
+pytestmark = pytest.mark.anyio
+
+
+def test_prefix_index_matches_word_starts_and_ranks_whole_names_first():
+    index = PrefixIndex()
+    index.build([(1, "Château Margaux"), (2, "Margaux Rouge"), (3, "Pavillon Rouge du Château Margaux"), (4, "샤토 마고")])
+
+    assert index.suggest("marg") == [(2, "Margaux Rouge"), (1, "Château Margaux"), (3, "Pavillon Rouge du Château Margaux")]
+    assert index.suggest("chateau m", limit=1) == [(1, "Château Margaux")]
+    assert index.suggest("마") == [(4, "샤토 마고")]
+    assert index.suggest("argaux") == []
+    assert index.suggest("  ") == []
+
+
+def test_prefix_index_additions_are_searchable_before_and_after_compaction():
+    index = PrefixIndex(max_recent=3)
+    index.build([(1, "Opus One")])
+    index.add(2, "Opus Two")
+    assert index.suggest("two") == [(2, "Opus Two")]
+
+    for wine_id in range(3, 6):
+        index.add(wine_id, f"Opus {wine_id}")
+    assert len(index._recent) == 0
+    assert [wine_id for wine_id, _ in index.suggest("opus", limit=10)] == [3, 4, 5, 1, 2]
+    index.add(2, "duplicate id is ignored")
+    assert index.suggest("dup") == []
+
+
+
+def test_prefix_index_chunked_sort_matches_a_full_key_sort(monkeypatch):
+    monkeypatch.setattr(prefix_index, "_SORT_CHUNK", 4)
+    words = ["ab", "a", "abc", "b", "ba", "샤토", "aa", "margaux"]
+    rows = [(wine_id, " ".join(words[(wine_id * step) % len(words)] for step in (1, 3, 5)[:wine_id % 3 + 1]))
+            for wine_id in range(1, 60)]
+    index = PrefixIndex()
+    index.build(rows)
+
+    keys = [(index._key(offset), wine_id) for offset, wine_id in zip(index._offsets, index._ids)]
+    assert keys == sorted(keys)
+    assert len(keys) == sum(len(name.split()) for _, name in rows)
+
+
+async def test_search_endpoint_matches_name_grape_and_typos(client, user):
+    await wine_search_service.start()
+    await save_diary(client, user)
+    await save_diary(client, user, wine={**WINE_DATA, "name": "Pavillon Rouge", "grape": "Merlot"})
+
+    search = (await client.get("/api/v1/wines/search", params={"q": "merlot"}, headers=auth_headers(user))).json()
+    assert {item["name"] for item in search["items"]} == {"Château Margaux", "Pavillon Rouge"}
+
+    search = (await client.get("/api/v1/wines/search", params={"q": "pavilon"}, headers=auth_headers(user))).json()
+    assert [item["name"] for item in search["items"]] == ["Pavillon Rouge"]
+
+
+async def test_suggest_endpoint(client, user):
+    await wine_search_service.start()
+    await save_diary(client, user)
+    await save_diary(client, user, wine={**WINE_DATA, "name": "Pavillon Rouge", "grape": "Merlot"})
+
+    suggest = (await client.get("/api/v1/wines/suggest", params={"q": "chat"}, headers=auth_headers(user))).json()
+    assert [item["name"] for item in suggest["items"]] == ["Château Margaux"]
+
+
+async def test_periodic_refresh_picks_up_wines_added_by_other_workers():
+    await wine_search_service.start()
+    async with SessionLocal() as db:
+        # 다른 워커 프로세스가 커밋한 와인 (이 워커의 add()는 호출되지 않음)
+        await diary_crud.create_or_get_wine(db, {**WINE_DATA, "name": "Sassicaia"})
+        await db.commit()
+    assert wine_search_service.suggest("sass") == []
+
+    wine_search_service._loaded_at = time.monotonic() - wine_search_service.refresh_interval - 1
+    wine_search_service.suggest("sass")
+    await wine_search_service._refresh_task
+    assert [name for _, name in wine_search_service.suggest("sass")] == ["Sassicaia"]
@@ -0,0 +1,64 @@
+import time
+import pytest
+from conftest import WINE_DATA, auth_headers, save_diary
+from db.database import SessionLocal
+from crud import diary as diary_crud
+from service.wine_similarity import wine_similarity_service
+from utils.taste_vectors import TasteVectorIndex
+
+pytestmark = pytest.mark.anyio
+
+
+def test_knn_orders_by_distance_filters_by_type_and_excludes_the_query():
+    index = TasteVectorIndex()
+    index.add(1, "red", (1.0, 4.0, 4.0, 5.0))
+    index.add(2, "red", (1.0, 4.0, 4.0, 4.0))
+    index.add(3, "red", (5.0, 1.0, 1.0, 1.0))
+    index.add(4, "white", (1.0, 4.0, 4.0, 5.0))
+    # 0-100 척도 점수는 0-5로 정규화된 벡터로 들어옴
+    index.add(5, "red", (1.0, 4.0, 4.0, 5.0))
+
+    [neighbours] = index.knn([index.vector(1)], k=3, exclude=[1])
+    assert [wine_id for wine_id, _ in neighbours] == [4, 5, 2]
+    assert neighbours[2][1] == pytest.approx(1.0)
+
+    [neighbours] = index.knn([index.vector(1)], k=3, wine_type="red", exclude=[1])
+    assert [wine_id for wine_id, _ in neighbours] == [5, 2, 3]
+    assert index.knn([index.vector(1)], wine_type="rose") == [[]]
+
+
+async def test_similar_endpoint(client, user):
+    await wine_similarity_service.start()
+    await save_diary(client, user)
+    await save_diary(client, user, wine={**WINE_DATA, "name": "Pavillon Rouge", "body": 4})
+    await save_diary(client, user, wine={**WINE_DATA, "name": "Riesling Kabinett", "type": "white", "sweetness": 4, "tannin": 1})
+
+    response = await client.get("/api/v1/wines/1/similar", params={"k": 2}, headers=auth_headers(user))
+    assert [item["name"] for item in response.json()["items"]] == ["Pavillon Rouge", "Riesling Kabinett"]
+
+    response = await client.get("/api/v1/wines/1/similar", params={"type": "white"}, headers=auth_headers(user))
+    assert [item["name"] for item in response.json()["items"]] == ["Riesling Kabinett"]
+
+    assert (await client.get("/api/v1/wines/999/similar", headers=auth_headers(user))).status_code == 404
+
+
+async def test_periodic_refresh_picks_up_wines_added_by_other_workers():
+    async with SessionLocal() as db:
+        wine = await diary_crud.create_or_get_wine(db, WINE_DATA)
+        await db.commit()
+    await wine_similarity_service.start()
+    async with SessionLocal() as db:
+        # 다른 워커 프로세스가 커밋한 와인 (이 워커의 add()는 호출되지 않음)
+        await diary_crud.create_or_get_wine(db, {**WINE_DATA, "name": "Pavillon Rouge"})
+        await db.commit()
+
+    async with SessionLocal() as db:
+        [neighbours] = await wine_similarity_service.similar(db, [wine.id])
+    assert neighbours == []
+
+    wine_similarity_service._loaded_at = time.monotonic() - wine_similarity_service.refresh_interval - 1
+    async with SessionLocal() as db:
+        await wine_similarity_service.similar(db, [wine.id])
+        await wine_similarity_service._refresh_task
+        [neighbours] = await wine_similarity_service.similar(db, [wine.id])
+    assert [neighbour.name for neighbour, _ in neighbours] == ["Pavillon Rouge"]